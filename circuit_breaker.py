@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Devre Kesici (Circuit Breaker)
+Art arda başarısız olan bir servise her istekte bağlantı denemesi ve yeniden
+deneme maliyeti ödenmesin diye çağrıları geçici olarak keser.
+
+Durumlar:
+    kapali    : Çağrılar servise gider, art arda hatalar sayılır
+    acik      : Çağrılar servise gitmez; arka planda periyodik yoklama yapılır
+    yari_acik : Yoklama başarılı oldu, sıradaki tek çağrı deneme olarak geçer;
+                başarılıysa devre kapanır, değilse yeniden açılır
+"""
+
+import threading
+import time
+from datetime import datetime
+
+KAPALI = "kapali"
+ACIK = "acik"
+YARI_ACIK = "yari_acik"
+
+HATA_ESIGI = 3          # Devreyi açan art arda hata sayısı
+YOKLAMA_ARALIGI = 5     # Açık devrede servisin yoklanma aralığı (saniye)
+
+class DevreKesici:
+    """
+    Thread güvenli devre kesici.
+
+    Args:
+        ad (str): İstatistiklerde görünen ad
+        yoklama (callable): Servis ayaktaysa True döndüren fonksiyon (ör. es.ping);
+            verilmezse açık devre yoklama_araligi dolunca yarı açığa geçer
+        hata_esigi (int): Devreyi açan art arda hata sayısı
+        yoklama_araligi (float): Açık devrede yoklamalar arası süre (saniye)
+    """
+
+    def __init__(self, ad, yoklama=None, hata_esigi=HATA_ESIGI, yoklama_araligi=YOKLAMA_ARALIGI):
+        self.ad = ad
+        self.yoklama = yoklama
+        self.hata_esigi = hata_esigi
+        self.yoklama_araligi = yoklama_araligi
+        self.lock = threading.Lock()
+        self.durum = KAPALI
+        self.ardisik_hata = 0
+        self.son_hata = None
+        self.acilma_zamani = None
+        self.deneme_suruyor = False
+        self.sayaclar = {"basarili": 0, "hatali": 0, "reddedilen": 0, "acilma": 0}
+        self._yoklama_durdur = None
+
+    def izin_var_mi(self):
+        """Çağrının servise gönderilip gönderilmeyeceğini döndürür"""
+        with self.lock:
+            if self.durum == KAPALI:
+                return True
+            if self.durum == ACIK and self.yoklama is None \
+                    and time.time() - self.acilma_zamani >= self.yoklama_araligi:
+                self.durum = YARI_ACIK
+            if self.durum == YARI_ACIK and not self.deneme_suruyor:
+                # Yarı açık devrede aynı anda yalnızca bir deneme çağrısı geçer
+                self.deneme_suruyor = True
+                return True
+            self.sayaclar["reddedilen"] += 1
+            return False
+
+    def basarili(self):
+        with self.lock:
+            self.sayaclar["basarili"] += 1
+            self.ardisik_hata = 0
+            self.deneme_suruyor = False
+            if self.durum != KAPALI:
+                print(f"✅ {self.ad} yeniden erişilebilir, devre kapandı.")
+            self.durum = KAPALI
+            self._yoklamayi_durdur()
+
+    def hatali(self, hata=None):
+        with self.lock:
+            self.sayaclar["hatali"] += 1
+            self.ardisik_hata += 1
+            self.son_hata = str(hata) if hata is not None else None
+            self.deneme_suruyor = False
+            if self.durum == YARI_ACIK or (self.durum == KAPALI and self.ardisik_hata >= self.hata_esigi):
+                self._ac()
+
+    def vazgec(self):
+        """Servise hiç gönderilmeden biten çağrı (ör. yerel kuyrukta zaman aşımı): sayılmaz, deneme hakkı geri verilir"""
+        with self.lock:
+            self.deneme_suruyor = False
+
+    def _ac(self):
+        # lock tutulurken çağrılır
+        if self.durum != ACIK:
+            self.sayaclar["acilma"] += 1
+            print(f"⚠️ {self.ad}: {self.ardisik_hata} art arda hata, devre açıldı.")
+        self.durum = ACIK
+        self.acilma_zamani = time.time()
+        if self.yoklama is not None and self._yoklama_durdur is None:
+            self._yoklama_durdur = threading.Event()
+            threading.Thread(target=self._yoklama_dongusu, args=(self._yoklama_durdur,),
+                             name=f"{self.ad}-yoklama", daemon=True).start()
+
+    def _yoklamayi_durdur(self):
+        # lock tutulurken çağrılır
+        if self._yoklama_durdur is not None:
+            self._yoklama_durdur.set()
+            self._yoklama_durdur = None
+
+    def _yoklama_dongusu(self, durdur):
+        """Açık devrede servisi arka planda yoklar; cevap verirse devreyi yarı açar"""
+        while not durdur.wait(self.yoklama_araligi):
+            try:
+                ayakta = bool(self.yoklama())
+            except Exception:
+                ayakta = False
+            if ayakta:
+                with self.lock:
+                    if self.durum == ACIK:
+                        self.durum = YARI_ACIK
+                    if self._yoklama_durdur is durdur:
+                        self._yoklama_durdur = None
+                return
+
+    def istatistikler(self):
+        with self.lock:
+            return {
+                "durum": self.durum,
+                "ardisik_hata": self.ardisik_hata,
+                "son_hata": self.son_hata,
+                "acilma_zamani": datetime.fromtimestamp(self.acilma_zamani).isoformat() if self.acilma_zamani else None,
+                **self.sayaclar,
+            }
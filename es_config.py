@@ -5,52 +5,137 @@ Elasticsearch 8.x Yapılandırma Dosyası
 Bu dosya, Elasticsearch 8.12.1 sürümü için bağlantı ayarlarını içerir.
 """
 
-from elasticsearch import Elasticsearch
+from elasticsearch import AsyncElasticsearch, Elasticsearch
+import asyncio
 import ssl
+import threading
+import time
+import atexit
+import weakref
+from datetime import datetime
 
-def create_elasticsearch_client(host="localhost", port=9200, use_ssl=False, username=None, password=None):
+# Varsayılan bağlantı ayarları
+ELASTICSEARCH_HOST = "localhost"
+ELASTICSEARCH_PORT = 9200
+# Çok düğümlü cluster: doluysa ELASTICSEARCH_HOST/PORT yerine bu düğümler kullanılır
+# ("host", "host:port" veya "https://host:port" biçiminde)
+ELASTICSEARCH_HOSTS = []
+
+# Taşıma (transport) ayarları
+BAGLANTI_HAVUZU_BOYUTU = 10  # Düğüm başına açık tutulan HTTP bağlantısı; eşzamanlı istekleri sınırlar
+HTTP_SIKISTIRMA = False      # İstek gövdelerini gzip ile sıkıştır (ağ yavaşsa toplu işlerde faydalı)
+KEEP_ALIVE = True            # Bağlantıları istekler arasında yeniden kullan; False her istekte yeni TCP bağlantısı açar
+DUGUM_KESFI = False          # Açılışta ve düğüm hatasında cluster düğümlerini keşfet (sniffing)
+KESIF_ARALIGI = 60           # İki düğüm keşfi arasında en az beklenecek süre (saniye)
+
+# Arka plan sağlık kontrolü aralığı (saniye)
+SAGLIK_KONTROL_ARALIGI = 30
+# Başarısız keşiften sonra yeniden deneme için beklenecek süre (saniye)
+BAGLANTI_YENIDEN_DENEME_ARALIGI = 5
+# Asenkron istemcinin düğüm başına açık tutabileceği bağlantı sayısı (eşzamanlı istek üst sınırı)
+ASYNC_BAGLANTI_SAYISI = 100
+
+# Süreç genelinde paylaşılan istemci kaydı
+_client_lock = threading.Lock()
+_default_client = None
+_default_endpoint = None
+_last_failed_discovery = 0.0
+_health_state = {"saglikli": None, "son_kontrol": None, "hata": None}
+_health_stop = None
+_health_thread = None
+# Asenkron istemciler olay döngüsüne bağlıdır; her döngü için ayrı istemci tutulur
+_async_clients = weakref.WeakKeyDictionary()
+# Olay döngüsü başına istemci oluşturma kilidi: aynı anda gelen ilk çağrılar tek istemci açar
+_async_client_locks = weakref.WeakKeyDictionary()
+
+def dugum_adresleri(hosts, use_ssl=False):
     """
-    Elasticsearch 8.x için istemci oluşturur
-    
-    Args:
-        host (str): Elasticsearch sunucu adresi
-        port (int): Elasticsearch port numarası
-        use_ssl (bool): SSL kullanılıp kullanılmayacağı
-        username (str): Kullanıcı adı (eğer authentication varsa)
-        password (str): Şifre (eğer authentication varsa)
-    
-    Returns:
-        Elasticsearch: Yapılandırılmış Elasticsearch istemcisi
+    Düğüm listesini tam URL'lere çevirir; şeması verilmeyen düğümlere `use_ssl`e
+    göre http/https, portu verilmeyenlere ELASTICSEARCH_PORT eklenir.
     """
-    
-    # Temel URL oluştur
-    if use_ssl:
-        url = f"https://{host}:{port}"
-    else:
-        url = f"http://{host}:{port}"
+    varsayilan_sema = "https" if use_ssl else "http"
+    adresler = []
+    for host in hosts:
+        sema, ayrac, adres = host.partition("://")
+        if not ayrac:
+            sema, adres = varsayilan_sema, host
+        if ":" not in adres:
+            adres = f"{adres}:{ELASTICSEARCH_PORT}"
+        adresler.append(f"{sema}://{adres}")
+    return adresler
+
+def _baglanti_ayarlari(hosts, use_ssl, username, password, connections_per_node=BAGLANTI_HAVUZU_BOYUTU,
+                       http_compress=HTTP_SIKISTIRMA, keep_alive=KEEP_ALIVE, sniff=DUGUM_KESFI):
+    """Senkron ve asenkron istemcilerin ortak bağlantı ayarlarını döndürür (url listesi, ayarlar)"""
+    urls = dugum_adresleri(hosts, use_ssl)
     
     # Bağlantı ayarları
     connection_config = {
-        "hosts": [url],
+        "hosts": urls,
         "verify_certs": False,  # SSL sertifika doğrulamasını devre dışı bırak
         "ssl_show_warn": False,  # SSL uyarılarını gizle
         "request_timeout": 30,  # 30 saniye timeout
         "max_retries": 3,  # Maksimum 3 deneme
         "retry_on_timeout": True,  # Timeout durumunda tekrar dene
+        "connections_per_node": connections_per_node,
+        "http_compress": http_compress,
     }
     
+    if not keep_alive:
+        # Sunucu her yanıttan sonra bağlantıyı kapatır (yük dengeleyici arkasında düğümler arasında dağılım için)
+        connection_config["headers"] = {"connection": "close"}
+    
+    if sniff:
+        # Düğüm listesi cluster'dan öğrenilir; kapanan düğümler havuzdan düşer, yeni düğümler eklenir
+        connection_config.update({
+            "sniff_on_start": True,
+            "sniff_on_node_failure": True,
+            "min_delay_between_sniffing": KESIF_ARALIGI,
+        })
+    
     # Eğer kullanıcı adı ve şifre verilmişse ekle
     if username and password:
         connection_config["basic_auth"] = (username, password)
     
     # Elasticsearch 8.x için özel ayarlar
-    if use_ssl:
-        # SSL bağlantısı için ek ayarlar
-        connection_config.update({
-            "ssl_context": ssl.create_default_context(),
-            "ssl_context.check_hostname": False,
-            "ssl_context.verify_mode": ssl.CERT_NONE,
-        })
+    if any(url.startswith("https://") for url in urls):
+        # SSL bağlantısı için ek ayarlar (kendinden imzalı sertifikalar kabul edilir)
+        ssl_context = ssl.create_default_context()
+        ssl_context.check_hostname = False
+        ssl_context.verify_mode = ssl.CERT_NONE
+        connection_config["ssl_context"] = ssl_context
+    
+    return urls, connection_config
+
+def _dugumler(hosts, host, port):
+    # Açık liste > ELASTICSEARCH_HOSTS > tek host/port
+    return list(hosts or ELASTICSEARCH_HOSTS or [f"{host}:{port}"])
+
+def create_elasticsearch_client(host=ELASTICSEARCH_HOST, port=ELASTICSEARCH_PORT, use_ssl=False, username=None, password=None,
+                                hosts=None, connections_per_node=BAGLANTI_HAVUZU_BOYUTU, http_compress=HTTP_SIKISTIRMA,
+                                keep_alive=KEEP_ALIVE, sniff=DUGUM_KESFI):
+    """
+    Elasticsearch 8.x için istemci oluşturur
+    
+    Args:
+        host (str): Elasticsearch sunucu adresi
+        port (int): Elasticsearch port numarası
+        use_ssl (bool): SSL kullanılıp kullanılmayacağı
+        username (str): Kullanıcı adı (eğer authentication varsa)
+        password (str): Şifre (eğer authentication varsa)
+        hosts (list): Cluster düğümleri; verilirse host/port yerine kullanılır,
+            istekler düğümler arasında dağıtılır (varsayılan: ELASTICSEARCH_HOSTS)
+        connections_per_node (int): Düğüm başına bağlantı havuzu boyutu
+        http_compress (bool): İstek gövdelerini gzip ile sıkıştır
+        keep_alive (bool): Bağlantıları istekler arasında yeniden kullan
+        sniff (bool): Düğümleri açılışta ve düğüm hatasında cluster'dan keşfet
+    
+    Returns:
+        Elasticsearch: Yapılandırılmış Elasticsearch istemcisi
+    """
+    urls, connection_config = _baglanti_ayarlari(_dugumler(hosts, host, port), use_ssl, username, password,
+                                                 connections_per_node, http_compress, keep_alive, sniff)
+    url = ", ".join(urls)
     
     try:
         es = Elasticsearch(**connection_config)
@@ -67,25 +152,24 @@ def create_elasticsearch_client(host="localhost", port=9200, use_ssl=False, user
         print(f"❌ Elasticsearch bağlantı hatası: {e}")
         return None
 
-def get_default_client():
-    """
-    Varsayılan Elasticsearch istemcisini döndürür
-    """
-    return create_elasticsearch_client()
+def _uc_nokta(use_ssl):
+    return {"host": ELASTICSEARCH_HOST, "port": ELASTICSEARCH_PORT, "use_ssl": use_ssl,
+            "hosts": dugum_adresleri(_dugumler(None, ELASTICSEARCH_HOST, ELASTICSEARCH_PORT), use_ssl)}
 
-def test_connection():
+def _discover_client():
     """
-    Elasticsearch bağlantısını test eder
-    """
-    print("🔍 Elasticsearch bağlantısı test ediliyor...")
+    Önce HTTP, ardından HTTPS deneyerek çalışan uç noktayı bulur.
     
+    Returns:
+        tuple: (Elasticsearch, dict) istemci ve uç nokta bilgisi, bulunamazsa (None, None)
+    """
     # HTTP bağlantısı dene
     print("1️⃣ HTTP bağlantısı deneniyor...")
     es_http = create_elasticsearch_client(use_ssl=False)
     
     if es_http:
         print("✅ HTTP bağlantısı başarılı!")
-        return es_http
+        return es_http, _uc_nokta(False)
     
     # HTTPS bağlantısı dene
     print("2️⃣ HTTPS bağlantısı deneniyor...")
@@ -93,7 +177,182 @@ def test_connection():
     
     if es_https:
         print("✅ HTTPS bağlantısı başarılı!")
-        return es_https
+        return es_https, _uc_nokta(True)
+    
+    return None, None
+
+def _health_loop(client, stop_event):
+    """Paylaşılan istemcinin sağlık durumunu arka planda günceller"""
+    while not stop_event.wait(SAGLIK_KONTROL_ARALIGI):
+        try:
+            saglikli = bool(client.ping())
+            hata = None
+        except Exception as e:
+            saglikli = False
+            hata = str(e)
+        with _client_lock:
+            if stop_event.is_set():
+                break
+            _health_state.update({
+                "saglikli": saglikli,
+                "son_kontrol": datetime.now().isoformat(),
+                "hata": hata,
+            })
+
+def _start_health_monitor(client):
+    """Sağlık kontrolü thread'ini başlatır (kilit altında çağrılmalıdır)"""
+    global _health_thread, _health_stop
+    _health_stop = threading.Event()
+    _health_thread = threading.Thread(target=_health_loop, args=(client, _health_stop),
+                                      name="es-saglik-kontrolu", daemon=True)
+    _health_thread.start()
+
+def get_default_client():
+    """
+    Süreç genelinde paylaşılan Elasticsearch istemcisini döndürür.
+    
+    İstemci ilk çağrıda bir kez oluşturulur; keşfedilen uç nokta önbelleğe alınır
+    ve sonraki çağrılar aynı istemciyi (ve keep-alive bağlantı havuzunu) yeniden
+    kullanır. Böylece sorgu başına yalnızca `_search` isteğinin maliyeti ödenir.
+    """
+    global _default_client, _default_endpoint, _last_failed_discovery
+    
+    client = _default_client
+    if client is not None:
+        return client
+    
+    with _client_lock:
+        if _default_client is not None:
+            return _default_client
+        
+        # Servis kapalıyken her çağrıda yeniden keşif yapmamak için kısa bekleme
+        if time.time() - _last_failed_discovery < BAGLANTI_YENIDEN_DENEME_ARALIGI:
+            return None
+        
+        client, endpoint = _discover_client()
+        if client is None:
+            _last_failed_discovery = time.time()
+            return None
+        
+        _default_client = client
+        _default_endpoint = endpoint
+        _health_state.update({
+            "saglikli": True,
+            "son_kontrol": datetime.now().isoformat(),
+            "hata": None,
+        })
+        _start_health_monitor(client)
+        return client
+
+def get_default_endpoint():
+    """Keşfedilmiş uç nokta bilgisini döndürür (henüz keşfedilmediyse None)"""
+    with _client_lock:
+        return dict(_default_endpoint) if _default_endpoint else None
+
+def get_client_health():
+    """Arka plan sağlık kontrolünün son durumunu döndürür"""
+    with _client_lock:
+        return dict(_health_state)
+
+def close_default_client():
+    """Paylaşılan istemciyi kapatır ve kaydı sıfırlar (yeniden yapılandırma için)"""
+    global _default_client, _default_endpoint, _health_thread, _health_stop, _last_failed_discovery
+    
+    with _client_lock:
+        if _health_stop is not None:
+            _health_stop.set()
+        _health_stop = None
+        client = _default_client
+        _default_client = None
+        _default_endpoint = None
+        _last_failed_discovery = 0.0
+        _health_thread = None
+        _health_state.update({"saglikli": None, "son_kontrol": None, "hata": None})
+    
+    if client is not None:
+        try:
+            client.close()
+        except Exception:
+            pass
+
+atexit.register(close_default_client)
+
+async def create_async_elasticsearch_client(host=ELASTICSEARCH_HOST, port=ELASTICSEARCH_PORT, use_ssl=False,
+                                            username=None, password=None, hosts=None,
+                                            connections_per_node=ASYNC_BAGLANTI_SAYISI, http_compress=HTTP_SIKISTIRMA,
+                                            keep_alive=KEEP_ALIVE, sniff=DUGUM_KESFI):
+    """
+    AsyncElasticsearch istemcisi oluşturur (senkron istemciyle aynı ayarlar)
+    
+    Args:
+        connections_per_node (int): Düğüm başına bağlantı havuzu; tek thread'den
+            aynı anda uçuşta olabilecek istek sayısını sınırlar
+    
+    Returns:
+        AsyncElasticsearch: Bağlantısı doğrulanmış istemci, başarısızsa None
+    """
+    urls, connection_config = _baglanti_ayarlari(_dugumler(hosts, host, port), use_ssl, username, password,
+                                                 connections_per_node, http_compress, keep_alive, sniff)
+    url = ", ".join(urls)
+    
+    es = None
+    try:
+        es = AsyncElasticsearch(**connection_config)
+        if await es.ping():
+            print(f"✅ Elasticsearch (async) bağlantısı başarılı: {url}")
+            return es
+        print(f"❌ Elasticsearch (async) bağlantısı başarısız: {url}")
+    except Exception as e:
+        print(f"❌ Elasticsearch (async) bağlantı hatası: {e}")
+    if es is not None:
+        await es.close()
+    return None
+
+async def get_default_async_client():
+    """
+    Çalışan olay döngüsü için paylaşılan AsyncElasticsearch istemcisini döndürür.
+    
+    Senkron istemci bir uç nokta keşfettiyse o kullanılır; yoksa önce HTTP,
+    ardından HTTPS denenir.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is not None:
+        return client
+    
+    # Kilit yalnızca bu döngüde kullanılır; thread'ler arasında paylaşılmaz
+    lock = _async_client_locks.setdefault(loop, asyncio.Lock())
+    async with lock:
+        client = _async_clients.get(loop)
+        if client is not None:
+            return client
+        endpoint = get_default_endpoint()
+        adaylar = [endpoint["use_ssl"]] if endpoint else [False, True]
+        for use_ssl in adaylar:
+            client = await create_async_elasticsearch_client(use_ssl=use_ssl)
+            if client is not None:
+                _async_clients[loop] = client
+                return client
+    return None
+
+async def close_default_async_client():
+    """Çalışan olay döngüsünün paylaşılan asenkron istemcisini kapatır"""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
+
+def test_connection():
+    """
+    Elasticsearch bağlantısını test eder
+    """
+    print("🔍 Elasticsearch bağlantısı test ediliyor...")
+    
+    client = get_default_client()
+    if client:
+        endpoint = get_default_endpoint()
+        if endpoint:
+            print(f"🔗 Kullanılan düğümler: {', '.join(endpoint['hosts'])}")
+        return client
     
     print("❌ Hiçbir bağlantı yöntemi başarılı olmadı.")
     print("💡 Elasticsearch servisinin çalıştığından emin olun.")
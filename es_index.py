@@ -1,36 +1,1132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Elasticsearch İndeksleme Scripti
+Bu script, SQLite'taki soruları parça parça okuyup temizler ve
+Elasticsearch'e toplu (_bulk) isteklerle aktarır.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
 import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import islice, tee
+from elasticsearch import helpers
 from es_config import get_default_client
-from es_search import temizle
-
-# Elasticsearch'e bağlan
-es = get_default_client()
-if not es:
-    raise SystemExit("Elasticsearch bağlantısı kurulamadı. Lütfen servisi kontrol edin.")
-
-# Index kontrolü (yeni API ile)
-try:
-    if not es.indices.exists(index="sorular"):
-        es.indices.create(index="sorular")
-except Exception as e:
-    print("Index kontrolünde hata:", e)
-
-# Veritabanından verileri çek
-conn = sqlite3.connect('sorular.db')
-cursor = conn.cursor()
-cursor.execute("SELECT id, metin FROM sorular")
-sorular = cursor.fetchall()
-
-# Her soruyu Elasticsearch'e yükle (temizlenmiş alanla birlikte)
-for soru_id, metin in sorular:
+from es_search import VEKTOR_ALANI, kok_sozlugunu_kaydet, load_stopwords, temizle_many
+from performance_monitor import monitor_performance
+from query_cache import INDEKS_NESLI_ANAHTARI
+from search_scheduler import JetonKovasi
+
+DB_PATH = "sorular.db"
+# Aramalar her zaman bu ada (alias) yapılır; veriler sürümlü indekslerde (sorular_v<N>) tutulur
+INDEX_NAME = "sorular"
+SURUM_ON_EKI = f"{INDEX_NAME}_v"
+# Alias değiştirildikten sonra geri dönüş için saklanacak eski sürüm sayısı
+SAKLANACAK_ESKI_SURUM = 0
+# Toplu yükleme profili: yükleme sırasında yenileme kapalı ve replika yok,
+# sonrasında ayarlar geri alınır ve indeks az sayıda segmente birleştirilir
+TOPLU_YUKLEME_AYARLARI = {"refresh_interval": "-1", "number_of_replicas": 0}
+BIRLESTIRME_SEGMENT_SAYISI = 1
+BIRLESTIRME_ZAMAN_ASIMI = 3600      # force-merge uzun sürebilir (saniye)
+
+# Varsayılan toplu aktarım ayarları
+OKUMA_BOYUTU = 1000                 # SQLite'tan tek seferde okunacak satır sayısı
+BULK_BOYUTU = 500                   # Bir _bulk isteğindeki maksimum döküman sayısı
+BULK_MAKS_BAYT = 10 * 1024 * 1024   # Bir _bulk isteğinin maksimum boyutu (bayt)
+
+# Paralel aktarım ayarları
+ISCI_SAYISI = os.cpu_count() or 1   # Temizleme için süreç sayısı
+BULK_THREAD_SAYISI = 4              # Aynı anda uçuşta olabilecek _bulk isteği sayısı
+# Aktarım GUI ile aynı süreçte çalışmadığından arama zamanlayıcısının kuyruğunu
+# paylaşmaz; canlı cluster'ı korumak için varsayılan olarak hız sınırlıdır (döküman/sn)
+VARSAYILAN_HIZ_SINIRI = 5000
+
+# Delta (artımlı) indeksleme durumu, soru veritabanında bu tablolarda tutulur
+DURUM_TABLOSU = "es_indeks_durumu"
+DURUM_META_TABLOSU = "es_indeks_meta"
+DURUM_YAZMA_BOYUTU = 1000
+
+# Yarım kalan tam aktarımların kaldığı yerden sürdürülmesi için kontrol noktası
+KONTROL_NOKTASI_DOSYASI = "es_index_checkpoint.json"
+KONTROL_NOKTASI_ARALIGI = 5000      # Kaç onaylı dökümanda bir kontrol noktası yazılacağı (parti boyutu)
+# --vektor ile tam aktarımda eğitilen model; --devam kesintiden önceki vektörlerle aynı uzayda kalsın diye
+KONTROL_VEKTOR_MODELI_DOSYASI = "es_index_checkpoint_vektor.pkl"
+
+# Yoğun vektör alanı (--vektor): HNSW grafı. m düğüm başına bağlantı, ef_construction
+# kurulumda taranan aday sayısıdır; büyüdükçe isabet artar, indeksleme yavaşlar.
+# "int8_hnsw" (Elasticsearch 8.12+) vektörleri bayta indirip belleği ~4 kat azaltır.
+VEKTOR_INDEKS_TIPI = "hnsw"
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 100
+VEKTOR_PARCA_BOYUTU = 1000          # Tek seferde vektöre çevrilecek soru sayısı
+
+def icerik_ozeti(metin):
+    """Soru metninin değişip değişmediğini anlamak için kullanılan özet"""
+    return hashlib.sha1(str(metin).encode("utf-8")).hexdigest()
+
+def stopword_ozeti():
+    """Stopword listesinin özeti; liste değişirse tüm `soru_cleaned` alanları eskir"""
+    return icerik_ozeti("\n".join(sorted(set(load_stopwords()))))
+
+class IndeksDurumu:
+    """Elasticsearch'e aktarılmış soruların yerel kaydı (rowid üst sınırı + satır başına içerik özeti)"""
+
+    def __init__(self, db_path=DB_PATH):
+        # Paralel modda sonuçlar ana thread'de, eylemler görev thread'inde işlenir
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.lock = threading.Lock()
+        self._bekleyenler = {}
+        self._yazilacaklar = []
+        self._silinecekler = []
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {DURUM_TABLOSU} (
+                id INTEGER PRIMARY KEY,
+                ozet TEXT NOT NULL
+            )
+        """)
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {DURUM_META_TABLOSU} (
+                anahtar TEXT PRIMARY KEY,
+                deger TEXT
+            )
+        """)
+        self.conn.commit()
+
+    def meta_oku(self, anahtar, varsayilan=None):
+        satir = self.conn.execute(
+            f"SELECT deger FROM {DURUM_META_TABLOSU} WHERE anahtar = ?", (anahtar,)
+        ).fetchone()
+        return satir[0] if satir else varsayilan
+
+    def meta_yaz(self, anahtar, deger):
+        with self.lock:
+            self.conn.execute(
+                f"INSERT OR REPLACE INTO {DURUM_META_TABLOSU} (anahtar, deger) VALUES (?, ?)",
+                (anahtar, str(deger)),
+            )
+            self.conn.commit()
+
+    def beklet(self, soru_id, ozet):
+        """Gönderilen dökümanı ES onayı gelene kadar bekletir (ozet=None ise silme)"""
+        with self.lock:
+            self._bekleyenler[str(soru_id)] = ozet
+
+    def onayla(self, soru_id):
+        """ES'in onayladığı dökümanı kalıcı duruma işler"""
+        with self.lock:
+            ozet = self._bekleyenler.pop(str(soru_id), None)
+            if ozet is None:
+                self._silinecekler.append((int(soru_id),))
+            else:
+                self._yazilacaklar.append((int(soru_id), ozet))
+            dolu = len(self._yazilacaklar) + len(self._silinecekler) >= DURUM_YAZMA_BOYUTU
+        if dolu:
+            self.kaydet()
+
+    def reddet(self, soru_id):
+        """Başarısız dökümanı bekleyenlerden çıkarır; sonraki çalışmada yeniden denenir"""
+        with self.lock:
+            self._bekleyenler.pop(str(soru_id), None)
+
+    def kaydet(self):
+        with self.lock:
+            if self._yazilacaklar:
+                self.conn.executemany(
+                    f"INSERT OR REPLACE INTO {DURUM_TABLOSU} (id, ozet) VALUES (?, ?)",
+                    self._yazilacaklar,
+                )
+            if self._silinecekler:
+                self.conn.executemany(f"DELETE FROM {DURUM_TABLOSU} WHERE id = ?", self._silinecekler)
+            self.conn.commit()
+            self._yazilacaklar = []
+            self._silinecekler = []
+
+    def sifirla(self):
+        """Tam yeniden indekslemeden önce tüm kaydı temizler"""
+        with self.lock:
+            self.conn.execute(f"DELETE FROM {DURUM_TABLOSU}")
+            self.conn.execute(f"DELETE FROM {DURUM_META_TABLOSU}")
+            self.conn.commit()
+            self._bekleyenler.clear()
+
+    def tamamla(self, son_id):
+        """Bekleyen yazmaları kaydeder ve üst sınır ile stopword özetini günceller"""
+        self.kaydet()
+        self.meta_yaz("son_id", son_id)
+        self.meta_yaz("stopword_ozeti", stopword_ozeti())
+        self.nesli_yenile()
+
+    def nesli_yenile(self):
+        """İndeks içeriğinin değiştiğini işaretler; arama süreçlerinin sonuç önbellekleri boşalır"""
+        self.meta_yaz(INDEKS_NESLI_ANAHTARI, time.time_ns())
+
+    def kapat(self):
+        self.conn.close()
+
+class KontrolNoktasi:
+    """
+    Tam aktarımın ilerlemesini (son onaylanan rowid ve parti numarası) yerel dosyada tutar.
+
+    `son_id` yalnızca kendisine kadar gönderilen her dökümanın yanıtı işlendiğinde
+    ilerler (eylemler `gonderildi` ile kaydedilir; paralel _bulk yanıtları sırasız
+    gelebilir). Yanıtı hata olan dökümanlar `hatali_idler`de tutulur ve devam
+    eden çalışmada önce onlar yeniden gönderilir. Yeniden başlatılan çalışma
+    `son_id`den devam eder; yazmalar soru id'si ile `index` işlemi olduğundan
+    tekrar gönderilen bir parti kopya döküman oluşturmaz.
+    """
+
+    def __init__(self, veri=None, dosya=KONTROL_NOKTASI_DOSYASI, aralik=KONTROL_NOKTASI_ARALIGI):
+        self.dosya = dosya
+        self.aralik = aralik
+        self.veri = dict(veri or {})
+        self.veri.setdefault("son_id", 0)
+        self.veri.setdefault("parti", 0)
+        self.veri.setdefault("basarili", 0)
+        self.veri.setdefault("hatali", 0)
+        self._hatali_idler = set(self.veri.get("hatali_idler", ()))
+        self._partideki = 0
+        # Gönderilme sırasıyla yanıtı beklenen id'ler ve önekten önce yanıtı gelenler
+        self._gonderilen = deque()
+        self._yanitlanan = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def yukle(cls, dosya=KONTROL_NOKTASI_DOSYASI, aralik=KONTROL_NOKTASI_ARALIGI):
+        """Kayıtlı kontrol noktasını okur (yoksa None)"""
+        if not os.path.exists(dosya):
+            return None
+        with open(dosya, "r", encoding="utf-8") as f:
+            return cls(json.load(f), dosya, aralik)
+
+    @property
+    def son_id(self):
+        return int(self.veri["son_id"])
+
+    @property
+    def hatali_idler(self):
+        """Önceki çalışmalarda yüklenemeyen, devamda yeniden gönderilecek id'ler"""
+        return sorted(self._hatali_idler)
+
+    def gonderildi(self, soru_id):
+        """_bulk eylemi üretilen dökümanı kaydeder (eylemler başka thread'de üretilebilir)"""
+        with self._lock:
+            self._gonderilen.append(int(soru_id))
+
+    def ilerle(self, soru_id, ok):
+        """Yanıtı gelen (onaylanmış veya hatalı) dökümanı işler; parti dolunca kaydeder"""
+        soru_id = int(soru_id)
+        if ok and soru_id in self._hatali_idler:
+            # Önceki çalışmada yüklenemeyen döküman yeniden gönderilip onaylandı
+            self._hatali_idler.discard(soru_id)
+            self.veri["hatali"] -= 1
+        elif not ok:
+            if soru_id in self._hatali_idler:
+                self.veri["hatali"] -= 1
+            self._hatali_idler.add(soru_id)
+        self.veri["basarili" if ok else "hatali"] += 1
+        with self._lock:
+            self._yanitlanan.add(soru_id)
+            # Yalnızca kesintisiz yanıtlanmış önek kadar ilerlenir; uçuştaki daha küçük id'ler atlanmaz
+            while self._gonderilen and self._gonderilen[0] in self._yanitlanan:
+                onaylanan = self._gonderilen.popleft()
+                self._yanitlanan.discard(onaylanan)
+                self.veri["son_id"] = max(self.son_id, onaylanan)
+        self._partideki += 1
+        if self._partideki >= self.aralik:
+            self.veri["parti"] += 1
+            self._partideki = 0
+            self.kaydet()
+
+    def kaydet(self):
+        """Dosyaya atomik olarak yazar (yarım yazılmış kontrol noktası oluşmaz)"""
+        self.veri["guncelleme"] = datetime.now().isoformat()
+        self.veri["hatali_idler"] = self.hatali_idler
+        gecici = f"{self.dosya}.tmp"
+        with open(gecici, "w", encoding="utf-8") as f:
+            json.dump(self.veri, f, indent=2, ensure_ascii=False)
+        os.replace(gecici, self.dosya)
+
+    def sil(self):
+        """Aktarım tamamlanınca kontrol noktasını (ve aktarımın vektör modelini) kaldırır"""
+        for dosya in (self.dosya, self.veri.get("vektor_modeli")):
+            if dosya and os.path.exists(dosya):
+                os.remove(dosya)
+
+def vektor_alani(boyut):
+    """`boyut` boyutlu, kosinüs benzerlikli ve HNSW ile indekslenen dense_vector mapping'i"""
+    return {
+        "type": "dense_vector",
+        "dims": boyut,
+        "index": True,
+        "similarity": "cosine",
+        "index_options": {"type": VEKTOR_INDEKS_TIPI, "m": HNSW_M, "ef_construction": HNSW_EF_CONSTRUCTION},
+    }
+
+def index_govdesi(stopwords=None, vektor_boyutu=None):
+    """
+    `sorular` indeksinin ayar ve mapping tanımını döndürür.
+
+    `soru_cleaned` Python'da temizlenmiş metni, `soru` ham metni tutar. `soru.turkce`
+    alt alanı aynı temizliği Elasticsearch içinde yapar (Türkçe küçük harf,
+    stopwords.txt'den beslenen stopword filtresi ve Türkçe kök bulucu); böylece
+    sorgu tarafı Python'da kök bulmadan arama yapabilir. `vektor_boyutu` verilirse
+    kNN araması için VEKTOR_ALANI da eklenir.
+    """
+    if stopwords is None:
+        stopwords = load_stopwords()
+    govde = {
+        "settings": {
+            "analysis": {
+                "filter": {
+                    "turkce_kucuk_harf": {"type": "lowercase", "language": "turkish"},
+                    "turkce_stopwords": {"type": "stop", "stopwords": sorted(set(stopwords))},
+                    "turkce_kok": {"type": "stemmer", "language": "turkish"},
+                },
+                "analyzer": {
+                    "turkce_analiz": {
+                        "type": "custom",
+                        "tokenizer": "standard",
+                        "filter": ["apostrophe", "turkce_kucuk_harf", "turkce_stopwords", "turkce_kok"],
+                    }
+                },
+            }
+        },
+        "mappings": {
+            "properties": {
+                "soru": {
+                    "type": "text",
+                    "analyzer": "standard",
+                    "fields": {
+                        "turkce": {"type": "text", "analyzer": "turkce_analiz"}
+                    },
+                },
+                "soru_cleaned": {"type": "text", "analyzer": "standard"},
+            }
+        },
+    }
+    if vektor_boyutu:
+        govde["mappings"]["properties"][VEKTOR_ALANI] = vektor_alani(vektor_boyutu)
+    return govde
+
+def indeksi_olustur(es, index_name=INDEX_NAME, vektor_boyutu=None):
+    """İndeksi açık mapping ve Türkçe analizör ile oluşturur"""
+    govde = index_govdesi(vektor_boyutu=vektor_boyutu)
+    es.indices.create(index=index_name, settings=govde["settings"], mappings=govde["mappings"])
+
+def vektor_alanini_ekle(es, vektor_boyutu, index_name=INDEX_NAME):
+    """
+    Mevcut indekse vektör alanını ekler (zaten aynı boyutla varsa bir şey yapmaz).
+
+    Raises:
+        ValueError: Alan farklı boyutla tanımlıysa (mapping değiştirilemez, yeniden oluşturulmalı)
+    """
+    mapping = es.indices.get_mapping(index=index_name)
+    alanlar = next(iter(mapping.values()), {}).get("mappings", {}).get("properties", {})
+    mevcut = alanlar.get(VEKTOR_ALANI)
+    if mevcut is None:
+        es.indices.put_mapping(index=index_name, properties={VEKTOR_ALANI: vektor_alani(vektor_boyutu)})
+        print(f"✅ {index_name} indeksine {vektor_boyutu} boyutlu {VEKTOR_ALANI} alanı eklendi.")
+    elif mevcut.get("dims") != vektor_boyutu:
+        raise ValueError(f"{VEKTOR_ALANI} alanı {mevcut.get('dims')} boyutlu, model {vektor_boyutu} boyutlu; "
+                         "--yeniden-olustur ile yeni indeks oluşturun.")
+
+def _indeks_ayarlarini_oku(es, index_name):
+    """Toplu yükleme profilinin değiştireceği ayarların mevcut değerlerini döndürür"""
+    ayarlar = {}
+    for ad, bilgi in es.indices.get_settings(index=index_name).items():
+        indeks_ayarlari = bilgi.get("settings", {}).get("index", {})
+        # Açıkça ayarlanmamış değerler None olarak saklanır; geri alırken varsayılana döner
+        ayarlar[ad] = {anahtar: indeks_ayarlari.get(anahtar) for anahtar in TOPLU_YUKLEME_AYARLARI}
+    return ayarlar
+
+@contextmanager
+def toplu_yukleme_profili(es, index_name, birlestir=True, maks_segment=BIRLESTIRME_SEGMENT_SAYISI,
+                          kontrol=None):
+    """
+    Büyük aktarımlar için "toplu yükleme" profili.
+
+    Blok süresince `refresh_interval: -1` ve sıfır replika uygulanır. Çıkışta
+    önceki ayarlar geri yüklenir, indeks yenilenir ve (başarılı aktarımlarda)
+    `maks_segment` segmente birleştirilir. Her adımın süresi yazdırılır ve
+    döndürülen sözlükte saklanır.
+
+    Kontrol noktası verilirse profil öncesi ayarlar oraya yazılır; yarıda kalan
+    bir aktarım sürdürülürken ayarlar profilin bıraktığı değerlere değil,
+    bu özgün değerlere geri alınır.
+    """
+    zamanlar = {}
+    baslangic = time.perf_counter()
+    if kontrol is not None and kontrol.veri.get("profil_oncesi"):
+        onceki = kontrol.veri["profil_oncesi"]
+    else:
+        onceki = _indeks_ayarlarini_oku(es, index_name)
+        if kontrol is not None:
+            kontrol.veri["profil_oncesi"] = onceki
+            kontrol.kaydet()
+    es.indices.put_settings(index=index_name, settings=TOPLU_YUKLEME_AYARLARI)
+    zamanlar["ayar_uygulama"] = time.perf_counter() - baslangic
+    print(f"⚙️ Toplu yükleme profili uygulandı: {index_name} ({zamanlar['ayar_uygulama']:.2f} sn)")
+
+    basarili = False
     try:
-        temiz_metin = temizle(metin)
-        es.index(index="sorular", id=soru_id, document={
-            "soru": metin,
-            "soru_cleaned": temiz_metin
-        })
+        yukleme_baslangic = time.perf_counter()
+        yield zamanlar
+        zamanlar["yukleme"] = time.perf_counter() - yukleme_baslangic
+        basarili = True
+    finally:
+        adim = time.perf_counter()
+        for ad, ayarlar in onceki.items():
+            es.indices.put_settings(index=ad, settings=ayarlar)
+        zamanlar["ayar_geri_alma"] = time.perf_counter() - adim
+        print(f"↩️ İndeks ayarları geri yüklendi ({zamanlar['ayar_geri_alma']:.2f} sn)")
+
+        adim = time.perf_counter()
+        es.indices.refresh(index=index_name)
+        zamanlar["yenileme"] = time.perf_counter() - adim
+        print(f"🔄 İndeks yenilendi ({zamanlar['yenileme']:.2f} sn)")
+
+    if basarili and birlestir:
+        adim = time.perf_counter()
+        es.options(request_timeout=BIRLESTIRME_ZAMAN_ASIMI).indices.forcemerge(
+            index=index_name, max_num_segments=maks_segment
+        )
+        zamanlar["birlestirme"] = time.perf_counter() - adim
+        print(f"🧱 Segmentler {maks_segment} segmente birleştirildi ({zamanlar['birlestirme']:.2f} sn)")
+
+    zamanlar["toplam"] = time.perf_counter() - baslangic
+
+def surumlu_indeksler(es):
+    """Mevcut `sorular_v<N>` indekslerini sürüm numarasına göre sıralı döndürür"""
+    desen = re.compile(rf"^{re.escape(SURUM_ON_EKI)}(\d+)$")
+    adlar = es.indices.get(index=f"{SURUM_ON_EKI}*", expand_wildcards="open,closed")
+    surumler = []
+    for ad in adlar:
+        eslesme = desen.match(ad)
+        if eslesme:
+            surumler.append((int(eslesme.group(1)), ad))
+    return [ad for _, ad in sorted(surumler)]
+
+def alias_hedefleri(es, alias=INDEX_NAME):
+    """Alias'ın işaret ettiği indeksleri döndürür (alias yoksa boş liste)"""
+    if not es.indices.exists_alias(name=alias):
+        return []
+    return list(es.indices.get_alias(name=alias).keys())
+
+def sonraki_surum_adi(es):
+    """Bir sonraki sürümlü indeksin adını üretir"""
+    surumler = surumlu_indeksler(es)
+    son = int(surumler[-1][len(SURUM_ON_EKI):]) if surumler else 0
+    return f"{SURUM_ON_EKI}{son + 1}"
+
+def indeksi_hazirla(es, index_name=INDEX_NAME):
+    """
+    Arama adı yoksa ilk sürümlü indeksi oluşturup alias'ı ona bağlar;
+    varsa mapping'in güncel olup olmadığını kontrol eder.
+    """
+    try:
+        if not es.indices.exists(index=index_name):
+            surum = sonraki_surum_adi(es)
+            indeksi_olustur(es, surum)
+            es.indices.update_aliases(actions=[{"add": {"index": surum, "alias": index_name}}])
+            print(f"✅ {surum} indeksi Türkçe analiz mapping'i ile oluşturuldu ({index_name} alias'ı bağlandı).")
+            return
+        mapping = es.indices.get_mapping(index=index_name)
+        alanlar = next(iter(mapping.values()), {}).get("mappings", {}).get("properties", {})
+        if "turkce" not in alanlar.get("soru", {}).get("fields", {}):
+            print(f"⚠️ {index_name} indeksi açık mapping olmadan oluşturulmuş; sunucu taraflı analiz "
+                  "için --yeniden-olustur ile yeniden oluşturun.")
     except Exception as e:
-        print(f"{soru_id} numaralı soru yüklenemedi:", e)
+        print("Index kontrolünde hata:", e)
+
+def alias_degistir(es, yeni_indeks, alias=INDEX_NAME):
+    """
+    Alias'ı tek bir atomik istekle yeni indekse taşır.
+
+    Alias yerine aynı adda gerçek bir indeks varsa (sürümlemeden önceki kurulum),
+    o indeks de aynı istek içinde kaldırılır; aramalar hiçbir anda boş ada düşmez.
+    """
+    eylemler = []
+    eski_hedefler = alias_hedefleri(es, alias)
+    if eski_hedefler:
+        eylemler.extend({"remove": {"index": hedef, "alias": alias}} for hedef in eski_hedefler)
+    elif es.indices.exists(index=alias):
+        eylemler.append({"remove_index": {"index": alias}})
+    eylemler.append({"add": {"index": yeni_indeks, "alias": alias}})
+    es.indices.update_aliases(actions=eylemler)
+    return eski_hedefler
+
+def eski_surumleri_sil(es, aktif_indeks, saklanacak=SAKLANACAK_ESKI_SURUM):
+    """Aktif indeks dışındaki eski sürümleri, en yeni `saklanacak` tanesi hariç siler"""
+    eskiler = [ad for ad in surumlu_indeksler(es) if ad != aktif_indeks]
+    silinecekler = eskiler[:len(eskiler) - saklanacak] if saklanacak else eskiler
+    for ad in silinecekler:
+        es.indices.delete(index=ad)
+        print(f"🗑️ Eski sürüm silindi: {ad}")
+    return silinecekler
+
+@monitor_performance("elasticsearch_yeniden_indeksleme")
+def yeniden_indeksle(es, yukle, alias=INDEX_NAME, saklanacak=SAKLANACAK_ESKI_SURUM, db_path=DB_PATH,
+                     birlestir=True, maks_segment=BIRLESTIRME_SEGMENT_SAYISI, kontrol=None, vektor_boyutu=None):
+    """
+    Kesintisiz yeniden indeksleme: yeni sürümlü indeksi doldurur, doğrular ve alias'ı taşır.
+
+    Args:
+        es (Elasticsearch): Bağlı istemci
+        yukle (callable): Hedef indeks adını alıp aktarım istatistiğini döndüren fonksiyon
+            (ör. `sorulari_indeksle` veya `sorulari_paralel_indeksle`)
+        alias (str): Aramaların yapıldığı ad
+        saklanacak (int): Silinmeden bırakılacak eski sürüm sayısı
+        db_path (str): SQLite veritabanı yolu
+        birlestir (bool): Alias taşınmadan önce force-merge yapılıp yapılmayacağı
+        maks_segment (int): Birleştirme sonrası hedef segment sayısı
+        kontrol (KontrolNoktasi): Verilirse yarım kalan sürüm indeksine kaldığı yerden devam edilir
+        vektor_boyutu (int): Verilirse yeni indeks bu boyutta vektör alanıyla oluşturulur
+
+    Returns:
+        dict: Aktarım istatistiği; `yeni_indeks`, `alias_degisti` ve `profil` alanlarıyla birlikte
+    """
+    yarim_indeks = kontrol.veri.get("hedef_indeks") if kontrol is not None else None
+    if yarim_indeks and es.indices.exists(index=yarim_indeks):
+        yeni_indeks = yarim_indeks
+        print(f"♻️ {yeni_indeks} indeksine kaldığı yerden devam ediliyor...")
+    else:
+        yeni_indeks = sonraki_surum_adi(es)
+        indeksi_olustur(es, yeni_indeks, vektor_boyutu)
+        if kontrol is not None:
+            kontrol.veri["hedef_indeks"] = yeni_indeks
+            kontrol.kaydet()
+        print(f"🏗️ {yeni_indeks} oluşturuldu, veriler aktarılıyor (aramalar mevcut indeksten devam ediyor)...")
+
+    # Yeni indeks henüz aranmadığı için toplu yükleme profili her zaman uygulanır;
+    # birleştirme alias taşınmadan önce biter, aramalar gecikme sıçraması görmez
+    with toplu_yukleme_profili(es, yeni_indeks, birlestir, maks_segment, kontrol) as profil:
+        istatistik = yukle(yeni_indeks)
+    istatistik["yeni_indeks"] = yeni_indeks
+    istatistik["alias_degisti"] = False
+    istatistik["profil"] = profil
+
+    # Doğrulama: onaylanan her döküman yeni indekste olmalı ve hiç hata olmamalı
+    dokuman_sayisi = es.count(index=yeni_indeks)["count"]
+    onaylanan = istatistik["basarili"] + istatistik.get("onceki_basarili", 0)
+    if istatistik["hatali"] or istatistik.get("onceki_hatali", 0) or dokuman_sayisi != onaylanan:
+        print(f"❌ Doğrulama başarısız: {onaylanan} döküman onaylandı, "
+              f"{yeni_indeks} içinde {dokuman_sayisi} döküman var, {istatistik['hatali']} hata.")
+        print(f"   {alias} alias'ı değiştirilmedi, {yeni_indeks} siliniyor.")
+        es.indices.delete(index=yeni_indeks)
+        # Delta kaydı silinen indekse göre oluştu; bir sonraki --delta her şeyi yeniden göndersin
+        durum = IndeksDurumu(db_path)
+        durum.sifirla()
+        durum.kapat()
+        return istatistik
+
+    eski_hedefler = alias_degistir(es, yeni_indeks, alias)
+    istatistik["alias_degisti"] = True
+    # Aktarım sırasında eski indeksten önbelleğe alınmış sonuçlar da geçersiz olsun
+    durum = IndeksDurumu(db_path)
+    durum.nesli_yenile()
+    durum.kapat()
+    print(f"🔀 {alias} alias'ı {', '.join(eski_hedefler) or 'önceki indeks'} → {yeni_indeks} olarak değiştirildi "
+          f"({dokuman_sayisi} döküman doğrulandı).")
+    eski_surumleri_sil(es, yeni_indeks, saklanacak)
+    return istatistik
+
+def soru_parcalarini_oku(conn, okuma_boyutu=OKUMA_BOYUTU, baslangic_id=0, hiz_siniri=None, tekrar_idler=()):
+    """
+    `sorular` tablosunu tamamını belleğe almadan parça parça okur.
+
+    Her parça ayrı ve kısa bir sorguyla (id > son okunan id) alınır; böylece
+    uzun süre açık kalan bir okuma imleci durum tablosuna yazmayı engellemez.
+    `hiz_siniri` (döküman/sn) verilirse okuma jeton kovasıyla yavaşlatılır;
+    aktarım cluster'ı etkileşimli aramalardan çalmaz. `tekrar_idler` (kontrol
+    noktasındaki hatalı dökümanlar) verilirse önce bu satırlar okunur.
+    """
+    kova = JetonKovasi(hiz_siniri, max(hiz_siniri, okuma_boyutu)) if hiz_siniri else None
+    tekrar_idler = list(tekrar_idler)
+    # SQLite'ın parametre sınırını aşmamak için IN listesi küçük tutulur
+    tekrar_boyutu = min(okuma_boyutu, 500)
+    for i in range(0, len(tekrar_idler), tekrar_boyutu):
+        idler = tekrar_idler[i:i + tekrar_boyutu]
+        satirlar = conn.execute(
+            f"SELECT id, metin FROM sorular WHERE id IN ({', '.join('?' * len(idler))}) ORDER BY id", idler,
+        ).fetchall()
+        if satirlar:
+            if kova is not None:
+                kova.bekle(len(satirlar))
+            yield satirlar
+    son_id = baslangic_id
+    while True:
+        satirlar = conn.execute(
+            "SELECT id, metin FROM sorular WHERE id > ? ORDER BY id LIMIT ?",
+            (son_id, okuma_boyutu),
+        ).fetchall()
+        if not satirlar:
+            break
+        son_id = satirlar[-1][0]
+        if kova is not None:
+            kova.bekle(len(satirlar))
+        yield satirlar
+
+def en_buyuk_soru_id(conn):
+    """`sorular` tablosundaki en büyük id (boşsa 0)"""
+    return conn.execute("SELECT COALESCE(MAX(id), 0) FROM sorular").fetchone()[0]
+
+def soru_satirlarini_oku(conn, okuma_boyutu=OKUMA_BOYUTU, baslangic_id=0, hiz_siniri=None, tekrar_idler=()):
+    """Parça parça okunan satırları tek tek döndürür"""
+    for satirlar in soru_parcalarini_oku(conn, okuma_boyutu, baslangic_id, hiz_siniri, tekrar_idler):
+        yield from satirlar
+
+def _dokuman_eylemi(soru_id, metin, temiz_metin, index_name, istatistik, durum=None, vektor=None, kontrol=None):
+    """Tek bir soru için _bulk eylemi oluşturur ve aktarılan bayt miktarını sayar"""
+    if durum is not None:
+        durum.beklet(soru_id, icerik_ozeti(metin))
+    if kontrol is not None:
+        kontrol.gonderildi(soru_id)
+    dokuman = {
+        "soru": metin,
+        "soru_cleaned": temiz_metin
+    }
+    if vektor is not None:
+        dokuman[VEKTOR_ALANI] = vektor
+    # Aktarılan veri miktarını (eylem satırı + döküman) yaklaşık olarak say
+    istatistik["bayt"] += len(json.dumps(dokuman, ensure_ascii=False).encode("utf-8")) + 64
+    return {
+        "_op_type": "index",
+        "_index": index_name,
+        "_id": soru_id,
+        "_source": dokuman,
+    }
+
+def _vektorlerle(uclular, vektor_modeli, istatistik):
+    """
+    (id, metin, temiz) üçlülerine vektörlerini ekler: (id, metin, temiz, vektör).
+
+    Model tek tek değil VEKTOR_PARCA_BOYUTU'luk gruplarla çağrılır; harcanan süre
+    istatistiğin `vektorleme` alanında birikir. Model yoksa vektör None'dır.
+    """
+    uclular = iter(uclular)
+    while True:
+        parca = list(islice(uclular, VEKTOR_PARCA_BOYUTU))
+        if not parca:
+            return
+        if vektor_modeli is None:
+            vektorler = [None] * len(parca)
+        else:
+            baslangic = time.perf_counter()
+            vektorler = vektor_modeli.vektorle(temiz for _, _, temiz in parca)
+            istatistik["vektorleme"] = istatistik.get("vektorleme", 0.0) + time.perf_counter() - baslangic
+        for (soru_id, metin, temiz), vektor in zip(parca, vektorler):
+            yield soru_id, metin, temiz, vektor
+
+def _bulk_eylemleri(satirlar, index_name, istatistik, durum=None, vektor_modeli=None, kontrol=None):
+    """Her satır için temizlenmiş alanla (ve modeli verilmişse vektörüyle) bir _bulk eylemi üretir"""
+    satirlar, metinler = tee(satirlar)
+    temizler = temizle_many(metin for _, metin in metinler)
+    uclular = ((soru_id, metin, temiz) for (soru_id, metin), temiz in zip(satirlar, temizler))
+    for soru_id, metin, temiz, vektor in _vektorlerle(uclular, vektor_modeli, istatistik):
+        yield _dokuman_eylemi(soru_id, metin, temiz, index_name, istatistik, durum, vektor, kontrol)
+
+def _hata_mesaji(item):
+    """_bulk yanıtındaki başarısız eleman için (id, hata) çiftini döndürür"""
+    detay = next(iter(item.values()), {})
+    hata = detay.get("error") or detay.get("exception") or detay.get("status")
+    return detay.get("_id"), hata
+
+def _sonucu_isle(ok, item, istatistik, durum=None, kontrol=None):
+    """_bulk yanıtındaki tek bir elemanı istatistiğe işler, hatayı raporlar"""
+    istatistik["dokuman"] += 1
+    islem, detay = next(iter(item.items()), (None, {}))
+    # Zaten bulunmayan bir dökümanı silmek de istenen sonuçtur
+    if not ok and islem == "delete" and detay.get("status") == 404:
+        ok = True
+    if ok:
+        istatistik["basarili"] += 1
+        if durum is not None:
+            durum.onayla(detay.get("_id"))
+    else:
+        istatistik["hatali"] += 1
+        soru_id, hata = _hata_mesaji(item)
+        print(f"{soru_id} numaralı soru yüklenemedi:", hata)
+        if durum is not None:
+            durum.reddet(soru_id)
+    if kontrol is not None and detay.get("_id") is not None:
+        kontrol.ilerle(detay["_id"], ok)
+
+def ozet_yazdir(istatistik):
+    """Aktarım sonunda verim özetini yazdırır"""
+    sure = max(istatistik["sure"], 1e-9)
+    mb = istatistik["bayt"] / 1024 / 1024
+    print("\n📊 İndeksleme Özeti:")
+    print(f"   Toplam döküman: {istatistik['dokuman']}")
+    print(f"   ✅ Başarılı: {istatistik['basarili']}")
+    print(f"   ❌ Hatalı: {istatistik['hatali']}")
+    if "yeni" in istatistik:
+        print(f"   🆕 Yeni: {istatistik['yeni']}, ✏️ Değişen: {istatistik['degisen']}, "
+              f"🗑️ Silinen: {istatistik['silinen']}, ⏭️ Değişmeyen: {istatistik['atlanan']}")
+    print(f"   ⏱️ Süre: {istatistik['sure']:.2f} saniye")
+    print(f"   🚀 Verim: {istatistik['dokuman'] / sure:.1f} döküman/sn, {mb / sure:.2f} MB/sn ({mb:.2f} MB)")
+    if "vektorleme" in istatistik:
+        print(f"   🧭 Vektörleme: {istatistik['vektorleme']:.2f} sn (toplam sürenin payı %{istatistik['vektorleme'] / sure * 100:.0f})")
+
+    asamalar = istatistik.get("asamalar")
+    if asamalar:
+        print("\n🔬 Aşama Bazlı Verim:")
+        for ad, asama in asamalar.items():
+            asama_suresi = max(asama["sure"], 1e-9)
+            print(f"   {ad}: {asama['sure']:.2f} sn, {asama['adet'] / asama_suresi:.1f} döküman/sn")
+        bekleme = istatistik.get("temizleme_bekleme", 0.0)
+        if bekleme > 0.2 * sure:
+            print(f"   💡 İndeksleme temizleme işçilerini {bekleme:.2f} sn bekledi, işçi sayısını artırmayı deneyin.")
+
+    profil = istatistik.get("profil")
+    if profil:
+        print("\n⏱️ Toplu Yükleme Profili:")
+        for adim, adim_suresi in profil.items():
+            print(f"   {adim}: {adim_suresi:.2f} sn")
+
+def _yeni_istatistik(kontrol=None, **ekler):
+    """Aktarım istatistiğini başlatır; sürdürülen çalışmada önceki onayları taşır"""
+    istatistik = {"dokuman": 0, "basarili": 0, "hatali": 0, "bayt": 0, "sure": 0.0}
+    if kontrol is not None and kontrol.son_id:
+        istatistik["onceki_basarili"] = kontrol.veri["basarili"]
+        istatistik["onceki_hatali"] = kontrol.veri["hatali"]
+    istatistik.update(ekler)
+    return istatistik
+
+def _baslangic_id(durum, kontrol):
+    """Kontrol noktası varsa oradan devam eder; yoksa delta kaydını sıfırlayıp baştan başlar"""
+    if kontrol is not None and kontrol.son_id:
+        print(f"♻️ Kontrol noktasından devam: parti {kontrol.veri['parti']}, son id {kontrol.son_id}"
+              + (f", yeniden denenecek {len(kontrol.hatali_idler)} hatalı döküman" if kontrol.hatali_idler else ""))
+        return kontrol.son_id
+    # Tam aktarım delta kaydını baştan oluşturur
+    durum.sifirla()
+    return 0
+
+def _ilerlemeyi_kaydet(durum, kontrol):
+    """Aktarım bitse de yarıda kesilse de (hata, Ctrl-C) onaylanmış ilerlemeyi diske yazar"""
+    try:
+        durum.kaydet()
+    finally:
+        durum.kapat()
+        if kontrol is not None:
+            kontrol.kaydet()
+
+@monitor_performance("elasticsearch_toplu_indeksleme")
+def sorulari_indeksle(es, index_name=INDEX_NAME, okuma_boyutu=OKUMA_BOYUTU,
+                      bulk_boyutu=BULK_BOYUTU, maks_bayt=BULK_MAKS_BAYT, db_path=DB_PATH,
+                      kontrol=None, hiz_siniri=None, vektor_modeli=None):
+    """
+    Soruları SQLite'tan akış halinde okuyup _bulk istekleriyle indeksler.
+
+    Args:
+        es (Elasticsearch): Bağlı istemci
+        index_name (str): Hedef indeks
+        okuma_boyutu (int): SQLite okuma parça boyutu
+        bulk_boyutu (int): _bulk isteği başına döküman sayısı
+        maks_bayt (int): _bulk isteği başına maksimum bayt
+        db_path (str): SQLite veritabanı yolu
+        kontrol (KontrolNoktasi): Verilirse ilerleme kaydedilir ve son onaylanan id'den devam edilir
+        hiz_siniri (float): Saniyede en fazla aktarılacak döküman (None: sınırsız)
+        vektor_modeli (VektorModeli): Verilirse her dökümana VEKTOR_ALANI yazılır
+
+    Returns:
+        dict: Döküman, hata, bayt ve süre istatistikleri
+    """
+    istatistik = _yeni_istatistik(kontrol)
+    baslangic = time.time()
+
+    conn = sqlite3.connect(db_path)
+    durum = IndeksDurumu(db_path)
+    try:
+        baslangic_id = _baslangic_id(durum, kontrol)
+        son_id = en_buyuk_soru_id(conn)
+        satirlar = soru_satirlarini_oku(conn, okuma_boyutu, baslangic_id, hiz_siniri,
+                                        kontrol.hatali_idler if kontrol is not None else ())
+        eylemler = _bulk_eylemleri(satirlar, index_name, istatistik, durum, vektor_modeli, kontrol)
+        for ok, item in helpers.streaming_bulk(
+            es, eylemler,
+            chunk_size=bulk_boyutu,
+            max_chunk_bytes=maks_bayt,
+            raise_on_error=False,
+            raise_on_exception=False,
+            max_retries=3,
+        ):
+            _sonucu_isle(ok, item, istatistik, durum, kontrol)
+        durum.tamamla(son_id)
+    finally:
+        _ilerlemeyi_kaydet(durum, kontrol)
+        conn.close()
+
+    istatistik["sure"] = time.time() - baslangic
+    return istatistik
+
+def _parcayi_temizle(satirlar):
+    """İşçi süreçte çalışır: bir parçadaki soruları temizler ve işçi süresini döndürür"""
+    baslangic = time.perf_counter()
+    temizler = temizle_many(metin for _, metin in satirlar)
+    temiz = [(soru_id, metin, temizlenmis) for (soru_id, metin), temizlenmis in zip(satirlar, temizler)]
+    # İşçi süreçlerde atexit çalışmadığından yeni kökler her parçadan sonra yazılır
+    kok_sozlugunu_kaydet()
+    return temiz, time.perf_counter() - baslangic
+
+def _temizlenmis_parcalar(conn, havuz, okuma_boyutu, maks_bekleyen, istatistik, baslangic_id=0, hiz_siniri=None,
+                          tekrar_idler=()):
+    """
+    Okunan parçaları süreç havuzuna dağıtır ve sonuçları sırayla döndürür.
+
+    Uçuştaki parça sayısı `maks_bekleyen` ile sınırlandığı için okuma,
+    temizleme ve indeksleme arasındaki bellek kullanımı sabit kalır.
+    """
+    asamalar = istatistik["asamalar"]
+    bekleyenler = deque()
+    parcalar = soru_parcalarini_oku(conn, okuma_boyutu, baslangic_id, hiz_siniri, tekrar_idler)
+
+    def _siradaki_sonuc():
+        future = bekleyenler.popleft()
+        bekleme_baslangic = time.perf_counter()
+        temiz, isci_suresi = future.result()
+        istatistik["temizleme_bekleme"] += time.perf_counter() - bekleme_baslangic
+        asamalar["temizleme (işçi toplamı)"]["sure"] += isci_suresi
+        asamalar["temizleme (işçi toplamı)"]["adet"] += len(temiz)
+        return temiz
+
+    while True:
+        okuma_baslangic = time.perf_counter()
+        satirlar = next(parcalar, None)
+        asamalar["okuma"]["sure"] += time.perf_counter() - okuma_baslangic
+        if satirlar is None:
+            break
+        asamalar["okuma"]["adet"] += len(satirlar)
+        bekleyenler.append(havuz.submit(_parcayi_temizle, satirlar))
+
+        # Geri basınç: havuz doluysa en eski parçanın bitmesini bekle
+        while len(bekleyenler) >= maks_bekleyen:
+            yield _siradaki_sonuc()
+
+    while bekleyenler:
+        yield _siradaki_sonuc()
+
+@monitor_performance("elasticsearch_paralel_indeksleme")
+def sorulari_paralel_indeksle(es, index_name=INDEX_NAME, okuma_boyutu=OKUMA_BOYUTU,
+                              bulk_boyutu=BULK_BOYUTU, maks_bayt=BULK_MAKS_BAYT,
+                              isci_sayisi=ISCI_SAYISI, bulk_thread_sayisi=BULK_THREAD_SAYISI,
+                              maks_bekleyen=None, db_path=DB_PATH, kontrol=None, hiz_siniri=None,
+                              vektor_modeli=None):
+    """
+    Temizlemeyi süreç havuzuna dağıtarak ve birden fazla _bulk isteğini
+    aynı anda uçuşta tutarak soruları indeksler.
+
+    Args:
+        isci_sayisi (int): `temizle` çalıştıracak süreç sayısı
+        bulk_thread_sayisi (int): Eşzamanlı _bulk isteği sayısı
+        maks_bekleyen (int): Temizlenmeyi bekleyen en fazla parça sayısı (varsayılan: 2 x işçi)
+        Diğer argümanlar `sorulari_indeksle` ile aynıdır.
+
+    Returns:
+        dict: Genel ve aşama bazlı (okuma, temizleme, indeksleme) istatistikler
+    """
+    maks_bekleyen = maks_bekleyen or isci_sayisi * 2
+    istatistik = _yeni_istatistik(
+        kontrol,
+        temizleme_bekleme=0.0,
+        asamalar={
+            "okuma": {"sure": 0.0, "adet": 0},
+            "temizleme (işçi toplamı)": {"sure": 0.0, "adet": 0},
+            "indeksleme": {"sure": 0.0, "adet": 0},
+        },
+    )
+    baslangic = time.time()
+
+    def _eylemler(parcalar):
+        for parca in parcalar:
+            for soru_id, metin, temiz_metin, vektor in _vektorlerle(parca, vektor_modeli, istatistik):
+                yield _dokuman_eylemi(soru_id, metin, temiz_metin, index_name, istatistik, durum, vektor, kontrol)
+
+    # Eylemler parallel_bulk'un görev thread'inde üretildiği için bağlantı thread'ler arası kullanılır
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    durum = IndeksDurumu(db_path)
+    try:
+        baslangic_id = _baslangic_id(durum, kontrol)
+        son_id = en_buyuk_soru_id(conn)
+        with ProcessPoolExecutor(max_workers=isci_sayisi) as havuz:
+            parcalar = _temizlenmis_parcalar(conn, havuz, okuma_boyutu, maks_bekleyen, istatistik,
+                                             baslangic_id, hiz_siniri,
+                                             kontrol.hatali_idler if kontrol is not None else ())
+            for ok, item in helpers.parallel_bulk(
+                es, _eylemler(parcalar),
+                thread_count=bulk_thread_sayisi,
+                queue_size=bulk_thread_sayisi,
+                chunk_size=bulk_boyutu,
+                max_chunk_bytes=maks_bayt,
+                raise_on_error=False,
+                raise_on_exception=False,
+            ):
+                _sonucu_isle(ok, item, istatistik, durum, kontrol)
+        durum.tamamla(son_id)
+    finally:
+        _ilerlemeyi_kaydet(durum, kontrol)
+        conn.close()
+
+    istatistik["sure"] = time.time() - baslangic
+    # İndeksleme aşaması, temizleme sonucunu beklemek dışında geçen duvar saati süresidir
+    asamalar = istatistik["asamalar"]
+    asamalar["indeksleme"]["sure"] = max(istatistik["sure"] - istatistik["temizleme_bekleme"]
+                                         - asamalar["okuma"]["sure"], 0.0)
+    asamalar["indeksleme"]["adet"] = istatistik["dokuman"]
+    return istatistik
+
+def _delta_eylemleri(conn, durum, index_name, okuma_boyutu, son_id, tumu_degisti, istatistik, vektor_modeli=None):
+    """Yalnızca yeni, değişmiş ve silinmiş sorular için _bulk eylemleri üretir"""
+    onceki_id = 0
+    while True:
+        satirlar = conn.execute(f"""
+            SELECT s.id, s.metin, d.ozet
+            FROM sorular s LEFT JOIN {DURUM_TABLOSU} d ON d.id = s.id
+            WHERE s.id > ? ORDER BY s.id LIMIT ?
+        """, (onceki_id, okuma_boyutu)).fetchall()
+        if not satirlar:
+            break
+        onceki_id = satirlar[-1][0]
+
+        gonderilecek = []
+        for soru_id, metin, eski_ozet in satirlar:
+            if soru_id > son_id:
+                istatistik["yeni"] += 1
+            elif tumu_degisti or eski_ozet != icerik_ozeti(metin):
+                istatistik["degisen"] += 1
+            else:
+                istatistik["atlanan"] += 1
+                continue
+            gonderilecek.append((soru_id, metin))
+
+        temizler = temizle_many(metin for _, metin in gonderilecek)
+        uclular = ((soru_id, metin, temiz) for (soru_id, metin), temiz in zip(gonderilecek, temizler))
+        for soru_id, metin, temiz, vektor in _vektorlerle(uclular, vektor_modeli, istatistik):
+            yield _dokuman_eylemi(soru_id, metin, temiz, index_name, istatistik, durum, vektor)
+
+    # Veritabanından silinmiş ama indekste kalmış sorular
+    silinenler = [satir[0] for satir in conn.execute(f"""
+        SELECT d.id FROM {DURUM_TABLOSU} d LEFT JOIN sorular s ON s.id = d.id
+        WHERE s.id IS NULL
+    """)]
+    for soru_id in silinenler:
+        istatistik["silinen"] += 1
+        durum.beklet(soru_id, None)
+        yield {"_op_type": "delete", "_index": index_name, "_id": soru_id}
+
+@monitor_performance("elasticsearch_delta_indeksleme")
+def sorulari_delta_indeksle(es, index_name=INDEX_NAME, okuma_boyutu=OKUMA_BOYUTU,
+                            bulk_boyutu=BULK_BOYUTU, maks_bayt=BULK_MAKS_BAYT, db_path=DB_PATH,
+                            vektor_modeli=None):
+    """
+    Son aktarımdan bu yana eklenen, değişen veya silinen soruları indekse yansıtır.
+
+    Daha önce aktarılmış satırlar id üst sınırı ve içerik özetiyle tanınır; yalnızca
+    farklı olanlar temizlenip gönderilir. Stopword listesi değiştiyse tüm satırlar
+    yeniden gönderilir. `vektor_modeli` verilirse gönderilen dökümanlara vektör
+    de yazılır; tam aktarımda kaydedilen model kullanılmalıdır.
+
+    Returns:
+        dict: `sorulari_indeksle` istatistiklerine ek olarak yeni/değişen/silinen/atlanan sayıları
+    """
+    istatistik = {"dokuman": 0, "basarili": 0, "hatali": 0, "bayt": 0, "sure": 0.0,
+                  "yeni": 0, "degisen": 0, "silinen": 0, "atlanan": 0}
+    baslangic = time.time()
+
+    conn = sqlite3.connect(db_path)
+    durum = IndeksDurumu(db_path)
+    try:
+        son_id = int(durum.meta_oku("son_id", 0))
+        kayitli_ozet = durum.meta_oku("stopword_ozeti")
+        tumu_degisti = kayitli_ozet is not None and kayitli_ozet != stopword_ozeti()
+        if tumu_degisti:
+            print("⚠️ Stopword listesi değişmiş, tüm sorular yeniden gönderilecek.")
+
+        yeni_son_id = en_buyuk_soru_id(conn)
+        eylemler = _delta_eylemleri(conn, durum, index_name, okuma_boyutu, son_id, tumu_degisti, istatistik,
+                                    vektor_modeli)
+        for ok, item in helpers.streaming_bulk(
+            es, eylemler,
+            chunk_size=bulk_boyutu,
+            max_chunk_bytes=maks_bayt,
+            raise_on_error=False,
+            raise_on_exception=False,
+            max_retries=3,
+        ):
+            _sonucu_isle(ok, item, istatistik, durum)
+        durum.tamamla(max(son_id, yeni_son_id))
+    finally:
+        # Delta modunun kendisi sürdürülebilir: onaylanan her satır kayda geçtiği
+        # için yarıda kalan bir çalışma tekrarlandığında yalnızca kalanlar gönderilir
+        _ilerlemeyi_kaydet(durum, None)
+        conn.close()
+
+    istatistik["sure"] = time.time() - baslangic
+    return istatistik
+
+def main():
+    parser = argparse.ArgumentParser(description="Soruları Elasticsearch'e toplu olarak aktarır.")
+    parser.add_argument("--okuma-boyutu", type=int, default=OKUMA_BOYUTU,
+                        help="SQLite'tan tek seferde okunacak satır sayısı")
+    parser.add_argument("--bulk-boyutu", type=int, default=BULK_BOYUTU,
+                        help="Bir _bulk isteğindeki maksimum döküman sayısı")
+    parser.add_argument("--maks-mb", type=float, default=BULK_MAKS_BAYT / 1024 / 1024,
+                        help="Bir _bulk isteğinin maksimum boyutu (MB)")
+    parser.add_argument("--yeniden-olustur", action="store_true",
+                        help="Yeni sürümlü indeks oluşturup doldur, doğrula ve alias'ı kesintisiz taşı")
+    parser.add_argument("--sakla", type=int, default=SAKLANACAK_ESKI_SURUM,
+                        help="Yeniden indekslemeden sonra saklanacak eski sürüm sayısı")
+    parser.add_argument("--toplu-profil", action="store_true",
+                        help="Tam aktarımda toplu yükleme profilini (refresh kapalı, replika yok, force-merge) kullan")
+    parser.add_argument("--segment", type=int, default=BIRLESTIRME_SEGMENT_SAYISI,
+                        help="Toplu yükleme sonrası force-merge hedef segment sayısı")
+    parser.add_argument("--birlestirme", action=argparse.BooleanOptionalAction, default=True,
+                        help="Toplu yükleme sonrası force-merge yap")
+    parser.add_argument("--delta", action="store_true",
+                        help="Yalnızca yeni, değişen ve silinen soruları aktar")
+    parser.add_argument("--devam", action="store_true",
+                        help="Yarıda kalan tam aktarımı kontrol noktasından sürdür")
+    parser.add_argument("--kontrol-araligi", type=int, default=KONTROL_NOKTASI_ARALIGI,
+                        help="Kaç onaylı dökümanda bir kontrol noktası yazılacağı")
+    parser.add_argument("--paralel", action="store_true",
+                        help="Temizlemeyi süreç havuzunda, _bulk isteklerini eşzamanlı çalıştır")
+    parser.add_argument("--isci", type=int, default=ISCI_SAYISI,
+                        help="Paralel modda temizleme süreç sayısı")
+    parser.add_argument("--bulk-thread", type=int, default=BULK_THREAD_SAYISI,
+                        help="Paralel modda aynı anda uçuşta olacak _bulk isteği sayısı")
+    parser.add_argument("--maks-bekleyen", type=int, default=None,
+                        help="Paralel modda temizlenmeyi bekleyen en fazla parça sayısı")
+    parser.add_argument("--hiz-siniri", type=float, default=VARSAYILAN_HIZ_SINIRI,
+                        help="Tam aktarımda saniyede en fazla gönderilecek döküman "
+                             "(canlı cluster'ı korumak için; 0: sınırsız)")
+    parser.add_argument("--vektor", action="store_true",
+                        help="Her soru için yerel vektör üretip kNN araması için dense_vector alanına yaz "
+                             "(tam aktarımda model yeniden eğitilir, --delta kayıtlı modeli kullanır)")
+    args = parser.parse_args()
+    if args.delta and args.yeniden_olustur:
+        parser.error("--delta, --yeniden-olustur ile birlikte kullanılamaz (yeni indeks tam aktarım gerektirir)")
+    if args.delta and args.devam:
+        parser.error("--delta zaten kaldığı yerden devam eder, --devam gerekmez")
+
+    # Kontrol noktası: --devam ile kayıtlı olanı yükle, yoksa yeni bir tane başlat
+    kontrol = KontrolNoktasi.yukle(aralik=args.kontrol_araligi) if args.devam else None
+    if kontrol is not None and bool(kontrol.veri.get("yeniden_olustur")) != args.yeniden_olustur:
+        parser.error("Kontrol noktası farklı bir mod için kaydedilmiş "
+                     f"(--yeniden-olustur: {bool(kontrol.veri.get('yeniden_olustur'))})")
+    if kontrol is not None and bool(kontrol.veri.get("vektor_modeli")) != args.vektor:
+        parser.error("Kontrol noktası farklı bir mod için kaydedilmiş "
+                     f"(--vektor: {bool(kontrol.veri.get('vektor_modeli'))})")
+    if kontrol is None and not args.delta:
+        if args.devam:
+            print("ℹ️ Kontrol noktası bulunamadı, aktarım baştan başlıyor.")
+        elif os.path.exists(KONTROL_NOKTASI_DOSYASI):
+            print("⚠️ Yarım kalmış bir aktarımın kontrol noktası var; sürdürmek için --devam kullanın. "
+                  "Aktarım baştan başlıyor.")
+        kontrol = KontrolNoktasi({"yeniden_olustur": args.yeniden_olustur}, aralik=args.kontrol_araligi)
+
+    # Elasticsearch'e bağlan
+    es = get_default_client()
+    if not es:
+        raise SystemExit("Elasticsearch bağlantısı kurulamadı. Lütfen servisi kontrol edin.")
+
+    maks_bayt = int(args.maks_mb * 1024 * 1024)
+
+    vektor_modeli = None
+    if args.vektor:
+        # ml_analyzer/scikit-learn yalnızca vektör istendiğinde yüklenir
+        from vektor_modeli import VektorModeli, get_vektor_modeli, vektor_modelini_egit
+        try:
+            # Delta aktarımı indeksteki vektörlerle aynı uzayda kalmalı; model yeniden eğitilmez
+            if args.delta:
+                vektor_modeli = get_vektor_modeli()
+            elif kontrol.veri.get("vektor_modeli"):
+                # Sürdürülen aktarım kesintiden önce yazılan vektörlerin modelini kullanır
+                vektor_modeli = VektorModeli.yukle(kontrol.veri["vektor_modeli"])
+            else:
+                # Aramaların kullandığı dosyaya yükleme bittikten sonra yazılır
+                vektor_modeli = vektor_modelini_egit(DB_PATH, dosya=KONTROL_VEKTOR_MODELI_DOSYASI)
+                kontrol.veri["vektor_modeli"] = KONTROL_VEKTOR_MODELI_DOSYASI
+                kontrol.kaydet()
+        except (ValueError, FileNotFoundError) as e:
+            raise SystemExit(f"❌ {e}")
+
+    def _tam_yukle(index_name=INDEX_NAME):
+        if args.paralel:
+            return sorulari_paralel_indeksle(
+                es,
+                index_name=index_name,
+                okuma_boyutu=args.okuma_boyutu,
+                bulk_boyutu=args.bulk_boyutu,
+                maks_bayt=maks_bayt,
+                isci_sayisi=args.isci,
+                bulk_thread_sayisi=args.bulk_thread,
+                maks_bekleyen=args.maks_bekleyen,
+                kontrol=kontrol,
+                hiz_siniri=args.hiz_siniri,
+                vektor_modeli=vektor_modeli,
+            )
+        return sorulari_indeksle(
+            es,
+            index_name=index_name,
+            okuma_boyutu=args.okuma_boyutu,
+            bulk_boyutu=args.bulk_boyutu,
+            maks_bayt=maks_bayt,
+            kontrol=kontrol,
+            hiz_siniri=args.hiz_siniri,
+            vektor_modeli=vektor_modeli,
+        )
+
+    if args.yeniden_olustur:
+        istatistik = yeniden_indeksle(es, _tam_yukle, saklanacak=args.sakla,
+                                      birlestir=args.birlestirme, maks_segment=args.segment,
+                                      kontrol=kontrol, vektor_boyutu=vektor_modeli and vektor_modeli.boyut)
+        if vektor_modeli is not None and istatistik["alias_degisti"]:
+            # Sorgular yeni indeksin vektör uzayına ancak alias taşındıktan sonra geçer
+            vektor_modeli.kaydet()
+        kontrol.sil()
+        ozet_yazdir(istatistik)
+        print("Elasticsearch'e veri aktarma tamamlandı.")
+        return
+
+    indeksi_hazirla(es)
+    if vektor_modeli is not None:
+        try:
+            vektor_alanini_ekle(es, vektor_modeli.boyut)
+        except ValueError as e:
+            raise SystemExit(f"❌ {e}")
+
+    if args.delta:
+        istatistik = sorulari_delta_indeksle(
+            es,
+            okuma_boyutu=args.okuma_boyutu,
+            bulk_boyutu=args.bulk_boyutu,
+            maks_bayt=maks_bayt,
+            vektor_modeli=vektor_modeli,
+        )
+    elif args.toplu_profil:
+        # Canlı indekste: yükleme bitene kadar yeni dökümanlar aramalarda görünmez
+        with toplu_yukleme_profili(es, INDEX_NAME, args.birlestirme, args.segment, kontrol) as profil:
+            istatistik = _tam_yukle()
+        istatistik["profil"] = profil
+    else:
+        istatistik = _tam_yukle()
+    if vektor_modeli is not None and not args.delta:
+        # Canlı indeks: kNN sorguları yeni vektör uzayına dökümanlar yazıldıktan sonra geçer
+        vektor_modeli.kaydet()
+    if kontrol is not None:
+        kontrol.sil()
+    ozet_yazdir(istatistik)
 
-conn.close()
+    print("Elasticsearch'e veri aktarma tamamlandı.")
 
-print("Elasticsearch'e veri aktarma tamamlandı.")
+if __name__ == "__main__":
+    main()
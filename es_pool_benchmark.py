@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Bağlantı Havuzu Kıyaslaması
+create_elasticsearch_client'ın havuz boyutu (connections_per_node), keep-alive
+ve HTTP sıkıştırma ayarlarının eşzamanlı arama verimine etkisini ölçer.
+
+Varsayılan olarak süreç içinde sabit gecikmeli, Elasticsearch gibi davranan
+yerel sunucular (stand-in) başlatılır; böylece ölçüm cluster'dan bağımsızdır.
+`--hedef` ile gerçek düğümlere karşı da çalıştırılabilir. Yerel düğümler
+istemciyle aynı süreçte çalıştığından çok büyük havuzlarda ölçüm GIL ile sınırlanır.
+
+Kullanım:
+    python es_pool_benchmark.py                         # 1 yerel düğüm, havuz 1/4/16/32
+    python es_pool_benchmark.py --dugum 3 --thread 64   # 3 düğüme dağıtım
+    python es_pool_benchmark.py --hedef es1:9200,es2:9200
+"""
+
+import argparse
+import json
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from es_config import create_elasticsearch_client
+from es_search import INDEX_NAME
+
+HAVUZ_BOYUTLARI = [1, 4, 16, 32]
+THREAD_SAYISI = 32
+ISTEK_SAYISI = 2000
+SUNUCU_GECIKMESI_MS = 5
+
+_ORNEK_YANIT = json.dumps({
+    "took": 1, "timed_out": False,
+    "hits": {"max_score": 1.0, "hits": [{"_id": str(i), "_score": 1.0, "_source": {"soru": f"Örnek soru {i}"}}
+                                        for i in range(10)]},
+}, ensure_ascii=False).encode("utf-8")
+
+class _SahteDugum(BaseHTTPRequestHandler):
+    """Ping ve _search isteklerine sabit gecikmeyle cevap veren yerel düğüm"""
+    protocol_version = "HTTP/1.1"   # keep-alive; istemci "connection: close" gönderirse bağlantı kapanır
+    disable_nagle_algorithm = True  # Başlık ve gövde ayrı yazıldığında gecikmeli ACK beklemesini önler
+
+    def _yanitla(self, govde=b"{}"):
+        self.server.sayac[self.server.server_address[1]] += 1
+        uzunluk = int(self.headers.get("content-length") or 0)
+        if uzunluk:
+            self.rfile.read(uzunluk)
+        self.send_response(200)
+        self.send_header("X-Elastic-Product", "Elasticsearch")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(govde)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(govde)
+
+    def do_HEAD(self):
+        self._yanitla()
+
+    def do_GET(self):
+        if "_search" in self.path:
+            return self.do_POST()
+        self._yanitla(json.dumps({"version": {"number": "8.12.1"}, "cluster_name": "stand-in"}).encode())
+
+    def do_POST(self):
+        time.sleep(self.server.gecikme)
+        self._yanitla(_ORNEK_YANIT)
+
+    def log_message(self, *args):
+        pass
+
+def sahte_dugumleri_baslat(adet, gecikme_ms=SUNUCU_GECIKMESI_MS):
+    """`adet` yerel düğüm başlatır; (sunucular, "127.0.0.1:port" listesi, istek sayacı) döndürür"""
+    sayac = Counter()
+    sunucular = []
+    for _ in range(adet):
+        sunucu = ThreadingHTTPServer(("127.0.0.1", 0), _SahteDugum)
+        sunucu.daemon_threads = True
+        sunucu.request_queue_size = 256
+        sunucu.gecikme = gecikme_ms / 1000
+        sunucu.sayac = sayac
+        threading.Thread(target=sunucu.serve_forever, daemon=True).start()
+        sunucular.append(sunucu)
+    return sunucular, [f"127.0.0.1:{s.server_address[1]}" for s in sunucular], sayac
+
+def verim_olc(hosts, havuz_boyutu, thread_sayisi=THREAD_SAYISI, istek_sayisi=ISTEK_SAYISI,
+              keep_alive=True, http_compress=False):
+    """Aynı istemciyi paylaşan thread'lerle `istek_sayisi` arama yapar; saniyedeki istek sayısını döndürür"""
+    es = create_elasticsearch_client(hosts=hosts, connections_per_node=havuz_boyutu,
+                                     keep_alive=keep_alive, http_compress=http_compress)
+    if es is None:
+        return None
+    govde = {"query": {"match_all": {}}, "size": 10}
+
+    def ara(_):
+        es.search(index=INDEX_NAME, body=govde)
+
+    try:
+        # Bağlantıları ısıt
+        with ThreadPoolExecutor(max_workers=thread_sayisi) as havuz:
+            list(havuz.map(ara, range(thread_sayisi)))
+            baslangic = time.perf_counter()
+            list(havuz.map(ara, range(istek_sayisi)))
+            sure = time.perf_counter() - baslangic
+    finally:
+        es.close()
+    return istek_sayisi / sure
+
+def main():
+    parser = argparse.ArgumentParser(description="Elasticsearch bağlantı havuzu kıyaslaması")
+    parser.add_argument("--hedef", help="Virgülle ayrılmış gerçek düğümler (verilmezse yerel stand-in kullanılır)")
+    parser.add_argument("--dugum", type=int, default=1, help="Başlatılacak yerel düğüm sayısı")
+    parser.add_argument("--gecikme-ms", type=float, default=SUNUCU_GECIKMESI_MS, help="Yerel düğüm yanıt gecikmesi")
+    parser.add_argument("--havuz", default=",".join(map(str, HAVUZ_BOYUTLARI)),
+                        help="Denenecek düğüm başına havuz boyutları")
+    parser.add_argument("--thread", type=int, default=THREAD_SAYISI, help="Eşzamanlı arama yapan thread sayısı")
+    parser.add_argument("--istek", type=int, default=ISTEK_SAYISI, help="Ölçüm başına istek sayısı")
+    args = parser.parse_args()
+
+    sayac = Counter()
+    if args.hedef:
+        hosts = [h.strip() for h in args.hedef.split(",") if h.strip()]
+    else:
+        _, hosts, sayac = sahte_dugumleri_baslat(args.dugum, args.gecikme_ms)
+        print(f"🧪 {len(hosts)} yerel düğüm, {args.gecikme_ms:.0f} ms gecikme")
+
+    havuzlar = [int(h) for h in args.havuz.split(",")]
+    print(f"\n⚡ {args.thread} thread, ölçüm başına {args.istek} istek")
+    print(f"{'Ayar':<34}{'istek/sn':>10}")
+    print("-" * 44)
+    for havuz in havuzlar:
+        verim = verim_olc(hosts, havuz, args.thread, args.istek)
+        if verim is None:
+            return
+        print(f"{f'havuz={havuz}':<34}{verim:>10.0f}")
+
+    en_buyuk = max(havuzlar)
+    for ad, ayar in (("keep-alive kapalı", {"keep_alive": False}), ("http_compress açık", {"http_compress": True})):
+        verim = verim_olc(hosts, en_buyuk, args.thread, args.istek, **ayar)
+        print(f"{f'havuz={en_buyuk}, {ad}':<34}{verim:>10.0f}")
+
+    if sayac:
+        dagilim = ", ".join(f"{port}: {adet}" for port, adet in sorted(sayac.items()))
+        print(f"\n🔀 Düğüm başına istek: {dagilim}")
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,68 @@
+import json
 import os
 import re
-from elasticsearch import Elasticsearch
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from itertools import islice
+from elasticsearch import ConnectionTimeout, Elasticsearch
 from TurkishStemmer import TurkishStemmer
-from performance_monitor import monitor_performance
+from performance_monitor import monitor_performance, record_value, register_stats_provider
 from es_config import get_default_client, test_connection
+from kok_sozlugu import get_kok_sozlugu, stopword_listesi_ozeti
+from query_cache import SorguOnbellegi, indeks_nesli
+from single_flight import TekUcus
+from search_scheduler import ETKILESIMLI, TOPLU, get_zamanlayici
 
 # Stopwords
 STOPWORDS_FILE = "stopwords.txt"
 
+INDEX_NAME = "sorular"
+
+# Sorgu analiz yolu:
+#   "istemci": sorgu Python'da temizle() ile stopword'lerden arındırılıp köklerine ayrılır
+#   "sunucu":  ham sorgu gönderilir, aynı işlem indeksteki `turkce_analiz` ile Elasticsearch'te yapılır
+#              (indeksin es_index.py ile açık mapping kullanılarak oluşturulmuş olması gerekir)
+#   "vektor":  temizlenmiş sorgu yerel vektör modeliyle (vektor_modeli) vektöre çevrilir ve
+#              VEKTOR_ALANI üzerinde kNN araması yapılır (indeks es_index.py --vektor ile doldurulmalı).
+#              Skor kosinüs benzerliğinden türer: (1 + cos) / 2, yani 0-1 arası
+ANALIZ_MODLARI = ("istemci", "sunucu", "vektor")
+ANALIZ_MODU = "istemci"
+
+# kNN araması: HNSW grafında shard başına değerlendirilecek aday sayısı. Büyüdükçe
+# isabet (recall) artar, gecikme de artar; en az istenen sonuç sayısı kadar olur.
+VEKTOR_ALANI = "soru_vektor"
+KNN_ADAY_SAYISI = 100
+
+# Kelime -> kök önbelleğinin en fazla tutacağı farklı kelime sayısı
+KOK_ONBELLEK_BOYUTU = 50000
+
+# temizle_many: süreç havuzuna gönderilen parça başına soru sayısı
+TOPLU_TEMIZLEME_PARCA_BOYUTU = 1000
+
+# Toplu aramada tek _msearch isteğine konulacak sorgu sayısı
+MSEARCH_PARCA_BOYUTU = 100
+
+# Tek aramada döndürülen en fazla sonuç; daha fazlası benzer_sorulari_sayfala ile gezilir
+SONUC_SAYISI = 10
+SAYFA_BOYUTU = 50
+PIT_SURESI = "1m"   # Point-in-time'ın iki sayfa isteği arasında açık kalma süresi
+
+# Gecikme bütçesi: etkileşimli aramalar (GUI) bu sürede eldeki sonuçla döner
+ETKILESIMLI_BUTCE_MS = 300
+BUTCE_TERMINATE_AFTER = 10000   # Bütçeli aramada shard başına en fazla taranacak döküman
+ISTEMCI_ZAMAN_PAYI = 0.2        # Sunucu timeout'u sonrası yanıtın ulaşması için istemci payı (sn)
+
+# Yalın yanıt: yalnızca gösterilen alanlar istenir, yanıt filter_path ile budanır
+GOSTERILEN_ALANLAR = ["soru"]
+_ISABET_ALANLARI = ["took", "timed_out", "terminated_early", "error", "hits.max_score", "hits.hits._id", "hits.hits._score", "hits.hits._source.soru"]
+ARAMA_FILTER_PATH = ",".join(_ISABET_ALANLARI)
+SAYFA_FILTER_PATH = ",".join(_ISABET_ALANLARI + ["pit_id", "hits.hits.sort"])
+MSEARCH_FILTER_PATH = ",".join(f"responses.{alan}" for alan in _ISABET_ALANLARI)
+
 def load_stopwords():
     if not os.path.exists(STOPWORDS_FILE):
         with open(STOPWORDS_FILE, 'w', encoding='utf-8') as f:
@@ -21,77 +76,642 @@ def save_stopwords(stopwords):
     with open(STOPWORDS_FILE, 'w', encoding='utf-8') as f:
         for word in stopwords:
             f.write(word.strip().lower() + '\n')
+    # Kaydedilen liste bu süreçte de hemen geçerli olsun
+    refresh_stopwords()
 
 stopwords = load_stopwords()
 stemmer = TurkishStemmer()
 # Noktalama ve özel karakterleri temizlemek için regex (Türkçe karakterleri korur)
 _non_word_pattern = re.compile(r"[^\w\sÇĞİÖŞÜçğıöşü]")
 
+class MetinNormalizer:
+    """
+    Soru metnini arama/ML için normalize eder: noktalama temizliği, küçük harf,
+    kök bulma ve stopword köklerinin çıkarılması.
+
+    Stopword kökleri oluşturulurken bir kez hesaplanır; kelime -> kök eşlemesi
+    sınırlı bir LRU önbellekte tutulur. Kökler stopword listesinden bağımsız
+    olduğundan liste değiştiğinde yalnızca stopword kökleri yeniden hesaplanır.
+    Sözlük (kok_sozlugu.KokSozlugu) verilirse önbellekte olmayan kelimeler önce
+    diğer süreçlerin de beslediği kalıcı sözlükte aranır, yeni kökler oraya eklenir.
+    """
+
+    def __init__(self, stopwords, onbellek_boyutu=KOK_ONBELLEK_BOYUTU, sozluk=None):
+        self.sozluk = sozluk
+        self.stemmer_cagrisi = 0
+        self._kok = lru_cache(maxsize=onbellek_boyutu)(self._kok_bul)
+        self.stopwordleri_ayarla(stopwords)
+
+    def _kok_bul(self, kelime):
+        if self.sozluk is not None:
+            kok = self.sozluk.get(kelime)
+            if kok is not None:
+                return kok
+        kok = stemmer.stem(kelime)
+        self.stemmer_cagrisi += 1
+        if self.sozluk is not None:
+            self.sozluk.ekle(kelime, kok)
+        return kok
+
+    def stopwordleri_ayarla(self, stopwords):
+        """Stopword köklerini verilen listeye göre yeniden hesaplar"""
+        stopwords = [sw.lower() for sw in stopwords]
+        self.stopword_ozeti = stopword_listesi_ozeti(stopwords)
+        kayitli = self.sozluk.stopword_kokleri(stopwords) if self.sozluk is not None else None
+        if kayitli is not None:
+            self.stemmed_stopwords = frozenset(kayitli)
+            return
+        self.stemmed_stopwords = frozenset(self._kok(sw) for sw in stopwords)
+        if self.sozluk is not None:
+            self.sozluk.stopword_koklerini_kaydet(stopwords, self.stemmed_stopwords)
+
+    def normalize(self, soru):
+        # Metinden noktalama ve özel karakterleri kaldır, küçük harfe çevir
+        tokens = _non_word_pattern.sub(" ", str(soru)).lower().split()
+        kok = self._kok
+        stemmed_stopwords = self.stemmed_stopwords
+        # Kelimeleri köklerine indir (her kelime için tek çağrı), stopwords köklerinde olanları çıkar
+        kokler = (kok(token) for token in tokens)
+        return " ".join(k for k in kokler if k not in stemmed_stopwords)
+
+    def istatistikler(self):
+        """Kök önbelleğinin isabet istatistiklerini döndürür"""
+        bilgi = self._kok.cache_info()
+        toplam = bilgi.hits + bilgi.misses
+        return {
+            "isabet": bilgi.hits,
+            "iskalama": bilgi.misses,
+            "isabet_orani": bilgi.hits / toplam if toplam else 0.0,
+            "boyut": bilgi.currsize,
+            "kapasite": bilgi.maxsize,
+            "stopword_kok_sayisi": len(self.stemmed_stopwords),
+            "stemmer_cagrisi": self.stemmer_cagrisi,
+            "kalici_sozluk_boyutu": len(self.sozluk.kokler) if self.sozluk is not None else 0,
+        }
+
+    def onbellegi_temizle(self):
+        self._kok.cache_clear()
+
+_normalizer = None
+_normalizer_lock = threading.Lock()
+
+def get_normalizer():
+    """Süreç genelinde paylaşılan normalizer'ı döndürür (ilk çağrıda oluşturur)"""
+    global _normalizer
+    if _normalizer is None:
+        with _normalizer_lock:
+            if _normalizer is None:
+                _normalizer = MetinNormalizer(stopwords, sozluk=get_kok_sozlugu())
+    return _normalizer
+
 def refresh_stopwords():
     """Stopwords listesini dosyadan tekrar yükler (GUI değişikliklerinde güncel kalması için)."""
     global stopwords
     stopwords = load_stopwords()
+    if _normalizer is not None:
+        _normalizer.stopwordleri_ayarla(stopwords)
+
+def kok_sozlugunu_kaydet():
+    """Bu süreçte bulunan yeni kökleri kalıcı sözlüğe yazar (süreç havuzu işçileri için)"""
+    if _normalizer is not None and _normalizer.sozluk is not None:
+        _normalizer.sozluk.kaydet()
+
+register_stats_provider("kok_onbellegi", lambda: get_normalizer().istatistikler())
+
+def _arama_nesli():
+    """Önbellekteki arama sonuçlarının dayandığı indeks aktarımı ve stopword listesi"""
+    return indeks_nesli(), get_normalizer().stopword_ozeti
+
+# Popüler soruların tekrarlarında temizleme ve Elasticsearch sorgusu atlanır
+arama_onbellegi = SorguOnbellegi("elasticsearch", nesil=_arama_nesli)
+register_stats_provider("sorgu_onbellegi_elasticsearch", arama_onbellegi.istatistikler)
+# Önbellekte olmayan bir soru aynı anda birçok kez arandığında tek Elasticsearch isteği yapılır
+arama_ucuslari = TekUcus("elasticsearch")
+register_stats_provider("tek_ucus_elasticsearch", arama_ucuslari.istatistikler)
 
 # Stopwordleri temizle
 @monitor_performance("stopword_temizleme")
 def temizle(soru):
-    global stopwords
-    # Metinden noktalama ve özel karakterleri kaldır, küçük harfe çevir
-    normalized = _non_word_pattern.sub(" ", str(soru)).lower()
-    tokens = normalized.split()
+    return get_normalizer().normalize(soru)
 
-    # Stopwords listesini köklerine indirgenmiş ve küçük harfe çevrilmiş olarak hazırla
-    stemmed_stopwords = set(stemmer.stem(sw.lower()) for sw in stopwords)
+def _parcayi_normalize(sorular):
+    """Süreç havuzunda çalışır: bir parçadaki soruları sırayla temizler"""
+    normalize = get_normalizer().normalize
+    temiz = [normalize(soru) for soru in sorular]
+    # İşçi süreçlerde atexit çalışmadığından yeni kökler her parçadan sonra yazılır
+    kok_sozlugunu_kaydet()
+    return temiz
 
-    # Kelimeleri köklerine indir, stopwords köklerinde olanları çıkar
-    filtered_stemmed_tokens = [
-        stemmer.stem(token) for token in tokens
-        if stemmer.stem(token) not in stemmed_stopwords
-    ]
+def _parcalar(sorular, parca_boyutu):
+    iterator = iter(sorular)
+    while True:
+        parca = list(islice(iterator, parca_boyutu))
+        if not parca:
+            return
+        yield parca
 
-    return " ".join(filtered_stemmed_tokens)
+def temizle_many(sorular, isci_sayisi=None, parca_boyutu=TOPLU_TEMIZLEME_PARCA_BOYUTU, havuz=None):
+    """
+    Soruları toplu olarak temizler; sonuçları girişle aynı sırada, akış halinde döndürür.
 
-# Elasticsearch arama fonksiyonu
-@monitor_performance("elasticsearch_arama")
-def benzer_sorulari_bul(soru, esik=0.75):
-    # Elasticsearch 8.x için yapılandırılmış istemci kullan
-    es = get_default_client()
-    if not es:
-        print("❌ Elasticsearch bağlantısı kurulamadı. Lütfen servisin çalıştığından emin olun.")
+    Tek süreçte her soru için `temizle` ile aynı sonucu üretir, ancak çağrı başına
+    performans ölçümü ve normalizer araması yapılmaz. `isci_sayisi` > 1 (veya
+    hazır bir `havuz`) verilirse girdi `parca_boyutu`luk parçalara bölünüp süreç
+    havuzunda temizlenir; uçuştaki parça sayısı işçi sayısının iki katıyla sınırlıdır.
+
+    Args:
+        sorular (iterable): Temizlenecek metinler (liste, üreteç vb.)
+        isci_sayisi (int): Süreç sayısı (varsayılan 1: aynı süreçte). `havuz`
+            verilirse havuzun işçi sayısı olmalıdır; uçuştaki parça sınırı buna göre kurulur
+        parca_boyutu (int): Havuza gönderilen parça başına soru sayısı
+        havuz (ProcessPoolExecutor): Çağıranın yönettiği havuz (verilirse yeniden kullanılır)
+
+    Raises:
+        ValueError: `havuz` verilip `isci_sayisi` verilmezse
+    """
+    if havuz is None and (isci_sayisi or 1) <= 1:
+        normalize = get_normalizer().normalize
+        for soru in sorular:
+            yield normalize(soru)
         return
-    
-    # Sorguyu stopwords ve köklerine göre temizle
-    temiz_soru = temizle(soru)
 
-    body = {
+    if not isci_sayisi:
+        raise ValueError("Hazır havuzla temizlemede isci_sayisi havuzun işçi sayısı olarak verilmelidir")
+    kendi_havuzu = havuz is None
+    if kendi_havuzu:
+        havuz = ProcessPoolExecutor(max_workers=isci_sayisi)
+    maks_bekleyen = max(2, 2 * isci_sayisi)
+    bekleyenler = deque()
+    try:
+        for parca in _parcalar(sorular, parca_boyutu):
+            bekleyenler.append(havuz.submit(_parcayi_normalize, parca))
+            # Geri basınç: havuz doluysa en eski parçanın bitmesini bekle
+            while len(bekleyenler) >= maks_bekleyen:
+                yield from bekleyenler.popleft().result()
+        while bekleyenler:
+            yield from bekleyenler.popleft().result()
+    finally:
+        for gelecek in bekleyenler:
+            gelecek.cancel()
+        if kendi_havuzu:
+            havuz.shutdown()
+
+def vektor_govdesi(vektor, boyut=SONUC_SAYISI):
+    """Sorgu vektörü için kNN arama gövdesi (vektör None ise hiçbir şeyle eşleşmez)"""
+    if vektor is None:
+        # Sorgunun hiçbir terimi modelde yok; sıfır vektörü Elasticsearch'te hata verir
+        return {"query": {"match_none": {}}}
+    return {
+        "knn": {
+            "field": VEKTOR_ALANI,
+            "query_vector": vektor,
+            "k": boyut,
+            "num_candidates": max(KNN_ADAY_SAYISI, boyut),
+        }
+    }
+
+def sorgu_vektorleri(temizler):
+    """Temizlenmiş sorguları kayıtlı vektör modeliyle tek seferde vektörlere çevirir"""
+    # vektor_modeli ml_analyzer'ı (ve o da bu modülü) içe aktardığından geç yüklenir
+    from vektor_modeli import get_vektor_modeli
+    return get_vektor_modeli().vektorle(temizler)
+
+def arama_govdesi(soru, analiz=None, temiz=None):
+    """Seçilen analiz yoluna göre arama sorgusunu oluşturur (temiz: önceden temizlenmiş sorgu)"""
+    analiz = analiz or ANALIZ_MODU
+    if analiz == "vektor":
+        return vektor_govdesi(sorgu_vektorleri([temiz if temiz is not None else temizle(soru)])[0])
+    if analiz == "sunucu":
+        # Kök bulma ve stopword temizliği Elasticsearch'te `soru.turkce` alanının analizöründe yapılır
+        return {
+            "query": {
+                "multi_match": {
+                    "query": str(soru),
+                    "fields": ["soru.turkce^2", "soru"]
+                }
+            }
+        }
+    if analiz != "istemci":
+        raise ValueError(f"Geçersiz analiz modu: {analiz} (geçerli: {', '.join(ANALIZ_MODLARI)})")
+
+    # Sorguyu stopwords ve köklerine göre temizle
+    return {
         "query": {
             "multi_match": {
-                "query": temiz_soru,
+                "query": temiz if temiz is not None else temizle(soru),
                 "fields": ["soru_cleaned^2", "soru"]
             }
         }
     }
 
+def _yalin_govde(govde, esik):
+    """
+    Sorgu gövdesine kaynak alanı filtresini ve sunucu taraflı skor eşiğini ekler.
+
+    `esik` ham _score üzerinde uygulandığı ve yüzde en yüksek skora göre hesaplandığı
+    için (en yüksek skor eşiği geçmiyorsa zaten sonuç yoktur) eleme Elasticsearch'e
+    taşınabilir; sonuç listesi istemci tarafı döngüyle aynıdır. Skorları farklı
+    ölçekte olan sorgularda (kNN vb.) min_score bu anlamı taşımaz, eklenmez.
+    """
+    govde = dict(govde, _source=GOSTERILEN_ALANLAR)
+    if esik and "query" in govde:
+        govde["min_score"] = esik
+    return govde
+
+def yanit_boyutu(yanit):
+    """HTTP yanıtının bayt boyutu (Content-Length yoksa gövdenin JSON uzunluğu)"""
     try:
-        sonuc = es.search(index="sorular", body=body)
-        print(f"\n '{soru}' sorusuna benzer sonuçlar:")
-        print("-" * 50)
+        uzunluk = yanit.meta.headers.get("content-length")
+        if uzunluk:
+            return int(uzunluk)
+    except AttributeError:
+        pass
+    govde = getattr(yanit, "body", yanit)
+    return len(json.dumps(govde, ensure_ascii=False).encode("utf-8"))
+
+@dataclass
+class BenzerSoru:
+    """Aramada bulunan tek bir soru"""
+    id: str
+    soru: str
+    skor: float     # Elasticsearch'in ham _score değeri
+    yuzde: float    # En yüksek skora göre normalize benzerlik (0-100)
 
-        bulundu = False
-        skorlar = [hit["_score"] for hit in sonuc["hits"]["hits"]]
+@dataclass
+class AramaSonucu:
+    """Bir benzer soru aramasının sonuçları ve süreleri"""
+    sorgu: str
+    esik: float
+    analiz: str
+    sonuclar: list = field(default_factory=list)   # BenzerSoru listesi, skora göre azalan
+    maks_skor: float = 0.0
+    sureler: dict = field(default_factory=dict)    # hazirlama / elasticsearch / sunucu (took) / toplam, ms
+    hata: str = None                               # Toplu aramada yalnızca bu sorgu başarısız olduysa
+    yanit_bayt: int = 0                            # Elasticsearch yanıtının boyutu
+    kismi: bool = False                            # Bütçe nedeniyle arama tamamlanmadan kesildiyse
+    butce_ms: float = None
+    motor: str = "elasticsearch"                   # Sonucu üreten motor: "elasticsearch" / "machine_learning" / "hibrit"
+    onbellekten: bool = False                      # Sonuç sorgu önbelleğinden döndüyse
+    yaris: bool = False                            # Motorların yarıştırıldığı (hedged) aramada üretildiyse
+    kuyrukta_kaldi: bool = False                   # Bütçe, istek gönderilmeden arama kuyruğunda bittiyse
+
+    def __len__(self):
+        return len(self.sonuclar)
+
+    def __iter__(self):
+        return iter(self.sonuclar)
+
+def _sonuclari_cikar(yanit, esik, max_skor=None):
+    """
+    Arama yanıtındaki isabetleri eşiğe göre süzüp BenzerSoru listesine çevirir.
+    `max_skor` verilirse yüzdeler bu skora göre hesaplanır (sayfalamada ilk sayfanın en yükseği).
+    """
+    # filter_path boş isabet listesini yanıttan tamamen çıkarır
+    hits = yanit.get("hits", {}).get("hits", [])
+    skorlar = [hit["_score"] for hit in hits]
+    if max_skor is None:
         max_skor = max(skorlar) if skorlar else 1
-        for hit in sonuc["hits"]["hits"]:
-            skor = hit["_score"]
-            if skor >= esik:
-                yuzde = (skor / max_skor) * 100 if max_skor else 0
-                print(f"• {hit['_source']['soru']}  (Benzerlik: %{yuzde:.0f})")
-                bulundu = True
+    sonuclar = []
+    for hit in hits:
+        skor = hit["_score"]
+        if skor >= esik:
+            yuzde = (skor / max_skor) * 100 if max_skor else 0
+            sonuclar.append(BenzerSoru(id=hit["_id"], soru=hit["_source"]["soru"], skor=skor, yuzde=yuzde))
+    return sonuclar, (max(skorlar) if skorlar else 0.0)
+
+def _butce_asimini_kaydet(toplam_ms, butce_ms):
+    """Bütçeyi aşan aramaların aşım miktarını performans izlemeye kaydeder"""
+    if butce_ms and toplam_ms > butce_ms:
+        record_value("elasticsearch_butce_asimi_ms", toplam_ms - butce_ms)
+
+def onbellek_anahtari(soru, esik, analiz=None, boyut=SONUC_SAYISI):
+    """Sorgu önbelleği anahtarını ve (istemci analizinde) temizlenmiş sorguyu döndürür: (anahtar, temiz)"""
+    analiz = analiz or ANALIZ_MODU
+    temiz = temizle(soru) if analiz != "sunucu" else None
+    # Sunucu analizinde sorgu olduğu gibi gönderilir; yalnızca boşluk ve harf büyüklüğü normalize edilir
+    sorgu = temiz if temiz is not None else " ".join(str(soru).lower().split())
+    return ("elasticsearch", analiz, sorgu, esik, boyut), temiz
+
+def onbellege_koy(anahtar, sonuc):
+    # Tamamlanmamış aramalar önbelleğe alınmaz
+    if anahtar is not None and not sonuc.kismi and not sonuc.hata:
+        arama_onbellegi.koy(anahtar, replace(sonuc, sonuclar=list(sonuc.sonuclar)))
+
+def onbellekten_sonuc(sonuc, soru, baslangic):
+    """Önbellekteki sonucun çağırana verilecek kopyası (süre yalnızca önbellek erişimidir)"""
+    return replace(sonuc, sorgu=soru, sonuclar=list(sonuc.sonuclar), onbellekten=True,
+                   sureler={"toplam": (time.perf_counter() - baslangic) * 1000})
+
+def arama_istegi(soru, esik, analiz=None, boyut=SONUC_SAYISI, butce_ms=None, temiz=None):
+    """Senkron ve asenkron arama yollarının ortak _search gövdesi"""
+    body = _yalin_govde(arama_govdesi(soru, analiz, temiz), esik)
+    body["size"] = boyut
+    if "knn" in body:
+        body["knn"].update(k=boyut, num_candidates=max(KNN_ADAY_SAYISI, boyut))
+    return butce_ekle(body, butce_ms)
+
+def butce_ekle(body, butce_ms):
+    """Bütçe verilmişse gövdeye `timeout` ve `terminate_after` ekler"""
+    if butce_ms:
+        body["timeout"] = f"{max(1, int(butce_ms))}ms"
+        body["terminate_after"] = BUTCE_TERMINATE_AFTER
+    return body
+
+def kalan_butce(butce_ms, bekleme):
+    """
+    Kuyrukta `bekleme` saniye beklemiş aramanın kalan bütçesi (ms); bütçesiz aramada None.
+
+    Raises:
+        TimeoutError: Bütçenin tamamı kuyrukta harcandıysa
+    """
+    if not butce_ms:
+        return None
+    kalan = butce_ms - bekleme * 1000
+    if kalan <= 0:
+        raise TimeoutError(f"{butce_ms:.0f} ms bütçe arama kuyruğunda harcandı")
+    return kalan
+
+def butceli_istemci(es, butce_ms):
+    """Bütçe verilmişse istemci zaman aşımını bütçeye çeker (Elasticsearch ve AsyncElasticsearch)"""
+    if not butce_ms:
+        return es
+    # Bütçeli aramada zaman aşımı sonrası yeniden deneme yapılmaz
+    return es.options(request_timeout=butce_ms / 1000 + ISTEMCI_ZAMAN_PAYI, retry_on_timeout=False)
+
+def zaman_asimi_sonucu(soru, esik, analiz, butce_ms, hazirlama_ms, toplam_ms, hata=None):
+    """
+    Bütçe içinde hiç yanıt alınamayan arama için boş ve kısmi sonuç.
+
+    `hata` zamanlayıcının TimeoutError'ı ise istek hiç gönderilmemiştir (yerel
+    kuyruk yoğunluğu); sonuç `kuyrukta_kaldi=True` ile işaretlenir ve
+    Elasticsearch hatası sayılmamalıdır.
+    """
+    _butce_asimini_kaydet(toplam_ms, butce_ms)
+    kuyrukta = isinstance(hata, TimeoutError)
+    mesaj = "arama kuyruğunda beklerken doldu" if kuyrukta else "içinde yanıt alınamadı"
+    return AramaSonucu(sorgu=soru, esik=esik, analiz=analiz or ANALIZ_MODU, kismi=True, butce_ms=butce_ms,
+                       hata=f"{butce_ms:.0f} ms bütçe {mesaj}", kuyrukta_kaldi=kuyrukta,
+                       sureler={"hazirlama": hazirlama_ms, "toplam": toplam_ms})
+
+def arama_sonucu(soru, esik, analiz, yanit, baslangic, hazir, bitis, butce_ms=None):
+    """_search yanıtını AramaSonucu'na çevirir, yanıt boyutunu ve bütçe aşımını kaydeder"""
+    sonuclar, maks_skor = _sonuclari_cikar(yanit, esik)
+    yanit_bayt = yanit_boyutu(yanit)
+    record_value("elasticsearch_yanit_bayt", yanit_bayt)
+    sonuc = AramaSonucu(
+        sorgu=soru,
+        esik=esik,
+        analiz=analiz or ANALIZ_MODU,
+        sonuclar=sonuclar,
+        maks_skor=maks_skor,
+        sureler={
+            "hazirlama": (hazir - baslangic) * 1000,
+            "elasticsearch": (bitis - hazir) * 1000,
+            "sunucu": float(yanit.get("took", 0)),
+            "toplam": (time.perf_counter() - baslangic) * 1000,
+        },
+        yanit_bayt=yanit_bayt,
+        kismi=bool(yanit.get("timed_out") or yanit.get("terminated_early")),
+        butce_ms=butce_ms,
+    )
+    _butce_asimini_kaydet(sonuc.sureler["toplam"], butce_ms)
+    return sonuc
+
+def _elasticsearchte_ara(soru, esik, analiz, es, boyut, butce_ms, temiz, baslangic, oncelik):
+    # Elasticsearch 8.x için yapılandırılmış istemci kullan
+    es = es or get_default_client()
+    if not es:
+        raise ConnectionError("Elasticsearch bağlantısı kurulamadı. Lütfen servisin çalıştığından emin olun.")
+
+    body = arama_istegi(soru, esik, analiz, boyut, None, temiz)
+    hazir = time.perf_counter()
+    try:
+        # Bütçeli aramada kuyrukta bekleme de bütçeden düşer: sunucu ve istemci
+        # zaman aşımları sıra geldiğinde kalan bütçeyle kurulur
+        with get_zamanlayici().izin(oncelik, zaman_asimi=butce_ms / 1000 if butce_ms else None) as bekleme:
+            kalan_ms = kalan_butce(butce_ms, bekleme)
+            butce_ekle(body, kalan_ms)
+            hazir = time.perf_counter()
+            yanit = butceli_istemci(es, kalan_ms).search(index=INDEX_NAME, body=body, filter_path=ARAMA_FILTER_PATH)
+    except (ConnectionTimeout, TimeoutError) as e:
+        if not butce_ms:
+            raise
+        # Etkileşimli arama beklemek yerine boş ve kısmi sonuçla döner
+        return zaman_asimi_sonucu(soru, esik, analiz, butce_ms, (hazir - baslangic) * 1000,
+                                  (time.perf_counter() - baslangic) * 1000, e)
+    return arama_sonucu(soru, esik, analiz, yanit, baslangic, hazir, time.perf_counter(), butce_ms)
+
+# Elasticsearch arama fonksiyonu
+@monitor_performance("elasticsearch_arama")
+def benzer_sorulari_ara(soru, esik=0.75, analiz=None, es=None, boyut=SONUC_SAYISI, butce_ms=None, onbellek=True,
+                        oncelik=ETKILESIMLI):
+    """
+    Benzer soruları arar ve sonuçları yazdırmadan döndürür.
 
-        if not bulundu:
-            print("Eşik değeri üzerinde benzer soru bulunamadı.")
+    Args:
+        soru (str): Aranan soru
+        esik (float): Ham skor eşiği; altında kalan isabetler elenir
+        analiz (str): "istemci", "sunucu" veya "vektor" (varsayılan: ANALIZ_MODU)
+        es (Elasticsearch): Kullanılacak istemci (varsayılan: paylaşılan istemci)
+        boyut (int): En fazla sonuç sayısı (daha derini için benzer_sorulari_sayfala)
+        butce_ms (float): Gecikme bütçesi. Verilirse Elasticsearch'e `timeout` ve
+            `terminate_after` olarak iletilir, istemci de bütçe + ISTEMCI_ZAMAN_PAYI
+            sonra vazgeçer. Kesilen aramalar `kismi=True` ile o ana kadarki
+            sonuçları, hiç yanıt alınamazsa boş sonuç ve `hata` döndürür.
+        onbellek (bool): Paylaşılan istemcideki aramalarda sorgu önbelleğini
+            (arama_onbellegi) kullan ve aynı anda yapılan aynı aramaları tek
+            isteğe birleştir (arama_ucuslari); gecikme ölçümlerinde False verilir
+        oncelik (str): Arama zamanlayıcısındaki sınıf (search_scheduler); toplu
+            işler TOPLU vererek etkileşimli aramaların önüne geçmez
 
+    Returns:
+        AramaSonucu: Eşiği geçen sorular ve aşama süreleri
+
+    Raises:
+        ConnectionError: Elasticsearch'e bağlanılamazsa
+    """
+    baslangic = time.perf_counter()
+    if not onbellek or es is not None:
+        return _elasticsearchte_ara(soru, esik, analiz, es, boyut, butce_ms, None, baslangic, oncelik)
+
+    anahtar, temiz = onbellek_anahtari(soru, esik, analiz, boyut)
+    onceki = arama_onbellegi.getir(anahtar)
+    if onceki is not None:
+        return onbellekten_sonuc(onceki, soru, baslangic)
+
+    # Öncelik anahtarda: etkileşimli arama, hız sınırında bekleyen toplu bir uçuşun arkasına düşmez
+    sonuc, paylasildi = arama_ucuslari.calistir(
+        anahtar + (butce_ms, oncelik),
+        lambda: _elasticsearchte_ara(soru, esik, analiz, None, boyut, butce_ms, temiz, baslangic, oncelik))
+    if paylasildi:
+        # Başka bir çağrının isteğinden gelen sonuç; önbelleğe o çağrı koydu
+        return replace(sonuc, sorgu=soru, sonuclar=list(sonuc.sonuclar),
+                       sureler={**sonuc.sureler, "toplam": (time.perf_counter() - baslangic) * 1000})
+    onbellege_koy(anahtar, sonuc)
+    return sonuc
+
+def benzer_sorulari_sayfala(soru, esik=0.75, analiz=None, es=None, sayfa_boyutu=SAYFA_BOYUTU,
+                            pit_suresi=PIT_SURESI, oncelik=ETKILESIMLI):
+    """
+    Benzer soruları point-in-time + search_after ile sayfa sayfa döndüren üreteç.
+
+    Tüm sayfalar aynı indeks görüntüsü üzerinde çalışır (arada yapılan aktarımlar
+    veya alias değişimi sıralamayı kaydırmaz) ve `from` kullanılmadığından derin
+    sayfaların maliyeti ilk sayfayla aynıdır. Sıralama skor + `_shard_doc` ile
+    kararlıdır. Yüzdeler ilk sayfanın en yüksek skoruna göre hesaplanır.
+    Üreteç tükenince veya kapatılınca (`close()`) PIT serbest bırakılır.
+
+    Yields:
+        AramaSonucu: Her sayfa için bir sonuç (boş sayfa gelmez)
+    """
+    es = es or get_default_client()
+    if not es:
+        raise ConnectionError("Elasticsearch bağlantısı kurulamadı. Lütfen servisin çalıştığından emin olun.")
+
+    analiz = analiz or ANALIZ_MODU
+    if analiz == "vektor":
+        raise ValueError("kNN aramasında sayfalama desteklenmez; daha fazla sonuç için boyut artırılmalı")
+    body = _yalin_govde(arama_govdesi(soru, analiz), esik)
+    body["size"] = sayfa_boyutu
+    body["sort"] = [{"_score": "desc"}, {"_shard_doc": "asc"}]
+    pit_id = es.open_point_in_time(index=INDEX_NAME, keep_alive=pit_suresi)["id"]
+    max_skor = None
+    try:
+        while True:
+            body["pit"] = {"id": pit_id, "keep_alive": pit_suresi}
+            with get_zamanlayici().izin(oncelik):
+                baslangic = time.perf_counter()
+                yanit = es.search(body=body, filter_path=SAYFA_FILTER_PATH)
+            sure = (time.perf_counter() - baslangic) * 1000
+            # PIT kimliği her yanıtta yenilenebilir
+            pit_id = yanit.get("pit_id", pit_id)
+            hits = yanit.get("hits", {}).get("hits", [])
+            if not hits:
+                return
+            if max_skor is None:
+                max_skor = hits[0]["_score"]
+            sonuclar, _ = _sonuclari_cikar(yanit, esik, max_skor)
+            yanit_bayt = yanit_boyutu(yanit)
+            record_value("elasticsearch_yanit_bayt", yanit_bayt)
+            yield AramaSonucu(
+                sorgu=soru,
+                esik=esik,
+                analiz=analiz,
+                sonuclar=sonuclar,
+                maks_skor=max_skor,
+                sureler={"elasticsearch": sure, "sunucu": float(yanit.get("took", 0)), "toplam": sure},
+                yanit_bayt=yanit_bayt,
+            )
+            if len(hits) < sayfa_boyutu:
+                return
+            body["search_after"] = hits[-1]["sort"]
+    finally:
+        try:
+            es.close_point_in_time(id=pit_id)
+        except Exception:
+            # PIT süresi dolunca Elasticsearch zaten kapatır
+            pass
+
+@monitor_performance("elasticsearch_toplu_arama")
+def toplu_benzer_sorulari_ara(sorular, esik=0.75, analiz=None, es=None, parca_boyutu=MSEARCH_PARCA_BOYUTU,
+                              oncelik=TOPLU):
+    """
+    Birden çok soruyu (ör. bir sınavın tamamını) _msearch ile toplu arar.
+
+    Sorular tek geçişte temizlenir ve `parca_boyutu`luk gruplar halinde gönderilir;
+    N soru için N yerine ceil(N / parca_boyutu) istek yapılır. Bir sorgunun hatası
+    diğerlerini etkilemez, ilgili sonucun `hata` alanına yazılır. İstekler arama
+    zamanlayıcısında `oncelik` sınıfıyla (varsayılan TOPLU) ve sorgu sayısı
+    kadar jetonla sıraya girer; etkileşimli aramalar beklemez.
+
+    Returns:
+        list: Sorularla aynı sırada AramaSonucu listesi. `sureler["elasticsearch"]`
+        sorgunun içinde bulunduğu _msearch isteğinin toplam süresidir.
+    """
+    sorular = list(sorular)
+    analiz = analiz or ANALIZ_MODU
+    es = es or get_default_client()
+    if not es:
+        raise ConnectionError("Elasticsearch bağlantısı kurulamadı. Lütfen servisin çalıştığından emin olun.")
+
+    baslangic = time.perf_counter()
+    if analiz != "sunucu":
+        temizler = list(temizle_many(sorular))
+    else:
+        temizler = [None] * len(sorular)
+    if analiz == "vektor":
+        govdeler = [_yalin_govde(vektor_govdesi(vektor), esik) for vektor in sorgu_vektorleri(temizler)]
+    else:
+        govdeler = [_yalin_govde(arama_govdesi(soru, analiz, temiz), esik) for soru, temiz in zip(sorular, temizler)]
+    hazirlama = (time.perf_counter() - baslangic) * 1000 / max(len(sorular), 1)
+
+    sonuclar = []
+    for i in range(0, len(govdeler), parca_boyutu):
+        parca = govdeler[i:i + parca_boyutu]
+        aramalar = []
+        for govde in parca:
+            aramalar.append({"index": INDEX_NAME})
+            aramalar.append(govde)
+        with get_zamanlayici().izin(oncelik, maliyet=len(parca)):
+            istek_baslangic = time.perf_counter()
+            yanit = es.msearch(searches=aramalar, filter_path=MSEARCH_FILTER_PATH)
+        istek_suresi = (time.perf_counter() - istek_baslangic) * 1000
+        record_value("elasticsearch_toplu_yanit_bayt", yanit_boyutu(yanit))
+
+        for soru, cevap in zip(sorular[i:i + parca_boyutu], yanit["responses"]):
+            sonuc = AramaSonucu(sorgu=soru, esik=esik, analiz=analiz, yanit_bayt=yanit_boyutu(cevap))
+            if "error" in cevap:
+                hata = cevap["error"]
+                sonuc.hata = hata.get("reason", str(hata)) if isinstance(hata, dict) else str(hata)
+            else:
+                sonuc.sonuclar, sonuc.maks_skor = _sonuclari_cikar(cevap, esik)
+            sonuc.sureler = {
+                "hazirlama": hazirlama,
+                "elasticsearch": istek_suresi,
+                "sunucu": float(cevap.get("took", 0)),
+                "toplam": hazirlama + istek_suresi,
+            }
+            sonuclar.append(sonuc)
+    return sonuclar
+
+def dosyadan_sorulari_oku(dosya_yolu):
+    """Her satırda bir soru olan dosyayı okur; baştaki "12." / "12)" numaralarını atar"""
+    with open(dosya_yolu, "r", encoding="utf-8") as f:
+        return [re.sub(r"^\s*\d+\s*[.)-]\s*", "", satir).strip() for satir in f if satir.strip()]
+
+def sonuc_metni(sonuc):
+    """AramaSonucu'nu CLI/GUI'de gösterilecek metne çevirir"""
+    if sonuc.hata:
+        return f"\n '{sonuc.sorgu}' aranamadı: {sonuc.hata}"
+    satirlar = [f"\n '{sonuc.sorgu}' sorusuna benzer sonuçlar:", "-" * 50]
+    if sonuc.yaris:
+        kazanan = "Machine Learning" if sonuc.motor == "machine_learning" else "Elasticsearch"
+        satirlar.insert(1, f"⚡ Yarışı {kazanan} kazandı ({sonuc.sureler.get('toplam', 0):.0f} ms).")
+    elif sonuc.motor == "machine_learning":
+        satirlar.insert(1, "🤖 Sonuçlar Machine Learning motorundan (Elasticsearch devre dışı).")
+    elif sonuc.motor == "hibrit":
+        satirlar.insert(1, "🔀 Sonuçlar Elasticsearch ve Machine Learning sıralamalarının birleşimi (RRF).")
+    for benzer in sonuc.sonuclar:
+        satirlar.append(f"• {benzer.soru}  (Benzerlik: %{benzer.yuzde:.0f})")
+    if not sonuc.sonuclar:
+        satirlar.append("Eşik değeri üzerinde benzer soru bulunamadı.")
+    if sonuc.kismi:
+        butce = f" {sonuc.butce_ms:.0f} ms bütçe içinde" if sonuc.butce_ms else ""
+        satirlar.append(f"⚠️ Sonuçlar kısmi: arama{butce} tamamlanamadı.")
+    return "\n".join(satirlar)
+
+def benzer_sorulari_bul(soru, esik=0.75, analiz=None):
+    """Benzer soruları arar ve konsola yazdırır (CLI için); sonucu da döndürür"""
+    try:
+        sonuc = benzer_sorulari_ara(soru, esik, analiz)
+    except ConnectionError as e:
+        print(f"❌ {e}")
+        return None
     except Exception as e:
         print("Arama hatası:", e)
+        return None
+    print(sonuc_metni(sonuc))
+    return sonuc
 
 # Uygulama başlatıcı
 if __name__ == "__main__":
@@ -101,7 +721,8 @@ if __name__ == "__main__":
         print("2. Stopwords listele")
         print("3. Stopwords ekle")
         print("4. Stopwords çıkar")
-        print("5. Çıkış")
+        print("5. Dosyadaki soruları toplu ara")
+        print("6. Çıkış")
         secim = input("Seçiminiz: ")
         if secim == "1":
             soru = input("Soru girin: ")
@@ -129,6 +750,13 @@ if __name__ == "__main__":
             else:
                 print("Belirtilen kelimeler stopwords listesinde yok.")
         elif secim == "5":
+            dosya_yolu = input("Soru dosyası (varsayılan: examples.txt): ").strip() or "examples.txt"
+            try:
+                for sonuc in toplu_benzer_sorulari_ara(dosyadan_sorulari_oku(dosya_yolu)):
+                    print(sonuc_metni(sonuc))
+            except Exception as e:
+                print("Toplu arama hatası:", e)
+        elif secim == "6":
             print("Çıkılıyor...")
             break
         else:
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Asenkron Elasticsearch Araması
+Senkron yolda her uçuştaki istek bir thread'i bekletir. Bu modül aynı aramayı
+AsyncElasticsearch ile yapar: toplu işler veya servisler tek thread'den yüzlerce
+sorguyu aynı anda uçuşta tutabilir. Eşzamanlı istek sayısı bir semafor ile
+sınırlanır; her istek ayrıca senkron yolla aynı arama zamanlayıcısından
+(search_scheduler, izin_async) geçer, toplu asenkron aramalar TOPLU sınıfının
+hız sınırına tabidir ve etkileşimli aramaların önüne geçmez.
+
+Sorgu temizleme, arama gövdesi, bütçe davranışı ve sonuç modeli (AramaSonucu)
+es_search ile ortaktır; iki yol aynı soruya aynı sonucu döndürür.
+"""
+
+import asyncio
+import sys
+import time
+from elasticsearch import ApiError, ConnectionTimeout, TransportError
+from es_config import close_default_async_client, get_default_async_client
+from es_search import (ANALIZ_MODU, ARAMA_FILTER_PATH, INDEX_NAME, SONUC_SAYISI, AramaSonucu,
+                       arama_istegi, arama_onbellegi, arama_sonucu, butce_ekle, butceli_istemci,
+                       dosyadan_sorulari_oku, kalan_butce, onbellege_koy, onbellek_anahtari, onbellekten_sonuc,
+                       sonuc_metni, temizle_many, zaman_asimi_sonucu)
+from performance_monitor import monitor_performance
+from search_scheduler import ETKILESIMLI, TOPLU, get_zamanlayici
+
+# Toplu aramada aynı anda uçuşta tutulacak en fazla istek
+ESZAMANLI_ISTEK_SAYISI = 64
+
+async def _istemci(es):
+    es = es or await get_default_async_client()
+    if not es:
+        raise ConnectionError("Elasticsearch bağlantısı kurulamadı. Lütfen servisin çalıştığından emin olun.")
+    return es
+
+async def _ara(es, soru, esik, analiz, boyut, butce_ms, temiz=None, baslangic=None, oncelik=ETKILESIMLI):
+    baslangic = baslangic or time.perf_counter()
+    body = arama_istegi(soru, esik, analiz, boyut, None, temiz)
+    hazir = time.perf_counter()
+    try:
+        # Kuyrukta bekleme bütçeden düşer (senkron yoldaki gibi)
+        async with get_zamanlayici().izin_async(oncelik, zaman_asimi=butce_ms / 1000 if butce_ms else None) as bekleme:
+            kalan_ms = kalan_butce(butce_ms, bekleme)
+            butce_ekle(body, kalan_ms)
+            hazir = time.perf_counter()
+            yanit = await butceli_istemci(es, kalan_ms).search(index=INDEX_NAME, body=body,
+                                                                filter_path=ARAMA_FILTER_PATH)
+    except (ConnectionTimeout, TimeoutError) as e:
+        if not butce_ms:
+            raise
+        return zaman_asimi_sonucu(soru, esik, analiz, butce_ms, (hazir - baslangic) * 1000,
+                                  (time.perf_counter() - baslangic) * 1000, e)
+    # AsyncElasticsearch ObjectApiResponse döndürür; ortak sonuç çıkarıcı dict bekler
+    return arama_sonucu(soru, esik, analiz, dict(yanit), baslangic, hazir, time.perf_counter(), butce_ms)
+
+@monitor_performance("elasticsearch_async_arama")
+async def benzer_sorulari_ara_async(soru, esik=0.75, analiz=None, es=None, boyut=SONUC_SAYISI, butce_ms=None,
+                                    onbellek=True, oncelik=ETKILESIMLI):
+    """
+    benzer_sorulari_ara'nın asenkron karşılığı; parametreler, sorgu önbelleği
+    ve dönüş değeri aynıdır.
+
+    Args:
+        es (AsyncElasticsearch): Kullanılacak istemci (varsayılan: olay döngüsünün paylaşılan istemcisi)
+
+    Returns:
+        AramaSonucu: Eşiği geçen sorular ve aşama süreleri
+
+    Raises:
+        ConnectionError: Elasticsearch'e bağlanılamazsa
+    """
+    baslangic = time.perf_counter()
+    anahtar, temiz = None, None
+    if onbellek and es is None:
+        anahtar, temiz = onbellek_anahtari(soru, esik, analiz, boyut)
+        onceki = arama_onbellegi.getir(anahtar)
+        if onceki is not None:
+            return onbellekten_sonuc(onceki, soru, baslangic)
+    sonuc = await _ara(await _istemci(es), soru, esik, analiz, boyut, butce_ms, temiz, baslangic, oncelik)
+    onbellege_koy(anahtar, sonuc)
+    return sonuc
+
+@monitor_performance("elasticsearch_async_toplu_arama")
+async def toplu_benzer_sorulari_ara_async(sorular, esik=0.75, analiz=None, es=None, boyut=SONUC_SAYISI,
+                                          butce_ms=None, eszamanlilik=ESZAMANLI_ISTEK_SAYISI, oncelik=TOPLU):
+    """
+    Soruları ayrı _search istekleriyle, en fazla `eszamanlilik` tanesi aynı anda
+    uçuşta olacak şekilde arar. İstekler zamanlayıcıya `oncelik` sınıfıyla
+    (varsayılan TOPLU) girer; fiili eşzamanlılık zamanlayıcı kapasitesini aşmaz.
+
+    Sorular aramadan önce tek geçişte temizlenir. Bir sorgunun Elasticsearch
+    hatası (API hatası, bağlantı hatası veya zaman aşımı) diğerlerini
+    etkilemez, ilgili sonucun `hata` alanına yazılır.
+
+    Returns:
+        list: Sorularla aynı sırada AramaSonucu listesi
+    """
+    sorular = list(sorular)
+    analiz = analiz or ANALIZ_MODU
+    es = await _istemci(es)
+    if analiz != "sunucu":
+        temizler = list(temizle_many(sorular))
+    else:
+        temizler = [None] * len(sorular)
+    semafor = asyncio.Semaphore(eszamanlilik)
+
+    async def tek_arama(soru, temiz):
+        async with semafor:
+            try:
+                return await _ara(es, soru, esik, analiz, boyut, butce_ms, temiz, oncelik=oncelik)
+            except (ApiError, TransportError) as e:
+                return AramaSonucu(sorgu=soru, esik=esik, analiz=analiz, hata=str(e))
+
+    return await asyncio.gather(*(tek_arama(soru, temiz) for soru, temiz in zip(sorular, temizler)))
+
+async def benzer_sorulari_bul_async(soru, esik=0.75, analiz=None):
+    """Benzer soruları asenkron arar ve konsola yazdırır; sonucu da döndürür"""
+    try:
+        sonuc = await benzer_sorulari_ara_async(soru, esik, analiz)
+    except ConnectionError as e:
+        print(f"❌ {e}")
+        return None
+    except Exception as e:
+        print("Arama hatası:", e)
+        return None
+    print(sonuc_metni(sonuc))
+    return sonuc
+
+async def _dosyadan_ara(dosya_yolu, eszamanlilik):
+    sorular = dosyadan_sorulari_oku(dosya_yolu)
+    try:
+        baslangic = time.perf_counter()
+        sonuclar = await toplu_benzer_sorulari_ara_async(sorular, eszamanlilik=eszamanlilik)
+        sure = time.perf_counter() - baslangic
+    except ConnectionError as e:
+        print(f"❌ {e}")
+        return
+    finally:
+        await close_default_async_client()
+    for sonuc in sonuclar:
+        print(sonuc_metni(sonuc))
+    print(f"\n⚡ {len(sonuclar)} soru {sure:.2f} sn'de arandı "
+          f"({len(sonuclar) / max(sure, 1e-9):.0f} sorgu/sn, eşzamanlılık {eszamanlilik})")
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Kullanım: python es_search_async.py <soru_dosyasi> [eşzamanlılık]")
+        sys.exit(1)
+    asyncio.run(_dosyadan_ara(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else ESZAMANLI_ISTEK_SAYISI))
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Vektör Alanı Kıyaslaması
+Soruları iki geçici indekse yükler: yalnızca metin alanlarıyla ve ek olarak
+HNSW ile indekslenen `dense_vector` alanıyla (es_index.py --vektor). İki indeks
+için indeksleme süresi/verimi, disk boyutu ve arama gecikmesi (multi_match ve
+kNN) karşılaştırılır; vektör alanının maliyeti böylece görülür.
+
+Canlı `sorular` indeksine, delta kaydına ve kayıtlı vektör modeline dokunulmaz;
+geçici indeksler ölçümden sonra silinir.
+
+Kullanım:
+    python es_vektor_benchmark.py
+    python es_vektor_benchmark.py --ornek 100000 --sorgu 500 --boyut 64
+"""
+
+import argparse
+import sqlite3
+import statistics
+import time
+from elasticsearch import helpers
+from es_config import get_default_client
+from es_index import BULK_BOYUTU, DB_PATH, indeksi_olustur
+from es_search import (ARAMA_FILTER_PATH, GOSTERILEN_ALANLAR, KNN_ADAY_SAYISI, SONUC_SAYISI, VEKTOR_ALANI,
+                       arama_istegi, temizle_many, vektor_govdesi)
+from vektor_modeli import VEKTOR_BOYUTU, VektorModeli
+
+SORGU_SAYISI = 200
+GECICI_ON_EK = "sorular_vektor_kiyas_"
+
+def sorulari_oku(db_path=DB_PATH, ornek=None):
+    conn = sqlite3.connect(db_path)
+    try:
+        sorgu = "SELECT id, metin FROM sorular ORDER BY id"
+        return conn.execute(sorgu + (" LIMIT ?" if ornek else ""), (ornek,) if ornek else ()).fetchall()
+    finally:
+        conn.close()
+
+def _indeks_boyutu(es, index_name):
+    istatistik = es.indices.stats(index=index_name, metric="store")
+    return istatistik["indices"][index_name]["primaries"]["store"]["size_in_bytes"]
+
+def indeksleme_olc(es, index_name, satirlar, temizler, model=None):
+    """Geçici indeksi oluşturup doldurur; süre, verim ve boyut ölçümlerini döndürür"""
+    indeksi_olustur(es, index_name, model.boyut if model else None)
+    baslangic = time.perf_counter()
+    vektorleme = 0.0
+    eylemler = []
+    for i in range(0, len(satirlar), BULK_BOYUTU):
+        parca = satirlar[i:i + BULK_BOYUTU]
+        parca_temiz = temizler[i:i + BULK_BOYUTU]
+        vektorler = [None] * len(parca)
+        if model:
+            vektor_baslangic = time.perf_counter()
+            vektorler = model.vektorle(parca_temiz)
+            vektorleme += time.perf_counter() - vektor_baslangic
+        for (soru_id, metin), temiz, vektor in zip(parca, parca_temiz, vektorler):
+            dokuman = {"soru": metin, "soru_cleaned": temiz}
+            if vektor is not None:
+                dokuman[VEKTOR_ALANI] = vektor
+            eylemler.append({"_index": index_name, "_id": soru_id, "_source": dokuman})
+    basarili, _ = helpers.bulk(es, eylemler, chunk_size=BULK_BOYUTU, stats_only=True)
+    # HNSW grafı segmentler yazılırken kurulur; yenileme indeksleme maliyetine dahildir
+    es.indices.refresh(index=index_name)
+    sure = time.perf_counter() - baslangic
+    return {"sure": sure, "verim": basarili / max(sure, 1e-9), "vektorleme": vektorleme,
+            "boyut": _indeks_boyutu(es, index_name)}
+
+def sorgu_olc(es, index_name, sorgular, temizler, model=None, aday=KNN_ADAY_SAYISI):
+    """Her sorguyu bir kez arar; (hazırlama ms listesi, arama ms listesi, sonuç id'leri) döndürür"""
+    hazirlama, arama, idler = [], [], []
+    for soru, temiz in zip(sorgular, temizler):
+        baslangic = time.perf_counter()
+        if model:
+            govde = vektor_govdesi(model.vektorle([temiz])[0])
+            govde.update(_source=GOSTERILEN_ALANLAR, size=SONUC_SAYISI)
+            if "knn" in govde:
+                govde["knn"]["num_candidates"] = max(aday, SONUC_SAYISI)
+        else:
+            govde = arama_istegi(soru, 0, "istemci", temiz=temiz)
+        hazir = time.perf_counter()
+        yanit = es.search(index=index_name, body=govde, filter_path=ARAMA_FILTER_PATH)
+        bitis = time.perf_counter()
+        hazirlama.append((hazir - baslangic) * 1000)
+        arama.append((bitis - hazir) * 1000)
+        idler.append([hit["_id"] for hit in yanit.get("hits", {}).get("hits", [])])
+    return hazirlama, arama, idler
+
+def _yuzdelik(degerler, oran):
+    sirali = sorted(degerler)
+    return sirali[min(len(sirali) - 1, int(len(sirali) * oran))] if sirali else 0.0
+
+def main():
+    parser = argparse.ArgumentParser(description="dense_vector alanının indeksleme ve sorgu maliyeti")
+    parser.add_argument("--ornek", type=int, default=None, help="Yüklenecek en fazla soru (varsayılan: tümü)")
+    parser.add_argument("--sorgu", type=int, default=SORGU_SAYISI, help="Ölçülecek sorgu sayısı")
+    parser.add_argument("--boyut", type=int, default=VEKTOR_BOYUTU, help="Vektör boyutu")
+    parser.add_argument("--aday", type=int, default=KNN_ADAY_SAYISI, help="kNN num_candidates")
+    args = parser.parse_args()
+
+    es = get_default_client()
+    if not es:
+        raise SystemExit("Elasticsearch bağlantısı kurulamadı. Lütfen servisi kontrol edin.")
+
+    satirlar = sorulari_oku(ornek=args.ornek)
+    if len(satirlar) < 2:
+        raise SystemExit("Veritabanında kıyaslama için yeterli soru yok.")
+    temizler = list(temizle_many(metin for _, metin in satirlar))
+    baslangic = time.perf_counter()
+    model = VektorModeli.egit(temizler, args.boyut)
+    egitim = time.perf_counter() - baslangic
+    print(f"🧪 {len(satirlar)} soru, {model.boyut} boyutlu vektör (model eğitimi {egitim:.2f} sn)")
+
+    # Sorgular sorulardan eşit aralıklarla seçilir
+    adim = max(1, len(satirlar) // args.sorgu)
+    secilen = list(range(0, len(satirlar), adim))[:args.sorgu]
+    sorgular = [satirlar[i][1] for i in secilen]
+    sorgu_temizleri = [temizler[i] for i in secilen]
+
+    sonuclar = {}
+    idler = {}
+    for ad, kullanilan_model in (("sözcüksel", None), ("vektörlü", model)):
+        index_name = f"{GECICI_ON_EK}{'vektor' if kullanilan_model else 'metin'}"
+        if es.indices.exists(index=index_name):
+            es.indices.delete(index=index_name)
+        try:
+            sonuclar[ad] = indeksleme_olc(es, index_name, satirlar, temizler, kullanilan_model)
+            # Isınma: ilk sorgular bağlantı ve önbellek kurulumunu ölçmesin
+            sorgu_olc(es, index_name, sorgular[:10], sorgu_temizleri[:10], kullanilan_model, args.aday)
+            hazirlama, arama, idler[ad] = sorgu_olc(es, index_name, sorgular, sorgu_temizleri,
+                                                    kullanilan_model, args.aday)
+            sonuclar[ad].update(hazirlama=statistics.mean(hazirlama), p50=_yuzdelik(arama, 0.5),
+                                p95=_yuzdelik(arama, 0.95))
+        finally:
+            es.indices.delete(index=index_name)
+
+    metin, vektor = sonuclar["sözcüksel"], sonuclar["vektörlü"]
+    print(f"\n{'Ölçüm':<30}{'sözcüksel':>12}{'vektörlü':>12}{'fark':>10}")
+    print("-" * 64)
+    satir_bicimleri = [
+        ("İndeksleme süresi (sn)", "sure", "{:.2f}"),
+        ("İndeksleme verimi (dok/sn)", "verim", "{:.0f}"),
+        ("  vektörleme (sn)", "vektorleme", "{:.2f}"),
+        ("İndeks boyutu (MB)", "boyut", "{:.2f}"),
+        ("Sorgu hazırlama ort. (ms)", "hazirlama", "{:.2f}"),
+        ("Arama p50 (ms)", "p50", "{:.2f}"),
+        ("Arama p95 (ms)", "p95", "{:.2f}"),
+    ]
+    for baslik, anahtar, bicim in satir_bicimleri:
+        a, b = metin[anahtar], vektor[anahtar]
+        if anahtar == "boyut":
+            a, b = a / 1024 / 1024, b / 1024 / 1024
+        fark = f"{b / a:.1f}x" if a else "-"
+        print(f"{baslik:<30}{bicim.format(a):>12}{bicim.format(b):>12}{fark:>10}")
+
+    ortak = [len(set(x) & set(y)) / max(len(x), 1) for x, y in zip(idler["sözcüksel"], idler["vektörlü"]) if x]
+    if ortak:
+        print(f"\n🔀 İlk {SONUC_SAYISI} sonuçta ortak soru oranı: %{statistics.mean(ortak) * 100:.0f} "
+              "(düşük oran, kNN'in kelime eşleşmesi dışındaki benzerlikleri bulduğunu gösterir)")
+
+if __name__ == "__main__":
+    main()
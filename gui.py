@@ -1,10 +1,11 @@
 import tkinter as tk
 from tkinter import messagebox, simpledialog, scrolledtext
 import re
-from es_search import benzer_sorulari_bul, load_stopwords, save_stopwords, refresh_stopwords
+from es_search import (benzer_sorulari_sayfala, sonuc_metni, load_stopwords,
+                       save_stopwords, refresh_stopwords, SONUC_SAYISI, ETKILESIMLI_BUTCE_MS)
 from performance_monitor import monitor_performance, print_performance_summary, save_performance_metrics
 from performance_analyzer import PerformanceAnalyzer
-from ml_analyzer import MLAnalyzer
+from search_engine import AramaMotoru
 import threading
 import time
 
@@ -46,6 +47,14 @@ class SoruAramaApp:
         # Durum değişkenleri
         self.is_searching = False
         self.search_thread = None
+        # "Daha Fazla" için son Elasticsearch aramasının durumu
+        self.son_arama = None          # (soru, esik)
+        self.gosterilen_idler = set()
+        self.sayfalayici = None
+        
+        # Elasticsearch erişilemezken aramalar ML ile sürdürülür; model arka planda hazırlanır
+        self.motor = AramaMotoru()
+        threading.Thread(target=self.motor.ml_hazirla, daemon=True).start()
         
         # Stopwords yükle
         self.stopwords = set(load_stopwords())
@@ -74,6 +83,9 @@ class SoruAramaApp:
         tk.Radiobutton(self.root, text="🤖 Machine Learning", variable=self.analiz_yontemi, 
                       value="machine_learning", bg="#f0f4f8", font=("Arial", 11), 
                       fg="#e74c3c").grid(row=1, column=2, sticky="w", padx=5)
+        tk.Radiobutton(self.root, text="⚡ Hızlı (ikisi yarışır)", variable=self.analiz_yontemi, 
+                      value="hedged", bg="#f0f4f8", font=("Arial", 11), 
+                      fg="#8e44ad").grid(row=1, column=3, sticky="w", padx=5)
         
         # Soru arama bölümü
         tk.Label(self.root, text="Soru Girin:", font=("Arial", 12, "bold"), 
@@ -103,6 +115,11 @@ class SoruAramaApp:
                                        activebackground="#d35400", cursor="hand2")
         self.temizle_button.grid(row=3, column=3, padx=5, pady=5)
 
+        self.daha_fazla_button = tk.Button(self.root, text="➕ Daha Fazla", command=self.daha_fazla_goster,
+                                           bg="#00b894", fg="white", font=("Arial", 10, "bold"),
+                                           activebackground="#00a383", cursor="hand2", state="disabled")
+        self.daha_fazla_button.grid(row=3, column=2, padx=5, pady=5)
+
 
         
         # Durum etiketi
@@ -176,6 +193,7 @@ class SoruAramaApp:
         """Butonlara tooltip'ler ekler"""
         Tooltip(self.ara_button, "Seçilen yöntemle soru araması yapar")
         Tooltip(self.temizle_button, "Arama sonuçlarını temizler")
+        Tooltip(self.daha_fazla_button, "Elasticsearch aramasının sonraki sonuçlarını getirir")
         Tooltip(self.ekle_button, "Yeni stopword ekler")
         Tooltip(self.sil_button, "Seçili stopword'ü siler")
         Tooltip(self.performans_ozet_button, "Sistem performans özetini gösterir")
@@ -215,6 +233,7 @@ class SoruAramaApp:
         # Arama işlemini thread'de çalıştır
         self.is_searching = True
         self.ara_button.config(state="disabled", text="🔍 Aranıyor...")
+        self.daha_fazla_button.config(state="disabled")
         self.search_thread = threading.Thread(target=self._perform_search, args=(soru, esik, yontem))
         self.search_thread.daemon = True
         self.search_thread.start()
@@ -222,22 +241,23 @@ class SoruAramaApp:
     def _perform_search(self, soru, esik, yontem):
         """Arama işlemini gerçekleştirir (thread'de çalışır)"""
         try:
-            import io, sys
-            old_stdout = sys.stdout
-            sys.stdout = mystdout = io.StringIO()
-            
+            self._sayfalamayi_kapat()
             if yontem == "elasticsearch":
-                print("🔍 Elasticsearch ile analiz yapılıyor...")
-                benzer_sorulari_bul(soru, esik=esik)
+                # Arama kutusu takılmasın: bütçe dolunca eldeki sonuçlar gösterilir
+                sonuc = self.motor.ara(soru, esik=esik, butce_ms=ETKILESIMLI_BUTCE_MS)
+                result = "🔍 Elasticsearch ile analiz yapılıyor...\n" + sonuc_metni(sonuc) + "\n"
+                # İlk sayfa doluysa devamı "Daha Fazla" ile getirilebilir (kNN aramasında sayfalama yok)
+                if sonuc.motor == "elasticsearch" and sonuc.analiz != "vektor" and len(sonuc) == SONUC_SAYISI:
+                    self.son_arama = (soru, esik)
+                    self.gosterilen_idler = {benzer.id for benzer in sonuc}
+            elif yontem == "hedged":
+                # Elasticsearch gecikirse ML de sorulur, eşiği geçen ilk cevap gösterilir
+                sonuc = self.motor.hedged_ara(soru, esik=esik, butce_ms=ETKILESIMLI_BUTCE_MS)
+                result = "⚡ Elasticsearch ve Machine Learning yarıştırılıyor...\n" + sonuc_metni(sonuc) + "\n"
             elif yontem == "machine_learning":
-                print("🤖 Machine Learning ile analiz yapılıyor...")
-                self.ml_analiz_yap(soru, esik)
+                result = "🤖 Machine Learning ile analiz yapılıyor...\n" + self.ml_analiz_yap(soru, esik)
             else:
-                print("❌ Geçersiz analiz yöntemi")
-                return
-                
-            sys.stdout = old_stdout
-            result = mystdout.getvalue()
+                result = "❌ Geçersiz analiz yöntemi\n"
             
             # Sonucu UI'da göster
             self.root.after(0, lambda: self._show_search_result(result))
@@ -263,43 +283,104 @@ class SoruAramaApp:
         """Arama işlemini sonlandırır"""
         self.is_searching = False
         self.ara_button.config(state="normal", text="🔍 Ara")
+        self.daha_fazla_button.config(state="normal" if self.son_arama else "disabled")
         self.update_status("Hazır", "#666")
 
+    def _sayfalamayi_kapat(self):
+        """Açık sayfalamayı (ve Elasticsearch'teki point-in-time'ı) kapatır"""
+        if self.sayfalayici is not None:
+            self.sayfalayici.close()
+        self.sayfalayici = None
+        self.son_arama = None
+        self.gosterilen_idler = set()
+
+    def daha_fazla_goster(self):
+        """Son Elasticsearch aramasının sonraki sayfasını sonuçlara ekler"""
+        if self.is_searching or not self.son_arama:
+            return
+        self.is_searching = True
+        self.ara_button.config(state="disabled")
+        self.daha_fazla_button.config(state="disabled", text="⏳ Yükleniyor...")
+        self.search_thread = threading.Thread(target=self._load_more_results)
+        self.search_thread.daemon = True
+        self.search_thread.start()
+
+    def _load_more_results(self):
+        """Sonraki sayfayı point-in-time + search_after ile getirir (thread'de çalışır)"""
+        try:
+            if self.sayfalayici is None:
+                soru, esik = self.son_arama
+                self.sayfalayici = benzer_sorulari_sayfala(soru, esik=esik)
+            yeni = []
+            # İlk sayfadaki sonuçlar zaten gösterildi, yalnızca yenileri eklenir
+            while not yeni:
+                sayfa = next(self.sayfalayici, None)
+                if sayfa is None:
+                    break
+                yeni = [benzer for benzer in sayfa if benzer.id not in self.gosterilen_idler]
+            self.gosterilen_idler.update(benzer.id for benzer in yeni)
+            if not yeni:
+                self._sayfalamayi_kapat()
+            self.root.after(0, lambda: self._append_results(yeni))
+        except Exception as e:
+            self._sayfalamayi_kapat()
+            error_msg = f"Sonraki sonuçlar alınırken hata oluştu: {e}"
+            self.root.after(0, lambda: self._show_search_error(error_msg))
+        finally:
+            self.root.after(0, self._finish_more)
+
+    def _append_results(self, sonuclar):
+        """Yeni sayfadaki sonuçları mevcut sonuçların altına ekler"""
+        if not sonuclar:
+            self.sonuc_text.insert(tk.END, "\nBaşka benzer soru yok.\n")
+            return
+        satirlar = [f"• {benzer.soru}  (Benzerlik: %{benzer.yuzde:.0f})" for benzer in sonuclar]
+        self.sonuc_text.insert(tk.END, "\n".join(satirlar) + "\n")
+        self.sonuc_text.see(tk.END)
+
+    def _finish_more(self):
+        """Daha fazla sonuç yükleme işlemini sonlandırır"""
+        self.is_searching = False
+        self.ara_button.config(state="normal")
+        self.daha_fazla_button.config(state="normal" if self.son_arama else "disabled", text="➕ Daha Fazla")
+        if self.son_arama:
+            self.update_status(f"{len(self.gosterilen_idler)} sonuç gösteriliyor", "#27ae60")
+        else:
+            self.update_status("Tüm sonuçlar gösterildi", "#27ae60")
+
     def ml_analiz_yap(self, soru, esik):
-        """ML analizi yapar"""
+        """ML analizi yapar ve sonuç metnini döndürür"""
+        satirlar = []
         try:
-            analyzer = MLAnalyzer()
-            # Verileri yükle ve modeli hazırla
-            if not analyzer.load_questions_from_db():
-                print("❌ Veritabanından sorular yüklenemedi")
-                return
-                
-            analyzer.clean_questions()
-            
-            # Model yükle veya eğit
-            if not analyzer.load_model():
-                analyzer.train_model()
+            # Model bir kez yüklenir, sonraki aramalar aynı analizörü kullanır
+            analyzer = self.motor.ml_hazirla()
+            if analyzer is None:
+                return "❌ Veritabanından sorular yüklenemedi\n"
             
             # Benzer soruları bul
             benzer_sorular = analyzer.find_similar_questions_ml(soru, threshold=esik)
             
-            print(f"🤖 ML Analizi Sonuçları (Eşik: {esik}):")
-            print("="*60)
+            satirlar.append(f"🤖 ML Analizi Sonuçları (Eşik: {esik}):")
+            satirlar.append("="*60)
             
             if benzer_sorular:
                 for i, result in enumerate(benzer_sorular, 1):
-                    print(f"{i}. Benzerlik: {result['benzerlik']:.3f} ({result['yuzde']:.1f}%)")
-                    print(f"   Soru: {result['soru']}")
-                    print("-" * 40)
+                    satirlar.append(f"{i}. Benzerlik: {result['benzerlik']:.3f} ({result['yuzde']:.1f}%)")
+                    satirlar.append(f"   Soru: {result['soru']}")
+                    satirlar.append("-" * 40)
             else:
-                print("❌ Benzer soru bulunamadı.")
+                satirlar.append("❌ Benzer soru bulunamadı.")
                 
         except Exception as e:
-            print(f"❌ ML analizi hatası: {e}")
+            satirlar.append(f"❌ ML analizi hatası: {e}")
+        return "\n".join(satirlar) + "\n"
 
     def sonuc_temizle(self):
         """Sonuçları temizler"""
         self.sonuc_text.delete(1.0, tk.END)
+        if not self.is_searching:
+            self._sayfalamayi_kapat()
+            self.daha_fazla_button.config(state="disabled")
         self.update_status("Sonuçlar temizlendi", "#f39c12")
 
     def stopwords_ara(self, event=None):
@@ -317,6 +398,11 @@ class SoruAramaApp:
         for stopword in sorted(self.stopwords):
             self.stopwords_listbox.insert(tk.END, stopword)
 
+    def ml_modelini_yenile(self):
+        """ML modelini yeni stopword listesiyle arka planda yeniden kurar"""
+        self.motor.ml_sifirla()
+        threading.Thread(target=self.motor.ml_hazirla, daemon=True).start()
+
     def stopword_ekle(self):
         """Yeni stopword ekler"""
         new_stopword = self.stopwords_search.get().strip().lower()
@@ -335,6 +421,7 @@ class SoruAramaApp:
             refresh_stopwords()
         except Exception:
             pass
+        self.ml_modelini_yenile()
         self.stopwords_guncelle()
         self.stopwords_search.delete(0, tk.END)
         self.update_status(f"'{new_stopword}' stopword olarak eklendi", "#27ae60")
@@ -357,6 +444,7 @@ class SoruAramaApp:
                 refresh_stopwords()
             except Exception:
                 pass
+            self.ml_modelini_yenile()
             self.stopwords_guncelle()
             self.update_status(f"'{stopword}' stopword olarak silindi", "#e74c3c")
 
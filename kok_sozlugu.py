@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Kalıcı Kök Sözlüğü
+GUI, indeksleyici, ML analizi ve test betikleri aynı kelimelerin köklerini
+her süreçte yeniden hesaplamasın diye kelime -> kök eşlemesini diskte tutar.
+
+Sözlük SQLite dosyasında (WITHOUT ROWID tablo, WAL kipi, bellek eşlemeli okuma)
+saklanır; süreçler açılışta tüm eşlemeyi tek sorguyla yükler, yeni bulunan
+kökleri toplu olarak ekler. Dosya kök bulucunun sürümüyle etiketlenir, sürüm
+değişirse kayıtlar silinip sözlük baştan kurulur. Stopword kökleri ayrıca
+stopword listesinin özetiyle birlikte saklanır.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from importlib import metadata
+
+KOK_SOZLUGU_DOSYASI = "kok_sozlugu.db"
+SOZLUK_FORMAT_SURUMU = 1
+YAZMA_BOYUTU = 500              # Kaç yeni kökte bir diske yazılacağı
+MMAP_BOYUTU = 64 * 1024 * 1024  # SQLite okumaları için bellek eşleme sınırı
+
+def kok_bulucu_surumu():
+    """Kökleri üreten kütüphanenin sürümü; değişirse kayıtlı kökler geçersizdir"""
+    try:
+        paket = metadata.version("TurkishStemmer")
+    except metadata.PackageNotFoundError:
+        paket = "bilinmiyor"
+    return f"TurkishStemmer-{paket}/format-{SOZLUK_FORMAT_SURUMU}"
+
+def stopword_listesi_ozeti(stopwords):
+    """Stopword listesinin sıradan bağımsız özeti"""
+    return hashlib.sha1("\n".join(sorted(set(stopwords))).encode("utf-8")).hexdigest()
+
+class KokSozlugu:
+    """Süreçler arasında paylaşılan kelime -> kök sözlüğü"""
+
+    def __init__(self, dosya=KOK_SOZLUGU_DOSYASI, yazma_boyutu=YAZMA_BOYUTU):
+        self.dosya = dosya
+        self.yazma_boyutu = yazma_boyutu
+        self.surum = kok_bulucu_surumu()
+        self.lock = threading.Lock()
+        self.kokler = {}
+        self._bekleyen = {}
+        self._conn = None
+        self._pid = None
+        try:
+            self._yukle()
+        except sqlite3.Error as e:
+            # Sözlük yalnızca hızlandırıcıdır; okunamazsa bellekte çalışmaya devam edilir
+            print(f"⚠️ Kök sözlüğü okunamadı ({e}), kökler bu süreçte yeniden hesaplanacak.")
+            self.dosya = None
+
+    def _baglanti(self):
+        # Süreç havuzunda fork ile kopyalanan bağlantı kullanılmaz, her süreç kendi bağlantısını açar
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.dosya, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"PRAGMA mmap_size={MMAP_BOYUTU}")
+            conn.execute("CREATE TABLE IF NOT EXISTS kokler (kelime TEXT PRIMARY KEY, kok TEXT NOT NULL) WITHOUT ROWID")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (anahtar TEXT PRIMARY KEY, deger TEXT)")
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def _meta_oku(self, anahtar):
+        satir = self._baglanti().execute("SELECT deger FROM meta WHERE anahtar = ?", (anahtar,)).fetchone()
+        return satir[0] if satir else None
+
+    def _meta_yaz(self, anahtar, deger):
+        self._baglanti().execute("INSERT OR REPLACE INTO meta (anahtar, deger) VALUES (?, ?)", (anahtar, deger))
+
+    def _yukle(self):
+        conn = self._baglanti()
+        with conn:
+            if self._meta_oku("surum") != self.surum:
+                # Farklı kök bulucuyla üretilmiş kayıtlar karıştırılmaz
+                conn.execute("DELETE FROM kokler")
+                conn.execute("DELETE FROM meta")
+                self._meta_yaz("surum", self.surum)
+        self.kokler = dict(conn.execute("SELECT kelime, kok FROM kokler"))
+
+    def get(self, kelime):
+        return self.kokler.get(kelime)
+
+    def ekle(self, kelime, kok):
+        """Yeni bir kökü kaydeder; bekleyenler `yazma_boyutu`na ulaşınca diske yazılır"""
+        with self.lock:
+            self.kokler[kelime] = kok
+            self._bekleyen[kelime] = kok
+            dolu = len(self._bekleyen) >= self.yazma_boyutu
+        if dolu:
+            self.kaydet()
+
+    def kaydet(self):
+        """Bekleyen kökleri diske ekler (diğer süreçlerin yazdıklarıyla çakışma sorun olmaz)"""
+        with self.lock:
+            if not self._bekleyen or not self.dosya:
+                return
+            bekleyen, self._bekleyen = self._bekleyen, {}
+            try:
+                with self._baglanti() as conn:
+                    conn.executemany("INSERT OR IGNORE INTO kokler (kelime, kok) VALUES (?, ?)", bekleyen.items())
+            except sqlite3.Error as e:
+                print(f"⚠️ Kök sözlüğüne yazılamadı: {e}")
+
+    def stopword_kokleri(self, stopwords):
+        """Aynı stopword listesi için daha önce kaydedilmiş kökleri döndürür (yoksa None)"""
+        if not self.dosya:
+            return None
+        with self.lock:
+            kayit = self._meta_oku(f"stopword_kokleri:{stopword_listesi_ozeti(stopwords)}")
+        return json.loads(kayit) if kayit else None
+
+    def stopword_koklerini_kaydet(self, stopwords, kokler):
+        if not self.dosya:
+            return
+        with self.lock:
+            try:
+                conn = self._baglanti()
+                with conn:
+                    # Yalnızca son listenin kökleri tutulur
+                    conn.execute("DELETE FROM meta WHERE anahtar LIKE 'stopword_kokleri:%'")
+                    self._meta_yaz(f"stopword_kokleri:{stopword_listesi_ozeti(stopwords)}",
+                                   json.dumps(sorted(kokler), ensure_ascii=False))
+            except sqlite3.Error as e:
+                print(f"⚠️ Stopword kökleri kaydedilemedi: {e}")
+
+    def kapat(self):
+        self.kaydet()
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+
+_sozluk = None
+_sozluk_lock = threading.Lock()
+
+def get_kok_sozlugu():
+    """Süreç genelinde paylaşılan kök sözlüğünü döndürür (ilk çağrıda diskten yükler)"""
+    global _sozluk
+    if _sozluk is None:
+        with _sozluk_lock:
+            if _sozluk is None:
+                _sozluk = KokSozlugu()
+                atexit.register(_sozluk.kapat)
+    return _sozluk
@@ -14,21 +14,48 @@ from sklearn.decomposition import LatentDirichletAllocation
 import joblib
 import os
 import json
+import time
 from datetime import datetime
-from performance_monitor import monitor_performance
-from es_search import load_stopwords, temizle
-import re
+from performance_monitor import monitor_performance, register_stats_provider
+from es_search import get_normalizer, load_stopwords, temizle, temizle_many
+from query_cache import SorguOnbellegi
+from single_flight import TekUcus
+from search_scheduler import ETKILESIMLI, get_zamanlayici
+
+# Temizleme adımı değiştiğinde artırılır; farklı sürümle eğitilmiş kayıtlı model yeniden eğitilir
+TEMIZLEME_SURUMU = 2
+
+# Sorgu sonuç önbelleği; anahtar modelin neslini içerdiğinden yeniden eğitilen/yüklenen
+# modelin eski sonuçları kullanılmaz, stopword listesi değişince önbellek boşaltılır
+ml_onbellegi = SorguOnbellegi("machine_learning", nesil=lambda: get_normalizer().stopword_ozeti)
+register_stats_provider("sorgu_onbellegi_ml", ml_onbellegi.istatistikler)
+# Aynı anda gelen aynı sorgular tek benzerlik hesabını paylaşır
+ml_ucuslari = TekUcus("machine_learning")
+register_stats_provider("tek_ucus_ml", ml_ucuslari.istatistikler)
+
+def tfidf_vektorizeri():
+    """MLAnalyzer ve Elasticsearch vektör modelinin (vektor_modeli) ortak TF-IDF ayarları"""
+    return TfidfVectorizer(
+        max_features=5000,
+        ngram_range=(1, 3),
+        min_df=1,
+        max_df=0.95,
+        sublinear_tf=True,
+        norm="l2",
+        lowercase=False,
+        token_pattern=r"(?u)\b\w\w+\b",
+    )
 
 class MLAnalyzer:
     def __init__(self):
         self.vectorizer = None
         self.questions = []
+        self.question_ids = []
         self.cleaned_questions = []
         self.tfidf_matrix = None
+        self.model_nesli = None    # TF-IDF matrisi her kurulduğunda değişir (önbellek anahtarı)
         self.model_path = "ml_models"
         self.ensure_model_directory()
-        # Basit metin normalizasyon paterni (Türkçe karakterler korunur, noktalama temizlenir)
-        self._non_word_pattern = re.compile(r"[^\w\sÇĞİÖŞÜçğıöşü]")
         
     def ensure_model_directory(self):
         """Model dizinini oluşturur"""
@@ -43,10 +70,11 @@ class MLAnalyzer:
             conn = sqlite3.connect('sorular.db')
             cursor = conn.cursor()
             
-            cursor.execute("SELECT metin FROM sorular")
+            cursor.execute("SELECT id, metin FROM sorular")
             questions = cursor.fetchall()
             
-            self.questions = [q[0] for q in questions]
+            self.question_ids = [q[0] for q in questions]
+            self.questions = [q[1] for q in questions]
             conn.close()
             
             print(f"✅ {len(self.questions)} soru yüklendi")
@@ -57,13 +85,10 @@ class MLAnalyzer:
             return False
             
     @monitor_performance("ml_metin_temizleme")
-    def clean_questions(self):
-        """Soruları temizler ve hazırlar"""
-        self.cleaned_questions = []
-        for question in self.questions:
-            basic = self._non_word_pattern.sub(" ", question).lower()
-            cleaned = temizle(basic)
-            self.cleaned_questions.append(cleaned)
+    def clean_questions(self, isci_sayisi=1):
+        """Soruları temizler ve hazırlar (büyük derlemlerde isci_sayisi > 1 ile süreç havuzunda)"""
+        # temizle noktalama temizliğini ve küçük harfe çevirmeyi kendisi yapar
+        self.cleaned_questions = list(temizle_many(self.questions, isci_sayisi=isci_sayisi))
             
         print(f"✅ {len(self.cleaned_questions)} soru temizlendi")
         
@@ -75,22 +100,15 @@ class MLAnalyzer:
             return False
             
         # TF-IDF vektörizer oluştur
-        self.vectorizer = TfidfVectorizer(
-            max_features=5000,
-            ngram_range=(1, 3),
-            min_df=1,
-            max_df=0.95,
-            sublinear_tf=True,
-            norm="l2",
-            lowercase=False,
-            token_pattern=r"(?u)\b\w\w+\b",
-        )
+        self.vectorizer = tfidf_vektorizeri()
         
         # TF-IDF matrisini oluştur
         self.tfidf_matrix = self.vectorizer.fit_transform(self.cleaned_questions)
+        self.model_nesli = time.time_ns()
         
         # Modeli kaydet
         model_file = os.path.join(self.model_path, "tfidf_model.pkl")
+        self.vectorizer.temizleme_surumu_ = TEMIZLEME_SURUMU
         joblib.dump(self.vectorizer, model_file)
         
         print(f"✅ TF-IDF modeli eğitildi ve kaydedildi")
@@ -104,9 +122,15 @@ class MLAnalyzer:
         
         if os.path.exists(model_file):
             self.vectorizer = joblib.load(model_file)
+            if getattr(self.vectorizer, "temizleme_surumu_", None) != TEMIZLEME_SURUMU:
+                # Sözlük farklı temizlenmiş metinle kurulmuş, sorgular eşleşmez
+                self.vectorizer = None
+                print("❌ Kaydedilmiş model eski temizleme adımıyla eğitilmiş, yeni model eğitilecek")
+                return False
             # TF-IDF matrisini yeniden oluştur
             if self.cleaned_questions:
                 self.tfidf_matrix = self.vectorizer.transform(self.cleaned_questions)
+                self.model_nesli = time.time_ns()
                 print("✅ Kaydedilmiş model yüklendi ve TF-IDF matrisi oluşturuldu")
             else:
                 print("❌ Temizlenmiş sorular bulunamadı, model yüklenemedi")
@@ -117,20 +141,39 @@ class MLAnalyzer:
             return False
             
     @monitor_performance("ml_benzer_soru_bulma")
-    def find_similar_questions_ml(self, query, top_k=5, threshold=0.3):
-        """Makine öğrenmesi ile benzer soruları bulur"""
+    def find_similar_questions_ml(self, query, top_k=5, threshold=0.3, onbellek=True, oncelik=ETKILESIMLI):
+        """
+        Makine öğrenmesi ile benzer soruları bulur. onbellek=False sorgu
+        önbelleğini ve eşzamanlı aynı sorguların birleştirilmesini atlar;
+        hesaplama ML zamanlayıcısında `oncelik` sınıfıyla sıraya girer.
+        """
         if not self.vectorizer:
             print("❌ Model yüklenmemiş")
             return []
             
         # Sorguyu temizle
-        cleaned_query = temizle(self._non_word_pattern.sub(" ", query).lower())
-        
-        # Sorguyu vektörize et
-        query_vector = self.vectorizer.transform([cleaned_query])
+        cleaned_query = temizle(query)
+        if not onbellek:
+            return self._benzerleri_hesapla(cleaned_query, top_k, threshold, oncelik)
         
-        # Benzerlik hesapla
-        similarities = cosine_similarity(query_vector, self.tfidf_matrix).flatten()
+        anahtar = (self.model_nesli, cleaned_query, top_k, threshold)
+        onceki = ml_onbellegi.getir(anahtar)
+        if onceki is not None:
+            return [dict(sonuc) for sonuc in onceki]
+        # Yalnızca aynı öncelik sınıfındaki çağrılar birleştirilir (toplu kuyruğu etkileşimliye taşınmaz)
+        results, paylasildi = ml_ucuslari.calistir(
+            anahtar + (oncelik,), lambda: self._benzerleri_hesapla(cleaned_query, top_k, threshold, oncelik))
+        if not paylasildi:
+            ml_onbellegi.koy(anahtar, [dict(sonuc) for sonuc in results])
+        return [dict(sonuc) for sonuc in results]
+    
+    def _benzerleri_hesapla(self, cleaned_query, top_k, threshold, oncelik=ETKILESIMLI):
+        with get_zamanlayici("machine_learning").izin(oncelik):
+            # Sorguyu vektörize et
+            query_vector = self.vectorizer.transform([cleaned_query])
+            
+            # Benzerlik hesapla
+            similarities = cosine_similarity(query_vector, self.tfidf_matrix).flatten()
         max_similarity = float(similarities.max()) if similarities.size > 0 else 1.0
         
         # En benzer soruları bul
@@ -142,12 +185,12 @@ class MLAnalyzer:
             eff_threshold = max(threshold, 0.05)
             if similarity >= eff_threshold:
                 results.append({
+                    'id': self.question_ids[idx] if idx < len(self.question_ids) else None,
                     'soru': self.questions[idx],
                     'benzerlik': float(similarity),
                     'yuzde': float((similarity / max_similarity) * 100.0) if max_similarity > 0 else 0.0,
                     'index': int(idx)
                 })
-                
         return results
         
     @monitor_performance("ml_kumeleme_analizi")
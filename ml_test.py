@@ -109,7 +109,7 @@ def test_performance_comparison():
     print("\n⚡ Performans Karşılaştırması")
     print("=" * 60)
     
-    from es_search import benzer_sorulari_bul
+    from es_search import benzer_sorulari_ara
     from ml_analyzer import MLAnalyzer
     import time
     
@@ -133,15 +133,16 @@ def test_performance_comparison():
     print("\n🔍 Elasticsearch Test:")
     start_time = time.time()
     
-    import io, sys
-    old_stdout = sys.stdout
-    sys.stdout = io.StringIO()
-    
-    benzer_sorulari_bul(test_query, esik=0.3)
+    try:
+        es_sonuc = benzer_sorulari_ara(test_query, esik=0.3)
+    except Exception as e:
+        es_sonuc = None
+        print(f"   ❌ Arama hatası: {e}")
     
-    sys.stdout = old_stdout
     es_time = time.time() - start_time
     print(f"   ⏱️ Süre: {es_time:.3f} saniye")
+    if es_sonuc is not None:
+        print(f"   📋 Sonuç: {len(es_sonuc)} soru")
     
     # Karşılaştırma
     print(f"\n📊 Karşılaştırma:")
@@ -153,6 +154,25 @@ def test_performance_comparison():
     else:
         print(f"   🏆 ES {ml_time/es_time:.1f}x daha hızlı")
 
+    # Hibrit (RRF) test: iki motor aynı anda çalışır, sıralamalar birleştirilir
+    print("\n🔀 Hibrit (RRF) Test:")
+    from search_engine import AramaMotoru
+    motor = AramaMotoru()
+    motor.ml_hazirla(analyzer)  # Yukarıda eğitilen model tekrar yüklenmesin
+    hibrit = motor.hibrit_ara(test_query, esik=0.3)
+    if hibrit.hata:
+        print(f"   ❌ Arama hatası: {hibrit.hata}")
+        return
+    sureler = hibrit.sureler
+    print(f"   ⏱️ ES: {sureler['elasticsearch']:.1f} ms, ML: {sureler['machine_learning']:.1f} ms, "
+          f"birleştirme: {sureler['fuzyon']:.2f} ms, toplam: {sureler['toplam']:.1f} ms")
+    print(f"   📋 Sonuç: {len(hibrit)} soru")
+    ml_idler = {str(sonuc['id']) for sonuc in ml_results}
+    es_idler = {benzer.id for benzer in es_sonuc} if es_sonuc is not None else set()
+    for benzer in hibrit:
+        kaynak = "+".join(ad for ad, idler in (("ES", es_idler), ("ML", ml_idler)) if benzer.id in idler) or "-"
+        print(f"   • [{kaynak}] {benzer.soru} (RRF: {benzer.skor:.4f})")
+
 def main():
     """Ana test fonksiyonu"""
     try:
@@ -5,6 +5,7 @@ Performans İzleme Sistemi
 Bu modül, uygulama performansını izler ve metrikleri toplar.
 """
 
+import inspect
 import time
 import psutil
 import json
@@ -17,50 +18,71 @@ class PerformanceMonitor:
     def __init__(self):
         self.metrics = {}
         self.lock = threading.Lock()
+        # Süre ölçümü dışındaki sayaçları (önbellek isabeti vb.) sağlayan fonksiyonlar
+        self.stats_providers = {}
+        # İşlem başına kaydedilen sayısal değerler (yanıt boyutu vb.)
+        self.values = {}
         
     def monitor_performance(self, operation_name):
-        """Performans izleme decorator'ı"""
+        """Performans izleme decorator'ı (async fonksiyonlarda await süresi ölçülür)"""
         def decorator(func):
+            if inspect.iscoroutinefunction(func):
+                @wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    start = self._olcum_baslat()
+                    success = False
+                    try:
+                        result = await func(*args, **kwargs)
+                        success = True
+                    finally:
+                        self._olcumu_kaydet(operation_name, func, start, success, args, kwargs)
+                    return result
+                return async_wrapper
+
             @wraps(func)
             def wrapper(*args, **kwargs):
-                start_time = time.time()
-                start_memory = psutil.Process().memory_info().rss / 1024 / 1024  # MB
-                start_cpu = psutil.cpu_percent()
-                
+                start = self._olcum_baslat()
+                success = False
                 try:
                     result = func(*args, **kwargs)
                     success = True
-                except Exception as e:
-                    success = False
-                    raise e
                 finally:
-                    end_time = time.time()
-                    end_memory = psutil.Process().memory_info().rss / 1024 / 1024  # MB
-                    end_cpu = psutil.cpu_percent()
-                    
-                    duration = end_time - start_time
-                    memory_used = end_memory - start_memory
-                    cpu_used = (start_cpu + end_cpu) / 2
-                    
-                    measurement = {
-                        'timestamp': datetime.now().isoformat(),
-                        'duration_seconds': duration,
-                        'memory_used_mb': memory_used,
-                        'cpu_percent': cpu_used,
-                        'success': success,
-                        'function_name': func.__name__,
-                        'args_count': len(args),
-                        'kwargs_count': len(kwargs)
-                    }
-                    
-                    with self.lock:
-                        if operation_name not in self.metrics:
-                            self.metrics[operation_name] = []
-                        self.metrics[operation_name].append(measurement)
-                
+                    self._olcumu_kaydet(operation_name, func, start, success, args, kwargs)
                 return result
             return wrapper
         return decorator
+
+    def _olcum_baslat(self):
+        start_time = time.time()
+        start_memory = psutil.Process().memory_info().rss / 1024 / 1024  # MB
+        start_cpu = psutil.cpu_percent()
+        return start_time, start_memory, start_cpu
+
+    def _olcumu_kaydet(self, operation_name, func, start, success, args, kwargs):
+        start_time, start_memory, start_cpu = start
+        end_time = time.time()
+        end_memory = psutil.Process().memory_info().rss / 1024 / 1024  # MB
+        end_cpu = psutil.cpu_percent()
+        
+        duration = end_time - start_time
+        memory_used = end_memory - start_memory
+        cpu_used = (start_cpu + end_cpu) / 2
+        
+        measurement = {
+            'timestamp': datetime.now().isoformat(),
+            'duration_seconds': duration,
+            'memory_used_mb': memory_used,
+            'cpu_percent': cpu_used,
+            'success': success,
+            'function_name': func.__name__,
+            'args_count': len(args),
+            'kwargs_count': len(kwargs)
+        }
+        
+        with self.lock:
+            if operation_name not in self.metrics:
+                self.metrics[operation_name] = []
+            self.metrics[operation_name].append(measurement)
     
     def get_operation_stats(self, operation_name):
         """Belirli bir operasyon için istatistikleri döndürür"""
@@ -88,6 +110,43 @@ class PerformanceMonitor:
             'last_run': measurements[-1]['timestamp'] if measurements else None
         }
     
+    def record_value(self, name, value):
+        """Bir ölçüm değerini (ör. yanıt bayt sayısı) kaydeder"""
+        with self.lock:
+            self.values.setdefault(name, []).append(value)
+
+    def get_value_stats(self, name):
+        """Kaydedilen değerlerin adet/ortalama/en küçük/en büyük/toplam özetini döndürür"""
+        with self.lock:
+            values = list(self.values.get(name, []))
+        if not values:
+            return None
+        return {
+            'count': len(values),
+            'avg': sum(values) / len(values),
+            'min': min(values),
+            'max': max(values),
+            'total': sum(values),
+        }
+
+    def register_stats_provider(self, name, provider):
+        """Özet ve dışa aktarımda gösterilecek bir istatistik kaynağı kaydeder"""
+        with self.lock:
+            self.stats_providers[name] = provider
+
+    def get_provider_stats(self):
+        """Kayıtlı istatistik kaynaklarının ve kaydedilen değerlerin güncel özetini döndürür"""
+        with self.lock:
+            providers = dict(self.stats_providers)
+            value_names = list(self.values)
+        stats = {name: self.get_value_stats(name) for name in value_names}
+        for name, provider in providers.items():
+            try:
+                stats[name] = provider()
+            except Exception as e:
+                stats[name] = {'error': str(e)}
+        return stats
+
     def get_all_stats(self):
         """Tüm operasyonlar için istatistikleri döndürür"""
         stats = {}
@@ -101,8 +160,10 @@ class PerformanceMonitor:
             if operation_name:
                 if operation_name in self.metrics:
                     del self.metrics[operation_name]
+                self.values.pop(operation_name, None)
             else:
                 self.metrics.clear()
+                self.values.clear()
     
     def export_metrics(self, filename=None):
         """Metrikleri dosyaya aktarır"""
@@ -117,7 +178,9 @@ class PerformanceMonitor:
                     'total_operations': len(self.metrics),
                     'total_measurements': sum(len(measurements) for measurements in self.metrics.values()),
                     'metrics': self.metrics,
-                    'summary_stats': self.get_all_stats()
+                    'values': self.values,
+                    'summary_stats': self.get_all_stats(),
+                    'provider_stats': self.get_provider_stats()
                 }, f, indent=2, ensure_ascii=False)
             
             return filename
@@ -162,6 +225,19 @@ def monitor_performance(operation_name):
     """Performans izleme decorator'ı (global fonksiyon)"""
     return performance_monitor.monitor_performance(operation_name)
 
+def register_stats_provider(name, provider):
+    """İstatistik kaynağı kaydeder (global fonksiyon)"""
+    performance_monitor.register_stats_provider(name, provider)
+
+def record_value(name, value):
+    """Ölçüm değeri kaydeder (global fonksiyon)"""
+    performance_monitor.record_value(name, value)
+
+def _format_provider_value(value):
+    if isinstance(value, float):
+        return f"{value:.3f}"
+    return str(value)
+
 def print_performance_summary():
     """Tüm performans metriklerinin özetini yazdırır"""
     try:
@@ -237,6 +313,12 @@ def print_performance_summary():
             print("   2️⃣ Veya GUI uygulamasında soru arama yapın")
             print("   3️⃣ Veya diğer test butonlarından birini kullanın")
         
+        # Önbellek vb. sayaçlar
+        for name, values in performance_monitor.get_provider_stats().items():
+            print(f"\n🧮 {name}:")
+            for key, value in values.items():
+                print(f"   {key}: {_format_provider_value(value)}")
+        
         print("\n" + "="*60)
         
     except Exception as e:
@@ -313,6 +395,11 @@ def get_performance_report():
                 report.append(f"   Ortalama Bellek: {stat['avg_memory']:.2f} MB")
                 report.append(f"   Son Çalıştırma: {stat['last_run'][:19] if stat['last_run'] else 'Bilinmiyor'}")
         
+        for name, values in performance_monitor.get_provider_stats().items():
+            report.append(f"\n🧮 {name}:")
+            for key, value in values.items():
+                report.append(f"   {key}: {_format_provider_value(value)}")
+        
         return "\n".join(report)
         
     except Exception as e:
@@ -5,9 +5,16 @@ Performans Test Scripti
 Bu script, projenin çeşitli fonksiyonlarının performansını test eder.
 """
 
+import os
+import re
+import sqlite3
 import time
 from performance_monitor import monitor_performance, print_performance_summary, save_performance_metrics
-from es_search import benzer_sorulari_bul, temizle, load_stopwords
+from es_search import (benzer_sorulari_bul, benzer_sorulari_ara, toplu_benzer_sorulari_ara, dosyadan_sorulari_oku,
+                       temizle, temizle_many, load_stopwords, arama_govdesi, yanit_boyutu,
+                       arama_onbellegi, ARAMA_FILTER_PATH, INDEX_NAME)
+from es_config import get_default_client
+from search_scheduler import TOPLU
 
 def test_stopword_temizleme():
     """Stopword temizleme fonksiyonunu test eder"""
@@ -57,6 +64,189 @@ def test_stopwords_yukleme():
         print(f"  Yüklenen stopwords sayısı: {len(stopwords)}")
         print()
 
+def test_analiz_yollari_karsilastirma():
+    """İstemci (Python) ve sunucu (Elasticsearch) taraflı analiz yollarını gecikme ve sonuç uyumu açısından karşılaştırır"""
+    print("🔄 Analiz yolu karşılaştırması başlatılıyor...")
+    
+    es = get_default_client()
+    if not es:
+        print("  ❌ Elasticsearch bağlantısı kurulamadı, karşılaştırma atlandı.")
+        return
+    
+    test_sorular = [
+        "Türkiye'nin en yüksek dağı hangisidir?",
+        "Fotosentezin temel amacı nedir?",
+        "Bir elektrik devresinde direnç arttıkça akım nasıl değişir?",
+        "Osmanlı Devleti'nin reformları neden başarısız oldu?",
+        "Bir romanın gerçekçi sayılabilmesi için hangi özellikler gerekir?"
+    ]
+    
+    sureler = {"istemci": [], "sunucu": []}
+    ortusmeler = []
+    ayni_ilk_sonuc = 0
+    
+    for i, soru in enumerate(test_sorular, 1):
+        sonuclar = {}
+        for analiz in ("istemci", "sunucu"):
+            baslangic = time.perf_counter()
+            try:
+                body = arama_govdesi(soru, analiz)
+                yanit = es.search(index=INDEX_NAME, size=10, **body)
+            except Exception as e:
+                print(f"  Hata ({analiz}): {e}")
+                return
+            sureler[analiz].append(time.perf_counter() - baslangic)
+            sonuclar[analiz] = [hit["_id"] for hit in yanit["hits"]["hits"]]
+        
+        istemci, sunucu = set(sonuclar["istemci"]), set(sonuclar["sunucu"])
+        ortusme = len(istemci & sunucu) / len(istemci | sunucu) if istemci | sunucu else 1.0
+        ortusmeler.append(ortusme)
+        if sonuclar["istemci"][:1] == sonuclar["sunucu"][:1]:
+            ayni_ilk_sonuc += 1
+        print(f"  Test {i}: '{soru}' → ilk 10 örtüşme: %{ortusme * 100:.0f}")
+    
+    print()
+    for analiz, degerler in sureler.items():
+        print(f"  {analiz:8s} ortalama gecikme: {sum(degerler) / len(degerler) * 1000:.1f} ms")
+    print(f"  Ortalama sonuç örtüşmesi: %{sum(ortusmeler) / len(ortusmeler) * 100:.0f}")
+    print(f"  Aynı ilk sonuç: {ayni_ilk_sonuc}/{len(test_sorular)}")
+    print()
+
+def test_toplu_temizleme_karsilastirma(tekrar=20):
+    """Eski soru soru temizleme döngüsünü temizle_many'nin tek süreçli ve süreç havuzlu yollarıyla karşılaştırır"""
+    print("🔄 Toplu temizleme karşılaştırması başlatılıyor...")
+    
+    try:
+        conn = sqlite3.connect("sorular.db")
+        sorular = [satir[0] for satir in conn.execute("SELECT metin FROM sorular")]
+        conn.close()
+    except Exception as e:
+        print(f"  ❌ Sorular okunamadı: {e}")
+        return
+    if not sorular:
+        print("  ❌ Veritabanında soru yok, karşılaştırma atlandı.")
+        return
+    # Süreç havuzunun kurulum maliyetini aşacak büyüklükte bir derlem
+    derlem = sorular * tekrar
+    non_word_pattern = re.compile(r"[^\w\sÇĞİÖŞÜçğıöşü]")
+    isci_sayisi = os.cpu_count() or 1
+    
+    def eski_dongu():
+        # MLAnalyzer.clean_questions'ın önceki hali: çift regex geçişi + soru başına temizle()
+        return [temizle(non_word_pattern.sub(" ", soru).lower()) for soru in derlem]
+    
+    yollar = [
+        ("soru soru döngü", eski_dongu),
+        ("temizle_many (tek süreç)", lambda: list(temizle_many(derlem))),
+    ]
+    if isci_sayisi > 1:
+        yollar.append((f"temizle_many ({isci_sayisi} süreç)",
+                       lambda: list(temizle_many(derlem, isci_sayisi=isci_sayisi))))
+    sureler = {}
+    for ad, yol in yollar:
+        baslangic = time.perf_counter()
+        yol()
+        sureler[ad] = time.perf_counter() - baslangic
+    
+    temel = sureler["soru soru döngü"]
+    print(f"  Derlem: {len(derlem)} soru")
+    for ad, sure in sureler.items():
+        print(f"  {ad:28s} {sure:.3f} sn  ({len(derlem) / max(sure, 1e-9):.0f} soru/sn, x{temel / max(sure, 1e-9):.1f})")
+    print()
+
+def test_toplu_arama_karsilastirma(dosya_yolu="examples.txt"):
+    """Bir sınav dosyasını soru soru arama ile tek _msearch üzerinden toplu aramayı karşılaştırır"""
+    print("🔄 Toplu arama karşılaştırması başlatılıyor...")
+    
+    if not get_default_client():
+        print("  ❌ Elasticsearch bağlantısı kurulamadı, karşılaştırma atlandı.")
+        return
+    try:
+        sorular = dosyadan_sorulari_oku(dosya_yolu)
+    except Exception as e:
+        print(f"  ❌ {dosya_yolu} okunamadı: {e}")
+        return
+    
+    try:
+        baslangic = time.perf_counter()
+        tekli = [benzer_sorulari_ara(soru, esik=0.5, onbellek=False, oncelik=TOPLU) for soru in sorular]
+        tekli_sure = time.perf_counter() - baslangic
+        
+        baslangic = time.perf_counter()
+        toplu = toplu_benzer_sorulari_ara(sorular, esik=0.5)
+        toplu_sure = time.perf_counter() - baslangic
+    except Exception as e:
+        print(f"  Hata: {e}")
+        return
+    
+    ayni = sum([b.id for b in t] == [b.id for b in m] for t, m in zip(tekli, toplu))
+    print(f"  {len(sorular)} soru")
+    print(f"  Soru soru arama: {tekli_sure * 1000:.1f} ms ({len(sorular)} istek)")
+    print(f"  Toplu _msearch:  {toplu_sure * 1000:.1f} ms (x{tekli_sure / max(toplu_sure, 1e-9):.1f})")
+    print(f"  Aynı sonuç listesi: {ayni}/{len(sorular)}")
+    print()
+
+def test_yanit_boyutu_karsilastirma(esik=0.5):
+    """Tam isabet yanıtı ile yalın (filter_path + _source + min_score) yanıtın boyutunu karşılaştırır"""
+    print("🔄 Yanıt boyutu karşılaştırması başlatılıyor...")
+    
+    es = get_default_client()
+    if not es:
+        print("  ❌ Elasticsearch bağlantısı kurulamadı, karşılaştırma atlandı.")
+        return
+    
+    try:
+        sorular = dosyadan_sorulari_oku("examples.txt")
+        tam_bayt = 0
+        for soru in sorular:
+            tam_bayt += yanit_boyutu(es.search(index=INDEX_NAME, body=arama_govdesi(soru)))
+        yalin_bayt = sum(benzer_sorulari_ara(soru, esik=esik, onbellek=False, oncelik=TOPLU).yanit_bayt
+                         for soru in sorular)
+    except Exception as e:
+        print(f"  Hata: {e}")
+        return
+    
+    print(f"  Tam yanıt:  {tam_bayt / len(sorular):.0f} bayt/sorgu")
+    print(f"  Yalın yanıt: {yalin_bayt / len(sorular):.0f} bayt/sorgu (filter_path={ARAMA_FILTER_PATH})")
+    print(f"  Tasarruf: %{(1 - yalin_bayt / max(tam_bayt, 1)) * 100:.0f}")
+    print()
+
+def test_sorgu_onbellegi(dosya_yolu="examples.txt", tekrar=5):
+    """Aynı soruların tekrar aranmasında sorgu önbelleğinin gecikmeye etkisini ölçer"""
+    print("🔄 Sorgu önbelleği testi başlatılıyor...")
+    
+    if not get_default_client():
+        print("  ❌ Elasticsearch bağlantısı kurulamadı, test atlandı.")
+        return
+    try:
+        sorular = dosyadan_sorulari_oku(dosya_yolu)
+    except Exception as e:
+        print(f"  ❌ {dosya_yolu} okunamadı: {e}")
+        return
+    
+    arama_onbellegi.temizle()
+    try:
+        baslangic = time.perf_counter()
+        soguk = [benzer_sorulari_ara(soru, esik=0.5, oncelik=TOPLU) for soru in sorular]
+        soguk_sure = time.perf_counter() - baslangic
+        
+        baslangic = time.perf_counter()
+        for _ in range(tekrar):
+            sicak = [benzer_sorulari_ara(soru, esik=0.5, oncelik=TOPLU) for soru in sorular]
+        sicak_sure = (time.perf_counter() - baslangic) / tekrar
+    except Exception as e:
+        print(f"  Hata: {e}")
+        return
+    
+    ayni = sum([b.id for b in s] == [b.id for b in o] for s, o in zip(soguk, sicak))
+    istatistik = arama_onbellegi.istatistikler()
+    print(f"  {len(sorular)} soru, {tekrar} tekrar")
+    print(f"  İlk arama (önbellek boş): {soguk_sure * 1000 / len(sorular):.2f} ms/soru")
+    print(f"  Tekrar (önbellekten):     {sicak_sure * 1000 / len(sorular):.3f} ms/soru "
+          f"(x{soguk_sure / max(sicak_sure, 1e-9):.0f})")
+    print(f"  İsabet oranı: %{istatistik['isabet_orani'] * 100:.0f}, aynı sonuç: {ayni}/{len(sorular)}")
+    print()
+
 def manuel_performans_testi():
     """Manuel performans testi"""
     print("🚀 Manuel Performans Testi Başlatılıyor...")
@@ -74,6 +264,26 @@ def manuel_performans_testi():
     print("\n3️⃣ Elasticsearch Arama Testi:")
     test_elasticsearch_arama()
     
+    # Test 4: İstemci / sunucu taraflı analiz karşılaştırması
+    print("\n4️⃣ Analiz Yolu Karşılaştırması:")
+    test_analiz_yollari_karsilastirma()
+    
+    # Test 5: Toplu temizleme
+    print("\n5️⃣ Toplu Temizleme Karşılaştırması:")
+    test_toplu_temizleme_karsilastirma()
+    
+    # Test 6: Sınav dosyasını toplu arama
+    print("\n6️⃣ Toplu Arama Karşılaştırması:")
+    test_toplu_arama_karsilastirma()
+    
+    # Test 7: Yalın yanıt boyutu
+    print("\n7️⃣ Yanıt Boyutu Karşılaştırması:")
+    test_yanit_boyutu_karsilastirma()
+    
+    # Test 8: Sorgu önbelleği
+    print("\n8️⃣ Sorgu Önbelleği Testi:")
+    test_sorgu_onbellegi()
+    
     # Performans özeti
     print("\n" + "="*50)
     print("📊 PERFORMANS ÖZETİ:")
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sorgu Sonuç Önbelleği
+Popüler sorular tekrar tekrar arandığında temizleme + Elasticsearch/ML sorgusu
+her seferinde yeniden çalışmasın diye sonuçları süreç içinde tutar.
+
+Önbellek LRU + TTL'dir: en fazla `boyut` kayıt tutulur, en az kullanılan
+önce atılır ve her kayıt `ttl` saniye sonra geçersizdir. Ayrıca bir nesil
+(generation) fonksiyonu verilir; indeks yeniden yüklendiğinde, model yeniden
+eğitildiğinde veya stopword listesi değiştiğinde nesil değişir ve önbelleğin
+tamamı boşaltılır. Nesil en fazla NESIL_KONTROL_ARALIGI saniyede bir okunur,
+böylece isabetler ek bir sorgu maliyeti ödemez.
+"""
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+ONBELLEK_BOYUTU = 1024        # Önbellekteki en fazla sonuç sayısı
+ONBELLEK_SURESI = 300         # Bir sonucun geçerli kalacağı süre (saniye)
+NESIL_KONTROL_ARALIGI = 2     # Nesil fonksiyonunun en sık çağrılma aralığı (saniye)
+
+# es_index her başarılı aktarımdan sonra bu anahtara yeni bir değer yazar
+# (tablo es_index.DURUM_META_TABLOSU ile aynıdır)
+INDEKS_META_TABLOSU = "es_indeks_meta"
+INDEKS_NESLI_ANAHTARI = "indeks_nesli"
+
+def indeks_nesli(db_path="sorular.db"):
+    """Elasticsearch indeksinin son aktarım damgasını okur (hiç aktarım kaydı yoksa None)"""
+    try:
+        conn = sqlite3.connect(db_path)
+        try:
+            satir = conn.execute(f"SELECT deger FROM {INDEKS_META_TABLOSU} WHERE anahtar = ?",
+                                 (INDEKS_NESLI_ANAHTARI,)).fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return None
+    return satir[0] if satir else None
+
+class SorguOnbellegi:
+    """
+    Thread güvenli LRU + TTL sonuç önbelleği.
+
+    Args:
+        ad (str): İstatistiklerde görünen ad
+        boyut (int): En fazla kayıt sayısı
+        ttl (float): Kaydın geçerlilik süresi (saniye)
+        nesil (callable): Önbelleğe alınan verinin güncel neslini döndüren
+            fonksiyon; değeri değişince önbellek boşaltılır
+    """
+
+    def __init__(self, ad, boyut=ONBELLEK_BOYUTU, ttl=ONBELLEK_SURESI, nesil=None):
+        self.ad = ad
+        self.boyut = boyut
+        self.ttl = ttl
+        self.nesil = nesil
+        self.lock = threading.Lock()
+        self._kayitlar = OrderedDict()
+        self._nesil_degeri = None
+        self._nesil_kontrolu = 0.0
+        self.sayaclar = {"isabet": 0, "iskalama": 0, "suresi_dolan": 0, "atilan": 0, "gecersiz_kilma": 0}
+
+    def _nesli_dogrula(self):
+        # Nesil okuma (ör. SQLite sorgusu) kilit dışında yapılır
+        simdi = time.monotonic()
+        if self.nesil is None or simdi - self._nesil_kontrolu < NESIL_KONTROL_ARALIGI:
+            return
+        self._nesil_kontrolu = simdi
+        try:
+            guncel = self.nesil()
+        except Exception:
+            return
+        with self.lock:
+            if guncel != self._nesil_degeri:
+                if self._kayitlar:
+                    self.sayaclar["gecersiz_kilma"] += 1
+                self._kayitlar.clear()
+                self._nesil_degeri = guncel
+
+    def getir(self, anahtar):
+        """Geçerli kayıt varsa değerini, yoksa None döndürür"""
+        self._nesli_dogrula()
+        with self.lock:
+            kayit = self._kayitlar.get(anahtar)
+            if kayit is None:
+                self.sayaclar["iskalama"] += 1
+                return None
+            deger, bitis = kayit
+            if time.monotonic() >= bitis:
+                del self._kayitlar[anahtar]
+                self.sayaclar["suresi_dolan"] += 1
+                self.sayaclar["iskalama"] += 1
+                return None
+            self._kayitlar.move_to_end(anahtar)
+            self.sayaclar["isabet"] += 1
+            return deger
+
+    def koy(self, anahtar, deger):
+        with self.lock:
+            self._kayitlar[anahtar] = (deger, time.monotonic() + self.ttl)
+            self._kayitlar.move_to_end(anahtar)
+            while len(self._kayitlar) > self.boyut:
+                self._kayitlar.popitem(last=False)
+                self.sayaclar["atilan"] += 1
+
+    def temizle(self):
+        """Önbelleği elle boşaltır (ör. indeks bu süreçte yeniden yüklendiğinde)"""
+        with self.lock:
+            if self._kayitlar:
+                self.sayaclar["gecersiz_kilma"] += 1
+            self._kayitlar.clear()
+            self._nesil_kontrolu = 0.0
+
+    def istatistikler(self):
+        with self.lock:
+            toplam = self.sayaclar["isabet"] + self.sayaclar["iskalama"]
+            return {
+                "boyut": len(self._kayitlar),
+                "kapasite": self.boyut,
+                "ttl": self.ttl,
+                "isabet_orani": self.sayaclar["isabet"] / toplam if toplam else 0.0,
+                **self.sayaclar,
+            }
@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Arama Motoru
+Elasticsearch aramasını devre kesiciyle sarar. Elasticsearch art arda hata
+verdiğinde devre açılır ve sorgular bağlantı/yeniden deneme beklemeden önceden
+yüklenmiş MLAnalyzer'a yönlendirilir; devre arka planda yoklanıp kapanınca
+aramalar tekrar Elasticsearch'e döner. Her sonuç `motor` alanıyla etiketlenir.
+
+Yarış (hedged) modunda Elasticsearch sorgusu gönderilir, HEDGE_GECIKMESI_MS
+içinde iyi bir sonuç gelmezse aynı soru bellekteki MLAnalyzer'a da sorulur ve
+eşiği geçen sonucu ilk getiren motorun cevabı döndürülür. Model henüz
+yüklenmemişse ML yarışa katılmaz, model arka planda ısıtılır.
+
+Hibrit modda iki motor aynı anda çalıştırılır ve sıralı listeleri karşılıklı
+sıra birleştirmesiyle (reciprocal rank fusion, RRF) tek listede toplanır.
+"""
+
+import sqlite3
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import replace
+from elasticsearch import ApiError, TransportError
+from circuit_breaker import DevreKesici
+from es_config import get_default_client
+from es_search import AramaSonucu, BenzerSoru, benzer_sorulari_ara, get_normalizer, SONUC_SAYISI
+from ml_analyzer import MLAnalyzer
+from performance_monitor import monitor_performance, record_value, register_stats_provider
+from query_cache import NESIL_KONTROL_ARALIGI, indeks_nesli
+from search_scheduler import ZAMANLAYICI_AYARLARI
+
+# ML benzerliği kosinüs (0-1) ölçeğinde olduğundan Elasticsearch'in ham skor eşiği yerine kullanılır
+YEDEK_ML_ESIGI = 0.3
+# Yarış modunda ML sorgusunun Elasticsearch'ten ne kadar sonra gönderileceği (ms)
+HEDGE_GECIKMESI_MS = 50
+# Uçuştaki Elasticsearch istekleri kesilemez; kaybeden istekler ML işlerini
+# bekletmesin diye motorlar ayrı havuzlarda çalışır. Elasticsearch havuzu
+# zamanlayıcının eşzamanlılık sınırı kadardır (fazlası zaten zamanlayıcıda bekler).
+ES_ISCI_SAYISI = ZAMANLAYICI_AYARLARI["elasticsearch"]["kapasite"]
+ML_ISCI_SAYISI = 2
+MOTORLAR = ("elasticsearch", "machine_learning")
+# RRF: bir sonucun puanı, motor ağırlığı / (RRF_K + sıra) toplamıdır. K büyüdükçe
+# üst sıralar arasındaki fark azalır; 60 literatürdeki yaygın değerdir.
+RRF_K = 60
+RRF_AGIRLIKLARI = {"elasticsearch": 1.0, "machine_learning": 1.0}
+
+def soru_sayisi(db_path="sorular.db"):
+    """`sorular` tablosundaki satır sayısı (okunamazsa None)"""
+    try:
+        conn = sqlite3.connect(db_path)
+        try:
+            return conn.execute("SELECT COUNT(*) FROM sorular").fetchone()[0]
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return None
+
+def ml_nesli():
+    """Bellekteki ML modelinin dayandığı veri: stopword listesi, soru sayısı ve son indeks aktarımı"""
+    return get_normalizer().stopword_ozeti, soru_sayisi(), indeks_nesli()
+
+def altyapi_hatasi_mi(hata):
+    """Hatanın Elasticsearch'in erişilemezliğinden mi (devreyi açmalı) yoksa sorgudan mı kaynaklandığını söyler"""
+    if isinstance(hata, ApiError):
+        # 4xx sorgu hatasıdır; servis ayakta
+        return hata.meta.status >= 500 or hata.meta.status == 429
+    return isinstance(hata, (ConnectionError, TransportError))
+
+def rrf_birlestir(listeler, agirliklar=None, k=RRF_K):
+    """
+    Sıralı sonuç listelerini reciprocal rank fusion ile birleştirir.
+
+    Args:
+        listeler (dict): Motor adı -> skora göre sıralı BenzerSoru listesi
+        agirliklar (dict): Motor adı -> ağırlık (verilmeyen motor 1.0)
+        k (int): RRF sabiti
+
+    Returns:
+        list: Soru id'sine göre tekilleştirilmiş, RRF puanına göre azalan
+        BenzerSoru listesi; `skor` RRF puanı, `yuzde` en yüksek puana oranıdır
+    """
+    agirliklar = agirliklar or {}
+    puanlar = {}
+    sorular = {}
+    for motor, liste in listeler.items():
+        agirlik = agirliklar.get(motor, 1.0)
+        for sira, benzer in enumerate(liste, start=1):
+            puanlar[benzer.id] = puanlar.get(benzer.id, 0.0) + agirlik / (k + sira)
+            sorular.setdefault(benzer.id, benzer.soru)
+    sirali = sorted(puanlar.items(), key=lambda kv: kv[1], reverse=True)
+    en_yuksek = sirali[0][1] if sirali else 0.0
+    return [BenzerSoru(id=soru_id, soru=sorular[soru_id], skor=puan, yuzde=puan / en_yuksek * 100)
+            for soru_id, puan in sirali]
+
+class AramaMotoru:
+    """Devre kesicili Elasticsearch araması + Machine Learning yedeği"""
+
+    def __init__(self, kesici=None):
+        self.kesici = kesici or DevreKesici("Elasticsearch", yoklama=self._elasticsearch_yokla)
+        self._ml = None
+        self._ml_lock = threading.Lock()
+        self._ml_nesli = None
+        self._ml_kontrolu = 0.0
+        self._ml_isitma = None
+        # Yarış ve hibrit modlarında iki motor ayrı thread'lerde çalışır
+        self._es_havuz = ThreadPoolExecutor(max_workers=ES_ISCI_SAYISI, thread_name_prefix="hedge_es")
+        self._ml_havuz = ThreadPoolExecutor(max_workers=ML_ISCI_SAYISI, thread_name_prefix="hedge_ml")
+        self._hedge_lock = threading.Lock()
+        # model_hazir_degil: ML'in gerekip model yüklenmediği için gönderilemediği aramalar
+        self.hedge_sayaclari = {"arama": 0, "hedge_gonderilen": 0, "model_hazir_degil": 0, "sonucsuz": 0,
+                                "kazanma": {motor: 0 for motor in MOTORLAR},
+                                # Kaybeden motor bittiğinde ölçülen, kazananın kazandırdığı süre
+                                "kazanilan_ms": {motor: [0.0, 0] for motor in MOTORLAR}}
+        register_stats_provider("devre_kesici_elasticsearch", self.kesici.istatistikler)
+        register_stats_provider("hedged_arama", self.hedge_istatistikleri)
+
+    @staticmethod
+    def _elasticsearch_yokla():
+        es = get_default_client()
+        return bool(es and es.ping())
+
+    def _ml_guncel_mi(self):
+        # Nesil (SQLite sorguları) en fazla NESIL_KONTROL_ARALIGI saniyede bir okunur
+        simdi = time.monotonic()
+        if simdi - self._ml_kontrolu < NESIL_KONTROL_ARALIGI:
+            return True
+        self._ml_kontrolu = simdi
+        return ml_nesli() == self._ml_nesli
+
+    def ml_hazirla(self, analyzer=None):
+        """
+        MLAnalyzer'ı yükler (model yoksa eğitir) ve döndürür; başarısızsa None.
+
+        Stopword listesi, soru sayısı veya indeks nesli değişmişse model güncel
+        veriyle yeniden kurulur; yeniden kurulum bitene kadar eski model kullanılmaya devam eder.
+
+        Args:
+            analyzer (MLAnalyzer): Güncel veriyle hazırlanmış (yüklenmiş/eğitilmiş)
+                model; verilirse yeniden kurulmadan şimdiki nesliyle kullanılır
+        """
+        if analyzer is not None:
+            with self._ml_lock:
+                self._ml, self._ml_nesli = analyzer, ml_nesli()
+                self._ml_kontrolu = time.monotonic()
+            return analyzer
+        if self._ml is not None and self._ml_guncel_mi():
+            return self._ml
+        with self._ml_lock:
+            nesil = ml_nesli()
+            if self._ml is None or nesil != self._ml_nesli:
+                analyzer = MLAnalyzer()
+                if not analyzer.load_questions_from_db():
+                    return self._ml
+                analyzer.clean_questions()
+                # Veri değiştiyse kayıtlı TF-IDF sözlüğü eskidir, yeniden eğitilir
+                if self._ml is not None or not analyzer.load_model():
+                    if not analyzer.train_model():
+                        return self._ml
+                self._ml, self._ml_nesli = analyzer, nesil
+                self._ml_kontrolu = time.monotonic()
+        return self._ml
+
+    def _ml_isit(self):
+        """Model yüklü değilse arka planda yükler (tek seferde tek yükleme)"""
+        with self._hedge_lock:
+            if self._ml is not None or (self._ml_isitma is not None and self._ml_isitma.is_alive()):
+                return
+            self._ml_isitma = threading.Thread(target=self.ml_hazirla, daemon=True, name="ml_isitma")
+            self._ml_isitma.start()
+
+    def ml_sifirla(self):
+        """Bir sonraki ML aramasında modelin veriyle karşılaştırılmasını zorlar (ör. stopword değişince)"""
+        self._ml_kontrolu = 0.0
+
+    def ml_ara(self, soru, esik=YEDEK_ML_ESIGI, boyut=SONUC_SAYISI):
+        """Yüklü MLAnalyzer ile arar; sonucu Elasticsearch sonucuyla aynı modelde döndürür"""
+        sonuc = AramaSonucu(sorgu=soru, esik=esik, analiz="tfidf", motor="machine_learning")
+        analyzer = self.ml_hazirla()
+        if analyzer is None:
+            sonuc.hata = "Machine Learning modeli hazırlanamadı"
+            return sonuc
+        for benzer in analyzer.find_similar_questions_ml(soru, top_k=boyut, threshold=esik):
+            sonuc.sonuclar.append(BenzerSoru(id=str(benzer["id"]), soru=benzer["soru"],
+                                             skor=benzer["benzerlik"], yuzde=benzer["yuzde"]))
+        sonuc.maks_skor = sonuc.sonuclar[0].skor if sonuc.sonuclar else 0.0
+        return sonuc
+
+    def _elasticsearch_ara(self, soru, esik, analiz, butce_ms, boyut=SONUC_SAYISI):
+        """Devre izin veriyorsa Elasticsearch'te arar; devre açıksa veya altyapı hatasında None döndürür"""
+        if not self.kesici.izin_var_mi():
+            return None
+        try:
+            sonuc = benzer_sorulari_ara(soru, esik, analiz, boyut=boyut, butce_ms=butce_ms)
+        except Exception as e:
+            if not altyapi_hatasi_mi(e):
+                # Servis cevap verdi; sorgu hatası çağırana iletilir
+                self.kesici.basarili()
+                raise
+            self.kesici.hatali(e)
+            return None
+        if sonuc.kuyrukta_kaldi:
+            # Bütçe yerel arama kuyruğunda bitti, istek gönderilmedi: cluster'ın sağlığı hakkında bilgi yok
+            self.kesici.vazgec()
+            return None
+        if sonuc.hata:
+            # Bütçe içinde hiç yanıt gelmedi
+            self.kesici.hatali(sonuc.hata)
+            return None
+        self.kesici.basarili()
+        return sonuc
+
+    @monitor_performance("arama_motoru")
+    def ara(self, soru, esik=0.75, analiz=None, butce_ms=None, ml_esik=YEDEK_ML_ESIGI):
+        """
+        Devre kapalıysa Elasticsearch'te arar, açıksa veya arama altyapı hatasıyla
+        başarısız olursa Machine Learning ile arar.
+
+        Returns:
+            AramaSonucu: `motor` alanı sonucu hangi motorun ürettiğini gösterir
+        """
+        sonuc = self._elasticsearch_ara(soru, esik, analiz, butce_ms)
+        if sonuc is not None:
+            return sonuc
+        return self.ml_ara(soru, esik=ml_esik)
+
+    def _ml_yaris_ara(self, soru, esik, iptal):
+        if iptal.is_set():
+            return None
+        return self.ml_ara(soru, esik=esik)
+
+    @staticmethod
+    def _iyi_mi(sonuc):
+        return sonuc is not None and not sonuc.hata and len(sonuc) > 0
+
+    def _kaybedeni_olc(self, future, kazanan, kazanma_ani):
+        """Kaybeden motor bittiğinde kazananın ne kadar gecikme kazandırdığını kaydeder"""
+        def _bitti(f):
+            if not f.cancelled() and f.exception() is None and f.result() is not None:
+                kazanilan = (time.perf_counter() - kazanma_ani) * 1000
+                record_value(f"hedge_kazanilan_ms_{kazanan}", kazanilan)
+                with self._hedge_lock:
+                    toplam = self.hedge_sayaclari["kazanilan_ms"][kazanan]
+                    toplam[0] += kazanilan
+                    toplam[1] += 1
+        future.add_done_callback(_bitti)
+
+    @monitor_performance("arama_motoru_hedged")
+    def hedged_ara(self, soru, esik=0.75, analiz=None, butce_ms=None, ml_esik=YEDEK_ML_ESIGI,
+                   gecikme_ms=HEDGE_GECIKMESI_MS):
+        """
+        Elasticsearch ile ML'i yarıştırır.
+
+        Elasticsearch sorgusu hemen gönderilir; `gecikme_ms` içinde eşiği geçen
+        sonuç gelmezse (veya devre açıksa) ML sorgusu da başlatılır. Eşiği geçen
+        en az bir sonuç döndüren ilk motor kazanır. Başlamamış kaybeden iptal
+        edilir; uçuştaki Elasticsearch isteği kesilemez, sonucu atılır. ML modeli
+        henüz yüklenmemişse (yükleme/eğitim aramayı bekletmesin) ML gönderilmez,
+        model arka planda ısıtılır. Hata fırlatan motor (ör. Elasticsearch 4xx)
+        sonuçsuz sayılır. İki motor da sonuç bulamazsa Elasticsearch'in (yoksa
+        ML'in) cevabı döndürülür.
+
+        Returns:
+            AramaSonucu: `motor` kazanan motoru gösterir, `yaris` True'dur
+
+        Raises:
+            Exception: Hiçbir motor cevap veremeyip en az biri hata fırlattıysa
+                (Elasticsearch'in hatası öncelikli)
+        """
+        baslangic = time.perf_counter()
+        iptal = threading.Event()
+        futures = {self._es_havuz.submit(self._elasticsearch_ara, soru, esik, analiz, butce_ms): "elasticsearch"}
+        # Devre açıksa Elasticsearch hemen None döner ve ML beklemeden başlatılır
+        bekleyen = wait(futures, timeout=gecikme_ms / 1000)[1]
+        cevaplar = {}
+        hatalar = {}
+        kazanan = None
+        hedge = False
+        model_hazir_degil = False
+        try:
+            while True:
+                for future in set(futures) - bekleyen:
+                    motor = futures[future]
+                    if motor not in cevaplar:
+                        try:
+                            cevaplar[motor] = future.result()
+                        except Exception as e:
+                            # Hatanın ne zaman geldiği sonucu değiştirmesin: diğer motor yarışmaya devam eder
+                            cevaplar[motor], hatalar[motor] = None, e
+                        if kazanan is None and self._iyi_mi(cevaplar[motor]):
+                            kazanan = motor
+                if kazanan is not None or (not bekleyen and hedge):
+                    break
+                if not hedge:
+                    # Elasticsearch gecikti, sonuçsuz kaldı veya devre açık: ML'i de yarıştır
+                    hedge = True
+                    if self._ml is None:
+                        model_hazir_degil = True
+                        self._ml_isit()
+                    else:
+                        ml_future = self._ml_havuz.submit(self._ml_yaris_ara, soru, ml_esik, iptal)
+                        futures[ml_future] = "machine_learning"
+                        bekleyen.add(ml_future)
+                    continue
+                bekleyen = wait(bekleyen, return_when=FIRST_COMPLETED)[1]
+        finally:
+            iptal.set()
+            for future in bekleyen:
+                future.cancel()
+
+        kazanma_ani = time.perf_counter()
+        if kazanan is not None:
+            for future in bekleyen:
+                self._kaybedeni_olc(future, kazanan, kazanma_ani)
+            sonuc = cevaplar[kazanan]
+        elif hatalar and not any(cevap is not None and not cevap.hata for cevap in cevaplar.values()):
+            # İki motor da başarısız ve en az biri hata fırlattı: hata çağırana iletilir
+            sonuc = None
+        else:
+            # Boş sonuç da geçerli bir cevaptır; AramaSonucu boşken False sayıldığından `or` kullanılmaz
+            sonuc = next((cevaplar[motor] for motor in MOTORLAR if cevaplar.get(motor) is not None), None)
+            if sonuc is None:
+                sonuc = AramaSonucu(sorgu=soru, esik=esik, analiz=analiz or "istemci",
+                                    hata="Elasticsearch ve Machine Learning aramaları başarısız oldu")
+        if sonuc is not None:
+            sonuc = replace(sonuc, yaris=True,
+                            sureler={**sonuc.sureler, "toplam": (kazanma_ani - baslangic) * 1000})
+
+        with self._hedge_lock:
+            self.hedge_sayaclari["arama"] += 1
+            self.hedge_sayaclari["hedge_gonderilen"] += int(hedge and not model_hazir_degil)
+            self.hedge_sayaclari["model_hazir_degil"] += int(model_hazir_degil)
+            if kazanan is not None:
+                self.hedge_sayaclari["kazanma"][kazanan] += 1
+            else:
+                self.hedge_sayaclari["sonucsuz"] += 1
+        if sonuc is None:
+            raise hatalar.get("elasticsearch") or hatalar["machine_learning"]
+        return sonuc
+
+    @staticmethod
+    def _zamanla(fonksiyon, *args):
+        """(sonuç, süre ms, hata) döndürür; hata fırlatan motorun sonucu None olur"""
+        baslangic = time.perf_counter()
+        try:
+            sonuc, hata = fonksiyon(*args), None
+        except Exception as e:
+            sonuc, hata = None, e
+        return sonuc, (time.perf_counter() - baslangic) * 1000, hata
+
+    @staticmethod
+    def _motor_sonucu(future):
+        try:
+            return future.result()
+        except Exception as e:
+            return None, 0.0, e
+
+    @monitor_performance("arama_motoru_hibrit")
+    def hibrit_ara(self, soru, esik=0.75, analiz=None, butce_ms=None, ml_esik=YEDEK_ML_ESIGI,
+                   boyut=SONUC_SAYISI, agirliklar=None, k=RRF_K):
+        """
+        Elasticsearch ve ML'i aynı anda çalıştırıp sonuçlarını RRF ile birleştirir.
+
+        Her motor kendi eşiğiyle süzülmüş ilk `boyut` sonucu verir; birleşik
+        listenin ilk `boyut` sonucu döndürülür. Devre açıksa veya bir motor
+        başarısız olursa diğerinin sıralaması tek başına kullanılır.
+
+        Args:
+            agirliklar (dict): Motor -> ağırlık (varsayılan RRF_AGIRLIKLARI)
+
+        Returns:
+            AramaSonucu: motor="hibrit"; `sureler` her motorun, birleştirmenin
+            ve toplamın süresini (ms) içerir
+        """
+        baslangic = time.perf_counter()
+        es_future = self._es_havuz.submit(self._zamanla, self._elasticsearch_ara, soru, esik, analiz, butce_ms, boyut)
+        ml_future = self._ml_havuz.submit(self._zamanla, self.ml_ara, soru, ml_esik, boyut)
+        # Bir motorun hatası (ör. Elasticsearch 4xx) diğerinin sıralamasını düşürmez
+        es_sonuc, es_ms, es_hata = self._motor_sonucu(es_future)
+        ml_sonuc, ml_ms, ml_hata = self._motor_sonucu(ml_future)
+
+        birlesme = time.perf_counter()
+        listeler = {motor: sonuc.sonuclar for motor, sonuc in (("elasticsearch", es_sonuc), ("machine_learning", ml_sonuc))
+                    if sonuc is not None and not sonuc.hata}
+        sonuc = AramaSonucu(sorgu=soru, esik=esik, analiz=analiz or "istemci", motor="hibrit")
+        if listeler:
+            sonuc.sonuclar = rrf_birlestir(listeler, agirliklar or RRF_AGIRLIKLARI, k)[:boyut]
+            sonuc.maks_skor = sonuc.sonuclar[0].skor if sonuc.sonuclar else 0.0
+        else:
+            nedenler = "; ".join(f"{ad}: {hata}" for ad, hata in (("Elasticsearch", es_hata), ("Machine Learning", ml_hata))
+                                 if hata is not None)
+            sonuc.hata = "Elasticsearch ve Machine Learning aramaları başarısız oldu" + (f" ({nedenler})" if nedenler else "")
+        bitis = time.perf_counter()
+
+        sonuc.kismi = bool(es_sonuc and es_sonuc.kismi)
+        sonuc.sureler = {"elasticsearch": es_ms, "machine_learning": ml_ms,
+                         "fuzyon": (bitis - birlesme) * 1000, "toplam": (bitis - baslangic) * 1000}
+        for ad, deger in sonuc.sureler.items():
+            record_value(f"hibrit_sure_ms_{ad}", deger)
+        return sonuc
+
+    def hedge_istatistikleri(self):
+        """Yarış modunda motorların kazanma oranları"""
+        with self._hedge_lock:
+            arama = self.hedge_sayaclari["arama"]
+            istatistik = {k: self.hedge_sayaclari[k] for k in ("arama", "hedge_gonderilen", "model_hazir_degil", "sonucsuz")}
+            for motor in MOTORLAR:
+                adet = self.hedge_sayaclari["kazanma"][motor]
+                kazanilan, olculen = self.hedge_sayaclari["kazanilan_ms"][motor]
+                istatistik[f"{motor}_kazanma"] = adet
+                istatistik[f"{motor}_kazanma_orani"] = adet / arama if arama else 0.0
+                istatistik[f"{motor}_ort_kazanilan_ms"] = kazanilan / olculen if olculen else 0.0
+            return istatistik
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Arama Zamanlayıcısı
+Yeniden indeksleme, sınav kontrolleri ve performans testleri gibi toplu işler
+GUI aramalarıyla aynı Elasticsearch cluster'ı ve işlemci için yarışır. Bu
+modül Elasticsearch ve ML arama yollarının önünde duran, öncelik sınıflı bir
+giriş (admission) kontrolü sağlar:
+
+    etkilesimli : GUI/CLI aramaları; hız sınırı yoktur, kuyrukta her zaman öne geçer
+                  ve kapasitenin bir kısmı yalnızca bu sınıfa ayrılmıştır
+    toplu       : _msearch ile sınav kontrolü vb.; jeton kovasıyla hız sınırlı
+    arka_plan   : yeniden indeksleme vb.; en düşük öncelik, en sıkı hız sınırı
+
+Aynı anda çalışan iş sayısı `kapasite` ile sınırlıdır. Boşalan yer kuyruktaki
+en yüksek öncelikli (eşitse en eski) isteğe verilir. Thread'li çağıranlar
+`izin()`, asyncio çağıranları `izin_async()` ile aynı kuyruğa girer.
+
+Kuyruk ve kovalar süreç içindedir; süreçler arasında paylaşılmaz. Ayrı süreçte
+çalışan toplu işler GUI ile aynı kuyrukta beklemez, yalnızca kendi hız
+sınırlarıyla cluster'a bindirdikleri yükü sınırlar: es_index.py varsayılan
+olarak VARSAYILAN_HIZ_SINIRI ile yavaşlatılır, performance_test.py'nin TOPLU
+aramaları kendi sürecindeki TOPLU kovasından geçer.
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from performance_monitor import record_value, register_stats_provider
+
+ETKILESIMLI = "etkilesimli"
+TOPLU = "toplu"
+ARKA_PLAN = "arka_plan"
+ONCELIKLER = {ETKILESIMLI: 0, TOPLU: 1, ARKA_PLAN: 2}
+# Olay döngüsü Condition üzerinde bekleyemez; asyncio çağıranları sırasını bu aralıkla yoklar (sn)
+ASYNC_YOKLAMA_ARALIGI = 0.005
+
+# Kaynak başına ayarlar: eşzamanlı iş kapasitesi, etkileşimli aramalara ayrılan yer ve
+# toplu sınıfların hız sınırları ((maliyet/sn, patlama)). Maliyet Elasticsearch'te sorgu,
+# ML'de benzerlik hesabı sayısıdır.
+ZAMANLAYICI_AYARLARI = {
+    "elasticsearch": {
+        "kapasite": 8,
+        "etkilesimli_ayrilmis": 2,
+        "hiz_sinirlari": {TOPLU: (200, 200), ARKA_PLAN: (50, 100)},
+    },
+    "machine_learning": {
+        "kapasite": os.cpu_count() or 1,
+        "etkilesimli_ayrilmis": 1,
+        "hiz_sinirlari": {TOPLU: (200, 200), ARKA_PLAN: (50, 100)},
+    },
+}
+
+class JetonKovasi:
+    """
+    Jeton kovası hız sınırlayıcı: saniyede `oran` jeton dolar, en fazla `kapasite`
+    jeton birikir (patlama). Thread güvenli değildir; çağıran kilitler.
+    """
+
+    def __init__(self, oran, kapasite=None):
+        self.oran = float(oran)
+        self.kapasite = float(kapasite or oran)
+        self.jeton = self.kapasite
+        self._son = time.monotonic()
+
+    def _doldur(self):
+        simdi = time.monotonic()
+        self.jeton = min(self.kapasite, self.jeton + (simdi - self._son) * self.oran)
+        self._son = simdi
+
+    def bekleme_suresi(self, adet=1):
+        """`adet` jeton için beklenmesi gereken süre (saniye; 0 ise hemen alınabilir)"""
+        self._doldur()
+        # Kapasiteden büyük istekler hiç karşılanamayacağından kapasiteye indirilir
+        eksik = min(adet, self.kapasite) - self.jeton
+        return max(0.0, eksik / self.oran)
+
+    def al(self, adet=1):
+        self._doldur()
+        self.jeton -= min(adet, self.kapasite)
+
+    def bekle(self, adet=1):
+        """Jetonlar birikene kadar uyur ve alır (tek thread'li toplu işler için)"""
+        while True:
+            sure = self.bekleme_suresi(adet)
+            if sure <= 0:
+                self.al(adet)
+                return
+            time.sleep(sure)
+
+class AramaZamanlayici:
+    """
+    Öncelik kuyruklu, hız sınırlı giriş kontrolü.
+
+    Args:
+        ad (str): İstatistiklerde görünen kaynak adı
+        kapasite (int): Aynı anda çalışabilecek en fazla iş
+        etkilesimli_ayrilmis (int): Toplu sınıfların kullanamayacağı, etkileşimli
+            aramalara ayrılmış yer sayısı
+        hiz_sinirlari (dict): Sınıf -> (maliyet/sn, patlama); etkileşimli sınıf sınırsızdır
+    """
+
+    def __init__(self, ad, kapasite=8, etkilesimli_ayrilmis=1, hiz_sinirlari=None):
+        self.ad = ad
+        self.kapasite = kapasite
+        self.etkilesimli_ayrilmis = min(etkilesimli_ayrilmis, kapasite - 1)
+        self.kovalar = {sinif: JetonKovasi(oran, patlama)
+                        for sinif, (oran, patlama) in (hiz_sinirlari or {}).items() if sinif != ETKILESIMLI}
+        self.kosul = threading.Condition()
+        self.aktif = 0
+        self._kuyruk = []
+        self._sira = itertools.count()
+        self.kuyruk_derinligi = {sinif: 0 for sinif in ONCELIKLER}
+        self.maks_kuyruk_derinligi = {sinif: 0 for sinif in ONCELIKLER}
+        self.sayaclar = {"kabul": {sinif: 0 for sinif in ONCELIKLER}, "zaman_asimi": 0}
+
+    def _yer_var_mi(self, sinif):
+        sinir = self.kapasite if sinif == ETKILESIMLI else self.kapasite - self.etkilesimli_ayrilmis
+        return self.aktif < sinir
+
+    def _siraya_gir(self, sinif):
+        # kosul tutulurken çağrılır
+        if sinif not in ONCELIKLER:
+            raise ValueError(f"Geçersiz öncelik sınıfı: {sinif} (geçerli: {', '.join(ONCELIKLER)})")
+        bilet = (ONCELIKLER[sinif], next(self._sira))
+        heapq.heappush(self._kuyruk, bilet)
+        self.kuyruk_derinligi[sinif] += 1
+        self.maks_kuyruk_derinligi[sinif] = max(self.maks_kuyruk_derinligi[sinif], self.kuyruk_derinligi[sinif])
+        record_value(f"zamanlayici_{self.ad}_kuyruk_derinligi", len(self._kuyruk) - 1)
+        return bilet
+
+    def _girmeyi_dene(self, bilet, sinif, maliyet):
+        """
+        kosul tutulurken çağrılır. Giriş mümkünse jetonu alıp yeri ayırır ve
+        (True, 0.0), değilse (False, beklenecek süre) döndürür; süre None ise
+        bir yer boşalana kadar beklenir.
+        """
+        # Yalnızca kuyruğun başındaki istek girebilir; öncelik sırası böyle korunur
+        if self._kuyruk[0] != bilet or not self._yer_var_mi(sinif):
+            return False, None
+        kova = self.kovalar.get(sinif)
+        bekleme = kova.bekleme_suresi(maliyet) if kova else 0.0
+        if bekleme > 0:
+            return False, bekleme
+        if kova:
+            kova.al(maliyet)
+        self._kuyruktan_cikar(bilet, sinif)
+        self.aktif += 1
+        self.sayaclar["kabul"][sinif] += 1
+        # Sıradaki istek kuyruğun başına geçti, kendi koşulunu kontrol etsin
+        self.kosul.notify_all()
+        return True, 0.0
+
+    def _bekleme_siniri(self, bekleme, son_an, zaman_asimi):
+        # kosul tutulurken çağrılır; süre dolduysa TimeoutError
+        if son_an is None:
+            return bekleme
+        kalan = son_an - time.monotonic()
+        if kalan <= 0:
+            self.sayaclar["zaman_asimi"] += 1
+            raise TimeoutError(f"{self.ad} arama kuyruğunda {zaman_asimi:.1f} sn beklendi")
+        return min(bekleme, kalan) if bekleme else kalan
+
+    def _vazgec(self, bilet, sinif):
+        with self.kosul:
+            self._kuyruktan_cikar(bilet, sinif)
+            self.kosul.notify_all()
+
+    def _beklendi(self, sinif, baslangic):
+        bekleme = time.monotonic() - baslangic
+        record_value(f"zamanlayici_{self.ad}_bekleme_ms_{sinif}", bekleme * 1000)
+        return bekleme
+
+    def _gir(self, sinif, maliyet, zaman_asimi):
+        baslangic = time.monotonic()
+        son_an = baslangic + zaman_asimi if zaman_asimi is not None else None
+        with self.kosul:
+            bilet = self._siraya_gir(sinif)
+            try:
+                while True:
+                    girdi, bekleme = self._girmeyi_dene(bilet, sinif, maliyet)
+                    if girdi:
+                        break
+                    self.kosul.wait(self._bekleme_siniri(bekleme, son_an, zaman_asimi))
+            except BaseException:
+                self._vazgec(bilet, sinif)
+                raise
+        return self._beklendi(sinif, baslangic)
+
+    async def _gir_async(self, sinif, maliyet, zaman_asimi):
+        baslangic = time.monotonic()
+        son_an = baslangic + zaman_asimi if zaman_asimi is not None else None
+        with self.kosul:
+            bilet = self._siraya_gir(sinif)
+        try:
+            while True:
+                with self.kosul:
+                    girdi, bekleme = self._girmeyi_dene(bilet, sinif, maliyet)
+                    if girdi:
+                        break
+                    bekleme = self._bekleme_siniri(bekleme, son_an, zaman_asimi)
+                await asyncio.sleep(min(bekleme, ASYNC_YOKLAMA_ARALIGI) if bekleme else ASYNC_YOKLAMA_ARALIGI)
+        except BaseException:
+            self._vazgec(bilet, sinif)
+            raise
+        return self._beklendi(sinif, baslangic)
+
+    def _kuyruktan_cikar(self, bilet, sinif):
+        # kosul tutulurken çağrılır
+        self._kuyruk.remove(bilet)
+        heapq.heapify(self._kuyruk)
+        self.kuyruk_derinligi[sinif] -= 1
+
+    def _cik(self):
+        with self.kosul:
+            self.aktif -= 1
+            self.kosul.notify_all()
+
+    @contextmanager
+    def izin(self, sinif=ETKILESIMLI, maliyet=1, zaman_asimi=None):
+        """
+        Blok içindeki işi sınıfının sırası ve hız sınırı geldiğinde çalıştırır.
+
+        Args:
+            sinif (str): ETKILESIMLI, TOPLU veya ARKA_PLAN
+            maliyet (int): Hız sınırından düşülecek jeton (ör. _msearch'teki sorgu sayısı)
+            zaman_asimi (float): Kuyrukta en fazla bekleme (saniye)
+
+        Yields:
+            float: Kuyrukta beklenen süre (saniye); bütçeli işler kalan bütçeyi bununla hesaplar
+
+        Raises:
+            TimeoutError: Süre içinde sıra gelmezse
+        """
+        bekleme = self._gir(sinif, maliyet, zaman_asimi)
+        try:
+            yield bekleme
+        finally:
+            self._cik()
+
+    @asynccontextmanager
+    async def izin_async(self, sinif=ETKILESIMLI, maliyet=1, zaman_asimi=None):
+        """izin()'in asyncio karşılığı: sıra beklerken olay döngüsünü bloklamaz"""
+        bekleme = await self._gir_async(sinif, maliyet, zaman_asimi)
+        try:
+            yield bekleme
+        finally:
+            self._cik()
+
+    def istatistikler(self):
+        with self.kosul:
+            return {
+                "aktif": self.aktif,
+                "kapasite": self.kapasite,
+                "kuyruk_derinligi": dict(self.kuyruk_derinligi),
+                "maks_kuyruk_derinligi": dict(self.maks_kuyruk_derinligi),
+                "kabul": dict(self.sayaclar["kabul"]),
+                "zaman_asimi": self.sayaclar["zaman_asimi"],
+            }
+
+_zamanlayicilar = {}
+_zamanlayici_lock = threading.Lock()
+
+def get_zamanlayici(kaynak="elasticsearch"):
+    """Kaynak ("elasticsearch" / "machine_learning") için süreç genelinde paylaşılan zamanlayıcı"""
+    zamanlayici = _zamanlayicilar.get(kaynak)
+    if zamanlayici is None:
+        with _zamanlayici_lock:
+            zamanlayici = _zamanlayicilar.get(kaynak)
+            if zamanlayici is None:
+                zamanlayici = AramaZamanlayici(kaynak, **ZAMANLAYICI_AYARLARI.get(kaynak, {}))
+                _zamanlayicilar[kaynak] = zamanlayici
+                register_stats_provider(f"zamanlayici_{kaynak}", zamanlayici.istatistikler)
+    return zamanlayici
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tek Uçuş (Single-flight) İstek Birleştirme
+Bir sınıf aynı soruyu milisaniyeler içinde aradığında her çağrı aynı
+Elasticsearch/ML sorgusunu ayrı ayrı çalıştırmasın diye, aynı anahtarla
+eşzamanlı gelen çağrılardan yalnızca ilki (lider) işi yapar; diğerleri onun
+bitmesini bekleyip aynı sonucu (veya aynı hatayı) alır.
+
+Sonuç önbellekten farklı olarak saklanmaz: iş bittiği anda anahtar serbest
+kalır, sonraki çağrı yeni bir uçuş başlatır.
+"""
+
+import threading
+
+class _Ucus:
+    __slots__ = ("bitti", "sonuc", "hata", "bekleyen")
+
+    def __init__(self):
+        self.bitti = threading.Event()
+        self.sonuc = None
+        self.hata = None
+        self.bekleyen = 0
+
+class TekUcus:
+    """
+    Thread güvenli istek birleştirici.
+
+    Args:
+        ad (str): İstatistiklerde görünen ad
+    """
+
+    def __init__(self, ad):
+        self.ad = ad
+        self.lock = threading.Lock()
+        self._ucuslar = {}
+        self.sayaclar = {"lider": 0, "birlestirilen": 0}
+
+    def calistir(self, anahtar, fonksiyon):
+        """
+        `fonksiyon()`u aynı anahtar için en fazla bir kez aynı anda çalıştırır.
+
+        Returns:
+            tuple: (sonuç, paylasildi). `paylasildi` True ise sonuç başka bir
+            çağrının uçuşundan alınmıştır; değiştirilecekse kopyalanmalıdır.
+
+        Raises:
+            Exception: Lider çağrının fırlattığı hata tüm bekleyenlere iletilir
+        """
+        with self.lock:
+            ucus = self._ucuslar.get(anahtar)
+            if ucus is None:
+                ucus = self._ucuslar[anahtar] = _Ucus()
+                self.sayaclar["lider"] += 1
+                lider = True
+            else:
+                ucus.bekleyen += 1
+                self.sayaclar["birlestirilen"] += 1
+                lider = False
+
+        if not lider:
+            ucus.bitti.wait()
+            if ucus.hata is not None:
+                raise ucus.hata
+            return ucus.sonuc, True
+
+        try:
+            ucus.sonuc = fonksiyon()
+            return ucus.sonuc, False
+        except BaseException as e:
+            ucus.hata = e
+            raise
+        finally:
+            with self.lock:
+                del self._ucuslar[anahtar]
+            ucus.bitti.set()
+
+    def istatistikler(self):
+        with self.lock:
+            toplam = self.sayaclar["lider"] + self.sayaclar["birlestirilen"]
+            return {
+                "ucustaki": len(self._ucuslar),
+                "bekleyen": sum(ucus.bekleyen for ucus in self._ucuslar.values()),
+                "birlestirme_orani": self.sayaclar["birlestirilen"] / toplam if toplam else 0.0,
+                **self.sayaclar,
+            }
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Yerel Vektör Modeli
+Elasticsearch araması yalnızca kelime eşleşmesine (multi_match) dayanır. Bu
+modül her soru için yerelde küçük, yoğun (dense) bir vektör üretir: MLAnalyzer
+ile aynı ayarlı TF-IDF uzayı TruncatedSVD ile VEKTOR_BOYUTU boyuta indirilir
+(gizli anlam analizi, LSA). Aynı kelimeleri paylaşmayan ama benzer bağlamda
+geçen sorular bu uzayda birbirine yakın düşer.
+
+Vektörler `es_index.py --vektor` ile `dense_vector` alanına yazılır ve
+es_search'teki "vektor" analiz moduyla HNSW üzerinden kNN araması yapılır.
+İndeksleme ve sorgu aynı modeli kullanmalıdır: model indeksleme sırasında
+eğitilip VEKTOR_MODELI_DOSYASI'na kaydedilir, arama tarafı dosya değiştiğinde
+modeli yeniden yükler.
+"""
+
+import itertools
+import math
+import os
+import sqlite3
+import threading
+import joblib
+import numpy as np
+from sklearn.decomposition import TruncatedSVD
+from es_search import temizle_many
+from ml_analyzer import TEMIZLEME_SURUMU, tfidf_vektorizeri
+from performance_monitor import monitor_performance
+
+VEKTOR_BOYUTU = 128                 # Hedef boyut (küçük derlemlerde soru/terim sayısıyla sınırlanır)
+VEKTOR_EGITIM_ORNEGI = 100000       # Modelin eğitileceği en fazla soru (fazlası için id sırasıyla eşit aralıklı örnek)
+VEKTOR_ONDALIK = 5                  # _bulk isteğine yazılan bileşen hassasiyeti
+VEKTOR_MODELI_DOSYASI = os.path.join("ml_models", "vektor_model.pkl")
+
+class VektorModeli:
+    """
+    Temizlenmiş metinleri L2 normlu yoğun vektörlere çeviren TF-IDF + SVD modeli.
+
+    Args:
+        vectorizer (TfidfVectorizer): Eğitilmiş TF-IDF vektörizeri
+        svd (TruncatedSVD): TF-IDF uzayını indiren, eğitilmiş SVD
+    """
+
+    def __init__(self, vectorizer, svd):
+        self.vectorizer = vectorizer
+        self.svd = svd
+        self.temizleme_surumu = TEMIZLEME_SURUMU
+
+    @property
+    def boyut(self):
+        return self.svd.n_components
+
+    @classmethod
+    def egit(cls, temiz_metinler, boyut=VEKTOR_BOYUTU):
+        """Modeli temizlenmiş metinlerle eğitir"""
+        vectorizer = tfidf_vektorizeri()
+        tfidf = vectorizer.fit_transform(list(temiz_metinler))
+        # SVD bileşen sayısı matrisin rankını aşamaz
+        boyut = max(1, min(boyut, tfidf.shape[0] - 1, tfidf.shape[1] - 1))
+        svd = TruncatedSVD(n_components=boyut, random_state=42)
+        svd.fit(tfidf)
+        return cls(vectorizer, svd)
+
+    def vektorle(self, temiz_metinler):
+        """
+        Temizlenmiş metinleri tek seferde vektörlere çevirir.
+
+        Returns:
+            list: Her metin için float listesi. Hiçbir terimi modelde bulunmayan
+            metin için None döner (kosinüs benzerliği sıfır vektörü kabul etmez).
+        """
+        temiz_metinler = list(temiz_metinler)
+        if not temiz_metinler:
+            return []
+        matris = self.svd.transform(self.vectorizer.transform(temiz_metinler))
+        normlar = np.linalg.norm(matris, axis=1)
+        matris = np.round(matris / np.where(normlar > 0, normlar, 1)[:, None], VEKTOR_ONDALIK)
+        return [satir.tolist() if norm > 0 else None for satir, norm in zip(matris, normlar)]
+
+    def kaydet(self, dosya=VEKTOR_MODELI_DOSYASI):
+        """Modeli atomik olarak kaydeder (arama tarafı yarım yazılmış dosya okumaz)"""
+        os.makedirs(os.path.dirname(dosya) or ".", exist_ok=True)
+        gecici = f"{dosya}.tmp"
+        joblib.dump(self, gecici)
+        os.replace(gecici, dosya)
+
+    @staticmethod
+    def yukle(dosya=VEKTOR_MODELI_DOSYASI):
+        """
+        Kayıtlı modeli okur.
+
+        Raises:
+            ValueError: Model eski temizleme adımıyla eğitilmişse
+        """
+        model = joblib.load(dosya)
+        if getattr(model, "temizleme_surumu", None) != TEMIZLEME_SURUMU:
+            raise ValueError("Vektör modeli eski temizleme adımıyla eğitilmiş; "
+                             "`python es_index.py --vektor --yeniden-olustur` ile yenileyin.")
+        return model
+
+@monitor_performance("vektor_modeli_egitimi")
+def vektor_modelini_egit(db_path="sorular.db", boyut=VEKTOR_BOYUTU, ornek=VEKTOR_EGITIM_ORNEGI,
+                         dosya=VEKTOR_MODELI_DOSYASI):
+    """
+    Veritabanındaki sorulardan (en fazla `ornek` tanesinden) modeli eğitir ve
+    `dosya`ya kaydeder. `dosya` None ise kaydetmez; tam aktarımda model
+    aramaların indeksteki vektörlerle tutarlı kalması için yükleme bittikten
+    (yeniden indekslemede alias taşındıktan) sonra kaydedilir.
+
+    Örnek id sırasına göre eşit aralıklarla seçilir; aynı veriyle eğitim her
+    seferinde aynı soruları kullanır.
+
+    Returns:
+        VektorModeli: Eğitilmiş model
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        toplam = conn.execute("SELECT COUNT(*) FROM sorular").fetchone()[0]
+        satirlar = conn.execute("SELECT metin FROM sorular ORDER BY id")
+        if toplam > ornek:
+            satirlar = itertools.islice(satirlar, 0, None, math.ceil(toplam / ornek))
+        metinler = [satir[0] for satir in satirlar]
+    finally:
+        conn.close()
+    if len(metinler) < 2:
+        raise ValueError("Vektör modeli için veritabanında en az iki soru olmalı")
+
+    model = VektorModeli.egit(temizle_many(metinler), boyut)
+    if dosya:
+        model.kaydet(dosya)
+    print(f"✅ Vektör modeli eğitildi: {len(metinler)} soru, {model.boyut} boyut "
+          f"(açıklanan varyans %{model.svd.explained_variance_ratio_.sum() * 100:.0f})")
+    return model
+
+_model = None
+_model_damgasi = None
+_model_lock = threading.Lock()
+
+def get_vektor_modeli(dosya=VEKTOR_MODELI_DOSYASI):
+    """
+    Kayıtlı modeli döndürür; dosya değişmişse (yeniden indeksleme) yeniden yükler.
+
+    Raises:
+        ValueError: Model yoksa veya eski temizleme adımıyla eğitilmişse
+    """
+    global _model, _model_damgasi
+    try:
+        damga = os.stat(dosya).st_mtime_ns
+    except FileNotFoundError:
+        raise ValueError("Vektör modeli bulunamadı; önce `python es_index.py --vektor` ile indeksleyin.") from None
+    with _model_lock:
+        if damga != _model_damgasi:
+            _model, _model_damgasi = VektorModeli.yukle(dosya), damga
+        return _model